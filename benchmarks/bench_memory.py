@@ -0,0 +1,77 @@
+"""
+Memory benchmark of the Screener.data layouts.
+
+Builds a full-universe Custom table (8,000 rows of all 71 custom columns) page by
+page, as the Screener does, and compares the memory kept by a list with one dict
+per row against a ColumnStore with and without typed columns.
+
+    python benchmarks/bench_memory.py [rows]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pages import screener_row  # noqa: E402
+
+from finviz.helper_functions.column_store import ColumnStore  # noqa: E402
+from finviz.helper_functions.conversion import CUSTOM_COLUMNS, get_schema  # noqa: E402
+
+HEADERS = list(CUSTOM_COLUMNS.values())
+SCHEMA = get_schema("152", list(CUSTOM_COLUMNS))
+
+
+def pages(total):
+    """Yields the rows in pages of 20, every cell a new string like the parser returns."""
+    for start in range(1, total + 1, 20):
+        yield [
+            dict(zip(HEADERS, [cell.encode().decode() for cell in screener_row(number, len(HEADERS))]))
+            for number in range(start, min(start + 20, total + 1))
+        ]
+
+
+def dict_rows(total):
+    data = []
+    for page in pages(total):
+        data.extend(page)
+    return data
+
+
+def column_store(total, schema=None):
+    store = ColumnStore(HEADERS, schema=schema)
+    for page in pages(total):
+        store.extend(page)
+    return store
+
+
+def measure(build):
+    """Returns the memory (MB) still allocated by the built table."""
+    tracemalloc.start()
+    table = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del table
+    return size / 2 ** 20
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    layouts = {
+        "list of dicts": lambda: dict_rows(total),
+        "ColumnStore": lambda: column_store(total),
+        "ColumnStore (typed)": lambda: column_store(total, SCHEMA),
+    }
+
+    baseline = None
+    print(f"{total} rows x {len(HEADERS)} columns")
+    for name, build in layouts.items():
+        size = measure(build)
+        baseline = baseline or size
+        print(f"{name:<22}{size:10.1f} MB{baseline / size:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark of the Connector parse executors.
+
+A local server answers every request with a 70-column screener page after
+a simulated network latency. The same pages are then scraped with parsing
+on the event loop, in a thread pool and in a process pool. The process pool
+only pays off with several cores, since it overlaps parsing across CPUs.
+
+    python benchmarks/bench_parse_executor.py [pages] [latency-ms]
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DISABLE_TQDM"] = "1"
+
+from pages import screener_page  # noqa: E402
+
+from finviz.config import connection_settings  # noqa: E402
+from finviz.helper_functions.request_functions import Connector  # noqa: E402
+from finviz.helper_functions.scraper_functions import get_table  # noqa: E402
+
+
+def start_server(latency):
+    """Runs the stand-in server on its own event loop and returns its address."""
+    page = screener_page(columns=70)
+    ready = threading.Event()
+    address = {}
+
+    async def handle(request):
+        await asyncio.sleep(latency)
+        return web.Response(body=page, content_type="text/html")
+
+    async def serve():
+        app = web.Application()
+        app.router.add_get("/screener.ashx", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        address["url"] = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        ready.set()
+        await asyncio.Event().wait()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+    ready.wait()
+    return address["url"]
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    connection_settings["RATE_LIMIT"] = 0
+
+    url = start_server(latency)
+    urls = [f"{url}/screener.ashx?v=152&r={1 + 20 * page}" for page in range(pages)]
+    headers = [f"Column {column}" for column in range(70)]
+
+    print(f"{pages} pages, {latency * 1000:.0f} ms latency, {os.cpu_count()} CPUs")
+    for executor in [None, "thread", "process"]:
+        Connector(get_table, urls[:5], "bench", headers, 20, parse_executor=executor).run_connector()
+
+        start = time.perf_counter()
+        data = Connector(get_table, urls, "bench", headers, 20, parse_executor=executor).run_connector()
+        elapsed = time.perf_counter() - start
+
+        assert sum(len(page) for page in data) == 20 * pages
+        print(f"{str(executor):>8}: {elapsed:6.2f} s  {pages / elapsed:7.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
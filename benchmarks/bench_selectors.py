@@ -0,0 +1,82 @@
+"""
+Microbenchmark of the precompiled XPath selectors.
+
+Runs every scraper on the synthetic fixture pages twice: with the shared
+selectors of finviz.helper_functions.xpath_selectors, and with each selector
+swapped for a string cssselect() call, which re-translates CSS to XPath on
+every call like the scrapers used to.
+
+    python benchmarks/bench_selectors.py [repeats]
+"""
+
+import os
+import sys
+import timeit
+
+from lxml import html
+from lxml.cssselect import CSSSelector
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pages import quote_page, screener_page  # noqa: E402
+
+import finviz.helper_functions.xpath_selectors as select  # noqa: E402
+from finviz.helper_functions import scraper_functions  # noqa: E402
+from finviz.helper_functions.scraper_functions import QuotePage  # noqa: E402
+
+QUOTE = html.fromstring(quote_page())
+SCREENER = html.fromstring(screener_page(columns=70))
+HEADERS = [f"Column {column}" for column in range(70)]
+
+SCRAPERS = {
+    "get_table": lambda: scraper_functions.get_table(SCREENER, HEADERS, 20),
+    "get_stock": lambda: QuotePage(QUOTE, "AAPL").stock,
+    "get_insider": lambda: QuotePage(QUOTE).insider,
+    "get_news": lambda: QuotePage(QUOTE).news,
+    "get_analyst_price_targets": lambda: QuotePage(QUOTE).analyst_price_targets(100),
+    "QuotePage (all sections)": lambda: all_sections(QuotePage(QUOTE, "AAPL")),
+    "download_ticker_details": lambda: scraper_functions.download_ticker_details(
+        QUOTE, URL="https://finviz.com/quote.ashx?t=AAPL"
+    ),
+}
+
+
+def all_sections(quote_page):
+    """Extracts every section of a quote page, like a batch of the quote functions."""
+    return (
+        quote_page.stock,
+        quote_page.insider,
+        quote_page.news,
+        quote_page.analyst_price_targets(100),
+        quote_page.export_ratings(100),
+    )
+
+
+def string_selectors():
+    """Replaces every precompiled CSS selector with a string cssselect() call."""
+    originals = {}
+    for name, selector in vars(select).items():
+        if isinstance(selector, CSSSelector):
+            originals[name] = selector
+            setattr(select, name, lambda element, css=selector.css: element.cssselect(css))
+    return originals
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    precompiled = {name: min(timeit.repeat(scraper, number=repeats, repeat=3)) for name, scraper in SCRAPERS.items()}
+
+    originals = string_selectors()
+    strings = {name: min(timeit.repeat(scraper, number=repeats, repeat=3)) for name, scraper in SCRAPERS.items()}
+    for name, selector in originals.items():
+        setattr(select, name, selector)
+
+    print(f"{'scraper':<28}{'cssselect':>12}{'precompiled':>14}{'speedup':>10}   (ms per page)")
+    for name in SCRAPERS:
+        before, after = strings[name] / repeats * 1000, precompiled[name] / repeats * 1000
+        print(f"{name:<28}{before:12.3f}{after:14.3f}{before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark of sharded screener scans.
+
+A local server stands in for screener.ashx: it answers every page of a screen of
+the given size with a 70-column screener page after a simulated network latency.
+The same screen is then downloaded by a plain Screener and by Screener.sharded
+with page ranges split across worker processes.
+
+    python benchmarks/bench_sharding.py [rows] [latency-ms] [processes ...]
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DISABLE_TQDM"] = "1"
+
+from pages import screener_page  # noqa: E402
+
+import finviz.screener  # noqa: E402
+from finviz.config import connection_settings  # noqa: E402
+from finviz.screener import Screener  # noqa: E402
+
+
+def start_server(total, latency):
+    """Runs the stand-in server on its own event loop and returns its address."""
+    ready = threading.Event()
+    address = {}
+
+    async def handle(request):
+        await asyncio.sleep(latency)
+        start = int(parse_qs(urlparse(str(request.url)).query).get("r", ["1"])[0])
+        return web.Response(body=screener_page(total, start), content_type="text/html")
+
+    async def serve():
+        app = web.Application()
+        app.router.add_get("/screener.ashx", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        address["url"] = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        ready.set()
+        await asyncio.Event().wait()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+    ready.wait()
+    return address["url"]
+
+
+def timed(scan):
+    start = time.perf_counter()
+    screener = scan()
+    return time.perf_counter() - start, screener
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    process_counts = [int(count) for count in sys.argv[3:]] or [2, 4, 8]
+    connection_settings["RATE_LIMIT"] = 0
+
+    finviz.screener.SCREENER_URL = f"{start_server(total, latency)}/screener.ashx"
+    print(f"{total} rows ({(total + 19) // 20} pages), {latency * 1000:.0f} ms latency, {os.cpu_count()} CPUs")
+
+    baseline, screener = timed(lambda: Screener())
+    expected = [row["Column 1"] for row in screener.data]
+    print(f"{'sequential':>22}: {baseline:6.2f} s")
+
+    for processes in process_counts:
+        elapsed, sharded = timed(lambda: Screener.sharded(processes=processes))
+        assert [row["Column 1"] for row in sharded.data] == expected
+        print(f"{f'sharded, {processes} processes':>22}: {elapsed:6.2f} s  {baseline / elapsed:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
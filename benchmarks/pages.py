@@ -0,0 +1,86 @@
+"""
+Synthetic FinViz pages shared by the benchmarks.
+
+The pages follow the markup the scrapers expect and are padded with the
+navigation, scripts and styles a real page carries, so parse times are
+in the same range as for pages downloaded from finviz.com.
+"""
+
+PADDING = (
+    "<div class='nav'>" + "<a href='/screener.ashx?v=111&f=sec_technology'>Link</a>" * 400 + "</div>"
+    "<script>" + "var x = {'a': 1, 'b': [1, 2, 3]};" * 1500 + "</script>"
+)
+
+
+def screener_row(number, columns):
+    """Cells of a screener row, mixing tickers, numbers, percents and suffixes."""
+    cells = [str(number), f"T{number:04d}", f"Company {number} Inc", "Technology", "Software", "USA"]
+    for column in range(len(cells), columns):
+        cells.append(
+            [f"{number % 97}.{column}B", f"{column % 13}.25%", f"{number * 31 % 900}.15", "-"][column % 4]
+        )
+    return cells[:columns]
+
+
+def screener_page(total=8000, start=1, columns=70):
+    """Returns the HTML of a screener page with up to 20 rows starting at start."""
+    head = "".join(f"<th>Column {column}</th>" for column in range(columns))
+    rows = "".join(
+        '<tr valign="top">'
+        + "".join(f'<td class="screener-body-table-nw"><a href="#">{cell}</a></td>' for cell in screener_row(number, columns))
+        + "</tr>"
+        for number in range(start, min(start + 20, total + 1))
+    )
+    return (
+        f"<html><head><title>Screener</title></head><body>{PADDING}"
+        f'<div class="count-text whitespace-nowrap">#1 / {total} Total</div>'
+        f'<select><option value="1">Page 1/{(total + 19) // 20}</option></select>'
+        f'<table class="styled-table-new"><tr valign="middle">{head}</tr>{rows}</table>'
+        f"</body></html>"
+    ).encode()
+
+
+def quote_page(ticker="AAPL"):
+    """Returns the HTML of a quote page with snapshot, insider, news and ratings tables."""
+    snapshot = "".join(
+        '<tr class="table-dark-row">'
+        + "".join(
+            f'<td class="snapshot-td2">Label {row}-{cell}</td><td class="snapshot-td2"><b>{row * cell}.5</b></td>'
+            for cell in range(6)
+        )
+        + "</tr>"
+        for row in range(13)
+    )
+    ratings = "".join(
+        f"<tr><td>Jan-{day:02d}-24</td><td>Upgrade</td><td>Bank {day}</td><td>Buy</td><td>$1{day}0 → $2{day}0</td></tr>"
+        for day in range(1, 29)
+    )
+    news = "".join(
+        f'<tr><td>Jan-{day:02d}-24 10:{day:02d}AM</td><td><a class="tab-link-news" href="https://news/{day}">Headline number {day}</a>'
+        f'<div class="news-link-right"><span>(Source)</span></div></td></tr>'
+        for day in range(1, 29)
+        for _ in range(3)
+    )
+    insider = "".join(
+        f"<tr><td>Insider {row}</td><td>CEO</td><td>Jan {row:02d} '24</td><td>Sale</td><td>1{row}.0</td>"
+        f"<td>1,000</td><td>10,000</td><td>50,000</td><td>Jan 02 06:00 PM</td></tr>"
+        for row in range(1, 29)
+    )
+    insider_head = "".join(
+        f"<th>{header}</th>"
+        for header in ["Insider Trading", "Relationship", "Date", "Transaction", "Cost",
+                       "#Shares", "Value ($)", "#Shares Total", "SEC Form 4"]
+    )
+    return (
+        f"<html><body>{PADDING}"
+        f'<h1 class="quote-header_ticker-wrapper_ticker">{ticker}</h1>'
+        f'<h2 class="quote-header_ticker-wrapper_company"><a class="tab-link" href="https://apple.com">Apple Inc</a></h2>'
+        f'<div class="quote-links"><a class="tab-link" href="screener.ashx?f=sec_technology">Technology</a>'
+        f'<a class="tab-link" href="screener.ashx?f=ind_consumerelectronics">Consumer Electronics</a>'
+        f'<a class="tab-link" href="screener.ashx?f=geo_usa">USA</a></div>'
+        f'<table class="snapshot-table2">{snapshot}</table>'
+        f'<table class="js-table-ratings"><tbody>{ratings}</tbody></table>'
+        f'<table id="news-table">{news}</table>'
+        f'<table class="styled-table-new"><thead><tr>{insider_head}</tr></thead><tbody>{insider}</tbody></table>'
+        f"</body></html>"
+    ).encode()
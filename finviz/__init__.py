@@ -1,4 +1,9 @@
 from finviz.main_func import (get_all_news, get_analyst_price_targets,
-                              get_insider, get_news, get_stock)
+                              get_analyst_price_targets_async, get_insider,
+                              get_insider_async, get_insiders, get_news,
+                              get_news_async, get_stock, get_stock_async,
+                              get_stocks, get_stocks_analyst_price_targets,
+                              get_stocks_news)
+from finviz.news_poller import NewsPoller
 from finviz.portfolio import Portfolio
-from finviz.screener import Screener
+from finviz.screener import AsyncScreener, Screener
@@ -1,6 +1,50 @@
+import os
+
 connection_settings = dict(
     CONCURRENT_CONNECTIONS=30,
     CONNECTION_TIMEOUT=30000,
+    # Shared keep-alive pool used by every synchronous request
+    POOL_CONNECTIONS=10,  # number of host pools to keep
+    POOL_MAXSIZE=30,  # connections kept alive per host
+    POOL_BLOCK=False,  # block instead of opening extra connections when the pool is full
+    # Token bucket used by the asynchronous Connector, set RATE_LIMIT to 0 to disable it.
+    # Screener.sharded workers share it and apply it to their synchronous requests too.
+    RATE_LIMIT=10,  # requests per second
+    RATE_BURST=20,  # requests allowed at once before the rate applies
+    RATE_LIMIT_SEQUENTIAL=False,  # also apply the bucket to synchronous requests
+    # Retries of throttled asynchronous requests (jittered exponential backoff)
+    MAX_ATTEMPTS=6,  # attempts per URL before TooManyRequests is raised
+    RETRY_BACKOFF=1,  # seconds, doubled after every attempt
+    RETRY_BACKOFF_MAX=60,  # seconds, upper bound for a single wait
+    # Executor the Connector hands downloaded pages to for parsing:
+    # None (parse on the event loop), "thread" or "process"
+    PARSE_EXECUTOR=None,
+    PARSE_WORKERS=None,  # defaults to the number of CPUs
+)
+
+# Opt-in on-disk cache of HTTP responses, shared by all processes using the same directory
+cache_settings = dict(
+    ENABLED=False,
+    DIRECTORY=os.path.join(os.path.expanduser("~"), ".cache", "finviz"),
+    MAX_SIZE=256 * 1024 * 1024,  # bytes of compressed responses kept on disk
+    # Seconds a response stays fresh, per endpoint. Endpoints not listed are never cached.
+    TTL={
+        "quote.ashx": 300,
+        "screener.ashx": 300,
+        "news.ashx": 60,
+        "chart.ashx": 3600,
+    },
+    # In-memory cache of parsed quote pages used by get_stock, get_news, ...
+    PAGE_MAX_ENTRIES=500,
+    PAGE_MAX_SIZE=128 * 1024 * 1024,  # bytes of HTML the cached pages were parsed from
+    PAGE_TTL=300,  # seconds
+)
+
+# Screener requests
+screener_settings = dict(
+    # Custom table columns per request used by Screener.from_fields, None for no limit.
+    # Fields beyond the limit are fetched in extra passes and merged by Ticker.
+    MAX_CUSTOM_COLUMNS=None,
 )
 
 # Modern Chrome user agent string
@@ -0,0 +1,309 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from finviz.config import cache_settings
+
+
+def normalize_url(url: str) -> str:
+    """ Returns the URL with a lowercase host and sorted, non-empty query parameters. """
+
+    scheme, netloc, path, query, _ = urlsplit(url)
+    params = sorted((key, value) for key, value in parse_qsl(query) if value)
+
+    return urlunsplit((scheme.lower(), netloc.lower(), path, urlencode(params), ""))
+
+
+def endpoint_ttl(url: str) -> int:
+    """ Returns the number of seconds a response of the URL's endpoint stays fresh. """
+
+    endpoint = urlsplit(url).path.rsplit("/", 1)[-1]
+    return cache_settings["TTL"].get(endpoint, 0)
+
+
+class ResponseCache:
+    """
+    Stores compressed response bodies in a SQLite database, so that it can be
+    shared by several processes. Least recently used entries are evicted once
+    the stored size exceeds max_size.
+    """
+
+    def __init__(self, directory: str, max_size: int):
+        self.path = os.path.join(directory, "responses.sqlite3")
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+        os.makedirs(directory, exist_ok=True)
+
+    def __connection(self) -> sqlite3.Connection:
+        """ Private function used to (re)open the database, once per process. """
+
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, url TEXT, body BLOB, size INTEGER, "
+                "expires REAL, accessed REAL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+            self._conn.commit()
+            self._pid = os.getpid()
+
+        return self._conn
+
+    def get(self, url: str) -> Optional[Tuple[bytes, str]]:
+        """ Returns the fresh (body, final url) stored for the URL, if any. """
+
+        if not endpoint_ttl(url):
+            return None
+
+        key = normalize_url(url)
+        now = time.time()
+
+        with self._lock:
+            conn = self.__connection()
+            entry = conn.execute(
+                "SELECT body, url FROM responses WHERE key = ? AND expires > ?",
+                (key, now),
+            ).fetchone()
+
+            if entry is None:
+                return None
+
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            conn.commit()
+
+        return zlib.decompress(entry[0]), entry[1]
+
+    def set(self, url: str, body: bytes, final_url: Optional[str] = None):
+        """ Stores the response body of the URL if its endpoint is cacheable. """
+
+        ttl = endpoint_ttl(url)
+        if not ttl:
+            return
+
+        compressed = zlib.compress(body)
+        now = time.time()
+
+        with self._lock:
+            conn = self.__connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    normalize_url(url),
+                    final_url or url,
+                    compressed,
+                    len(compressed),
+                    now + ttl,
+                    now,
+                ),
+            )
+            self.__evict(conn)
+            conn.commit()
+
+    def __evict(self, conn: sqlite3.Connection):
+        """ Private function used to delete expired and least recently used entries. """
+
+        conn.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        total_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+        if total_size <= self.max_size:
+            return
+
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+    def clear(self):
+        """ Deletes all stored responses. """
+
+        with self._lock:
+            conn = self.__connection()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+
+class PageCache:
+    """
+    Thread-safe in-memory LRU cache of parsed pages. Entries expire after ttl seconds and the
+    least recently used ones are evicted above max_entries or max_size (bytes of source HTML).
+    """
+
+    def __init__(self, max_entries: int, max_size: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, size, expires)
+        self._size = 0
+        self._lock = threading.RLock()
+        self._loading = {}
+
+    def __len__(self):
+        with self._lock:
+            self.__expire()
+            return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[2] > time.monotonic()
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key not in self._entries:
+                raise KeyError(key)
+            self.__remove(key)
+
+    def get(self, key, default=None):
+        """ Returns the fresh value stored for the key and marks it as recently used. """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[2] <= time.monotonic():
+                if entry is not None:
+                    self.__remove(key)
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, size: int = 0, ttl: Optional[float] = None):
+        """ Stores the value, evicting the least recently used entries if needed. """
+
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            if key in self._entries:
+                self.__remove(key)
+
+            self._entries[key] = (value, size, expires)
+            self._size += size
+            self.__expire()
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._size > self.max_size
+            ):
+                self.__remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_load(self, key, loader: Callable[[], Tuple[Any, int]], force_refresh=False):
+        """
+        Returns the cached value, or calls loader() -> (value, size) and stores its result.
+        Concurrent calls for the same key wait for a single load. Errors raised by the
+        loader are passed to the caller and nothing is stored.
+        """
+
+        if not force_refresh:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                # Another thread may have loaded the page while we were waiting
+                if not force_refresh:
+                    with self._lock:
+                        entry = self._entries.get(key)
+                    if entry is not None and entry[2] > time.monotonic():
+                        return entry[0]
+
+                value, size = loader()
+                self.set(key, value, size)
+        finally:
+            # Also when the loader raised, so that failed keys do not pile up
+            with self._lock:
+                self._loading.pop(key, None)
+
+        return value
+
+    def invalidate(self, key=None):
+        """ Removes the entry of the key, or every entry when no key is given. """
+
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._size = 0
+            elif key in self._entries:
+                self.__remove(key)
+
+    def stats(self) -> Dict[str, int]:
+        """ Returns the hit/miss counters and the current size of the cache. """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size": self._size,
+            }
+
+    def __remove(self, key):
+        """ Private function used to delete an entry. The lock must be held. """
+
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    def __expire(self):
+        """ Private function used to delete expired entries. The lock must be held. """
+
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if entry[2] <= now]:
+            self.__remove(key)
+
+
+_MISSING = object()
+_response_cache = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """ Returns the shared response cache, or None if it is disabled in cache_settings. """
+
+    global _response_cache
+
+    if not cache_settings["ENABLED"]:
+        return None
+
+    if (
+        _response_cache is None
+        or _response_cache.path
+        != os.path.join(cache_settings["DIRECTORY"], "responses.sqlite3")
+    ):
+        _response_cache = ResponseCache(
+            cache_settings["DIRECTORY"], cache_settings["MAX_SIZE"]
+        )
+
+    _response_cache.max_size = cache_settings["MAX_SIZE"]
+    return _response_cache
@@ -0,0 +1,172 @@
+"""
+Columnar storage of screener tables.
+
+A list with one dictionary per row repeats every header and keeps one Python object per cell.
+ColumnStore keeps one column per header instead: typed numeric columns are float arrays and the
+columns with few distinct values (Ticker, Sector, Industry, Country) are dictionary encoded.
+Rows are read through RowView mappings, so the store can stand in for the list of dictionaries.
+"""
+
+from array import array
+from collections.abc import MutableMapping, Sequence
+from typing import Dict, Iterable, List, Optional
+
+from finviz.helper_functions.conversion import convert_column, convert_numbers
+
+DICTIONARY_COLUMNS = ("Ticker", "Sector", "Industry", "Country")
+
+
+class DictionaryColumn:
+    """ Column of strings stored as an array of codes into the list of its distinct values. """
+
+    def __init__(self, values: Iterable = ()):
+        self.values = []
+        self.codes = array("I")
+        self._value_codes = {}
+        self.extend(values)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.values[self.codes[index]]
+
+    def __iter__(self):
+        return (self.values[code] for code in self.codes)
+
+    def __setitem__(self, index, value):
+        self.codes[index] = self.__code(value)
+
+    def __code(self, value):
+        """ Private function used to return the code of a value, adding it when it is new. """
+
+        code = self._value_codes.get(value)
+        if code is None:
+            code = self._value_codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.__code(value))
+
+    def extend(self, values: Iterable):
+        self.codes.extend(self.__code(value) for value in values)
+
+
+class RowView(MutableMapping):
+    """ Dictionary-like view of a single row of a ColumnStore. """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index: int):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, header):
+        return self._store.columns[header][self._index]
+
+    def __setitem__(self, header, value):
+        self._store.set_value(self._index, header, value)
+
+    def __delitem__(self, header):
+        raise TypeError("Columns can not be deleted from a single row")
+
+    def __iter__(self):
+        return iter(self._store.headers)
+
+    def __len__(self):
+        return len(self._store.headers)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ColumnStore(Sequence):
+    """
+    Table stored column by column. Indexing returns RowView mappings, so it can be used like
+    the list of row dictionaries. Columns found in the schema are converted while the rows are
+    added, all the others are kept as strings.
+    """
+
+    def __init__(
+        self,
+        headers: List[str],
+        rows: Iterable[Dict] = (),
+        schema: Optional[Dict[str, str]] = None,
+    ):
+        self.headers = []
+        self.columns = {}
+        self.schema = schema or {}
+        self._length = 0
+
+        for header in headers:
+            self.__add_column(header)
+        self.extend(rows)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [RowView(self, index) for index in range(*position.indices(self._length))]
+
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("ColumnStore index out of range")
+
+        return RowView(self, position)
+
+    def __add_column(self, header: str):
+        """ Private function used to add an empty column (filled with None for existing rows). """
+
+        column_type = self.schema.get(header, "str")
+
+        if column_type in ("number", "percent"):
+            column = array("d")
+        elif header in DICTIONARY_COLUMNS:
+            column = DictionaryColumn()
+        else:
+            column = []
+
+        column.extend(convert_column([None] * self._length, column_type))
+        self.headers.append(header)
+        self.columns[header] = column
+
+    def extend(self, rows: Iterable[Dict]):
+        """ Appends a batch of rows, converting them column by column. """
+
+        rows = list(rows)
+        if not rows:
+            return
+
+        for header in self.headers:
+            self.columns[header].extend(
+                convert_column(
+                    [row.get(header) for row in rows], self.schema.get(header, "str")
+                )
+            )
+
+        self._length += len(rows)
+
+    def append(self, row: Dict):
+        """ Appends a single row. """
+
+        self.extend([row])
+
+    def set_value(self, index: int, header: str, value):
+        """ Sets one cell, adding the column when the header is new. """
+
+        if header not in self.columns:
+            self.__add_column(header)
+
+        column = self.columns[header]
+        if isinstance(column, array):
+            value = convert_numbers([value])[0]
+
+        column[index] = value
+
+    def column(self, header: str):
+        """ Returns a whole column. """
+
+        return self.columns[header]
@@ -0,0 +1,260 @@
+"""
+Typed conversion of the screener cells.
+
+FinViz shows every value as text, eg. "2.45B", "12.30%", "1,234,567" or "-". The schemas below
+give each column a type, so that a whole column can be converted at once into an array of
+floats (missing values become NaN). Percent columns keep their scale: "12.30%" becomes 12.3.
+"""
+
+import datetime
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from finviz.helper_functions.error_handling import InvalidColumn
+
+# Column types: "str" values are kept as they are, "number" and "percent" values are converted
+# to floats and "date" values (eg. "12/12/1980") to datetime.date objects.
+# The columns are listed in the order of their custom column id's (0 = "No.", 70 = "IPO Date").
+COLUMN_TYPES = {
+    "No.": "number",
+    "Ticker": "str",
+    "Company": "str",
+    "Sector": "str",
+    "Industry": "str",
+    "Country": "str",
+    "Market Cap": "number",
+    "P/E": "number",
+    "Fwd P/E": "number",
+    "PEG": "number",
+    "P/S": "number",
+    "P/B": "number",
+    "P/C": "number",
+    "P/FCF": "number",
+    "Dividend": "percent",
+    "Payout Ratio": "percent",
+    "EPS": "number",
+    "EPS this Y": "percent",
+    "EPS next Y": "percent",
+    "EPS past 5Y": "percent",
+    "EPS next 5Y": "percent",
+    "Sales past 5Y": "percent",
+    "EPS Q/Q": "percent",
+    "Sales Q/Q": "percent",
+    "Outstanding": "number",
+    "Float": "number",
+    "Insider Own": "percent",
+    "Insider Trans": "percent",
+    "Inst Own": "percent",
+    "Inst Trans": "percent",
+    "Float Short": "percent",
+    "Short Ratio": "number",
+    "ROA": "percent",
+    "ROE": "percent",
+    "ROI": "percent",
+    "Curr R": "number",
+    "Quick R": "number",
+    "LTDebt/Eq": "number",
+    "Debt/Eq": "number",
+    "Gross M": "percent",
+    "Oper M": "percent",
+    "Profit M": "percent",
+    "Perf Week": "percent",
+    "Perf Month": "percent",
+    "Perf Quart": "percent",
+    "Perf Half": "percent",
+    "Perf Year": "percent",
+    "Perf YTD": "percent",
+    "Beta": "number",
+    "ATR": "number",
+    "Volatility W": "percent",
+    "Volatility M": "percent",
+    "SMA20": "percent",
+    "SMA50": "percent",
+    "SMA200": "percent",
+    "50D High": "percent",
+    "50D Low": "percent",
+    "52W High": "percent",
+    "52W Low": "percent",
+    "RSI": "number",
+    "from Open": "percent",
+    "Gap": "percent",
+    "Recom": "number",
+    "Avg Volume": "number",
+    "Rel Volume": "number",
+    "Price": "number",
+    "Change": "percent",
+    "Volume": "number",
+    "Earnings": "str",
+    "Target Price": "number",
+    "IPO Date": "date",
+}
+
+# Headers of the custom table columns (the "c" parameter of the screener)
+CUSTOM_COLUMNS = {
+    str(column_id): header for column_id, header in enumerate(COLUMN_TYPES)
+}
+
+# Custom columns requested in every pass of a planned screen, to merge the passes by ticker
+KEY_COLUMNS = ["0", "1"]
+
+# Headers of the predefined tables, keyed like TABLE_TYPES in finviz.screener
+TABLE_COLUMNS = {
+    "111": [
+        "No.", "Ticker", "Company", "Sector", "Industry", "Country",
+        "Market Cap", "P/E", "Price", "Change", "Volume",
+    ],
+    "121": [
+        "No.", "Ticker", "Market Cap", "P/E", "Fwd P/E", "PEG", "P/S", "P/B", "P/C",
+        "P/FCF", "EPS this Y", "EPS next Y", "EPS past 5Y", "EPS next 5Y",
+        "Sales past 5Y", "Price", "Change", "Volume",
+    ],
+    "131": [
+        "No.", "Ticker", "Market Cap", "Outstanding", "Float", "Insider Own",
+        "Insider Trans", "Inst Own", "Inst Trans", "Float Short", "Short Ratio",
+        "Avg Volume", "Price", "Change", "Volume",
+    ],
+    "141": [
+        "No.", "Ticker", "Perf Week", "Perf Month", "Perf Quart", "Perf Half",
+        "Perf Year", "Perf YTD", "Volatility W", "Volatility M", "Recom",
+        "Avg Volume", "Rel Volume", "Price", "Change", "Volume",
+    ],
+    "161": [
+        "No.", "Ticker", "Market Cap", "Dividend", "ROA", "ROE", "ROI", "Curr R",
+        "Quick R", "LTDebt/Eq", "Debt/Eq", "Gross M", "Oper M", "Profit M",
+        "Earnings", "Price", "Change", "Volume",
+    ],
+    "171": [
+        "No.", "Ticker", "Beta", "ATR", "SMA20", "SMA50", "SMA200", "52W High",
+        "52W Low", "RSI", "Price", "Change", "from Open", "Gap", "Volume",
+    ],
+}
+
+MISSING_VALUES = frozenset(["", "-", "N/A"])
+NUMBER_SUFFIXES = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+_STRIP_CHARACTERS = str.maketrans("", "", ",%$")
+
+
+def get_schema(table: str, custom: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Returns the column types of a screener table, given its TABLE_TYPES id
+    and the custom column id's when the table is "152".
+    """
+
+    if custom:
+        headers = [
+            CUSTOM_COLUMNS[column_id] for column_id in custom if column_id in CUSTOM_COLUMNS
+        ]
+    else:
+        headers = TABLE_COLUMNS.get(table, [])
+
+    return {header: COLUMN_TYPES[header] for header in headers}
+
+
+def plan_custom_columns(
+    fields: Iterable[str], max_columns: Optional[int] = None
+) -> List[List[str]]:
+    """
+    Returns the custom column id's of the given fields (headers such as "P/E" or column id's),
+    split into the fewest screener passes of at most max_columns columns each. Every pass
+    starts with the KEY_COLUMNS, so that the passes can be merged by ticker.
+    """
+
+    column_ids = {header.lower(): column_id for column_id, header in CUSTOM_COLUMNS.items()}
+    planned = []
+
+    for field in fields:
+        column_id = field if field in CUSTOM_COLUMNS else column_ids.get(str(field).lower())
+        if column_id is None:
+            raise InvalidColumn(field)
+        if column_id not in KEY_COLUMNS and column_id not in planned:
+            planned.append(column_id)
+
+    per_pass = len(planned) or 1
+    if max_columns is not None:
+        per_pass = max_columns - len(KEY_COLUMNS)
+        if per_pass < 1:
+            raise ValueError(f"max_columns must leave room for {KEY_COLUMNS} and one field")
+
+    return [
+        KEY_COLUMNS + planned[start : start + per_pass]
+        for start in range(0, max(len(planned), 1), per_pass)
+    ]
+
+
+def convert_numbers(values: Iterable[str]) -> array:
+    """ Converts a column of numbers such as "2.45B", "-1.20%" or "1,234,567" to a float array. """
+
+    column = array("d")
+    append = column.append
+
+    for value in values:
+        if not isinstance(value, str):  # Already converted or missing
+            append(math.nan if value is None else value)
+            continue
+
+        if value in MISSING_VALUES:
+            append(math.nan)
+            continue
+
+        multiplier = NUMBER_SUFFIXES.get(value[-1], 1)
+        if multiplier != 1:
+            value = value[:-1]
+
+        try:
+            append(float(value.translate(_STRIP_CHARACTERS)) * multiplier)
+        except ValueError:
+            append(math.nan)
+
+    return column
+
+
+def convert_dates(values: Iterable[str], date_format: str = "%m/%d/%Y") -> List:
+    """ Converts a column of dates into datetime.date objects (None when missing). """
+
+    column = []
+
+    for value in values:
+        if isinstance(value, datetime.date):
+            column.append(value)
+            continue
+
+        try:
+            column.append(datetime.datetime.strptime(value, date_format).date())
+        except (TypeError, ValueError):
+            column.append(None)
+
+    return column
+
+
+def convert_column(values: Iterable[str], column_type: str):
+    """ Converts a whole column of cells to the given column type. """
+
+    if column_type in ("number", "percent"):
+        return convert_numbers(values)
+    if column_type == "date":
+        return convert_dates(values)
+    return list(values)
+
+
+def convert_table(headers: List[str], rows: List[Dict], schema: Dict[str, str]) -> Dict:
+    """
+    Converts the rows of a table column by column and returns a dictionary of columns.
+    Headers missing from the schema are kept as strings.
+    """
+
+    return {
+        header: convert_column(
+            [row.get(header) for row in rows], schema.get(header, "str")
+        )
+        for header in headers
+    }
+
+
+def convert_rows(headers: List[str], rows: List[Dict], schema: Dict[str, str]) -> List[Dict]:
+    """ Returns the rows of a table with their values converted column by column. """
+
+    columns = convert_table(headers, rows, schema)
+    return [
+        dict(zip(headers, values)) for values in zip(*(columns[header] for header in headers))
+    ]
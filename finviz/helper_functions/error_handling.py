@@ -15,6 +15,13 @@ class InvalidTableType(Exception):
         super(InvalidTableType, self).__init__(f"Invalid table type called: {arg}")
 
 
+class InvalidColumn(Exception):
+    """ Raise when the given field is not a column of the custom table. """
+
+    def __init__(self, arg):
+        super(InvalidColumn, self).__init__(f"Invalid custom table column: {arg}")
+
+
 class TooManyRequests(Exception):
     """ Raise when HTTP request fails because too many requests were sent to FinViz at once. """
 
@@ -43,9 +50,9 @@ class NonexistentPortfolioName(Exception):
 class NoPortfolio(Exception):
     """ Raise when the user has not created a portfolio. """
 
-    def __int__(self, func_name):
+    def __init__(self, func_name):
         super(NoPortfolio, self).__init__(
-            "Function ({func_name}) cannot be called because "
+            f"Function ({func_name}) cannot be called because "
             "there is no existing portfolio."
         )
 
@@ -0,0 +1,153 @@
+"""
+Client-side evaluation of screener filters.
+
+A filter such as "fa_pe_u20" or "sec_technology" narrows a screen. When all the rows of the wider
+screen are held, the rows matching an extra filter can be picked locally instead of paging through
+FinViz again. Only filters with an unambiguous meaning are evaluated: categories naming a Sector,
+Industry or Country, and numeric options whose label gives the bounds ("Under $5", "Over 500K",
+"$1 to $5", "Low (<15)"). For any other filter row_filter returns None.
+"""
+
+import math
+import re
+from typing import Callable, Dict, Iterable, Mapping, Optional
+
+from finviz.helper_functions.conversion import convert_numbers
+
+# Filter name (the part of the filter before its option) -> screener column it applies to
+CATEGORY_FILTERS = {
+    "sec": "Sector",
+    "ind": "Industry",
+    "geo": "Country",
+}
+NUMBER_FILTERS = {
+    "cap": "Market Cap",
+    "fa_pe": "P/E",
+    "fa_fpe": "Fwd P/E",
+    "fa_peg": "PEG",
+    "fa_ps": "P/S",
+    "fa_pb": "P/B",
+    "fa_pc": "P/C",
+    "fa_pfcf": "P/FCF",
+    "fa_div": "Dividend",
+    "fa_payoutratio": "Payout Ratio",
+    "fa_roa": "ROA",
+    "fa_roe": "ROE",
+    "fa_roi": "ROI",
+    "fa_curratio": "Curr R",
+    "fa_quickratio": "Quick R",
+    "fa_ltdebteq": "LTDebt/Eq",
+    "fa_debteq": "Debt/Eq",
+    "fa_grossmargin": "Gross M",
+    "fa_opermargin": "Oper M",
+    "fa_netmargin": "Profit M",
+    "sh_outstanding": "Outstanding",
+    "sh_float": "Float",
+    "sh_short": "Float Short",
+    "sh_avgvol": "Avg Volume",
+    "sh_relvol": "Rel Volume",
+    "sh_curvol": "Volume",
+    "sh_price": "Price",
+    "ta_beta": "Beta",
+    "ta_rsi": "RSI",
+    "ta_gap": "Gap",
+    "ta_change": "Change",
+    "ta_changeopen": "from Open",
+    "an_recom": "Recom",
+}
+
+_NUMBER = r"([-+]?\$?\d+(?:\.\d+)?)\s*(%|k|m|b|mln|bln)?"
+_UNITS = {None: 1, "%": 1, "k": 1e3, "m": 1e6, "mln": 1e6, "b": 1e9, "bln": 1e9}
+_UNDER = re.compile(rf"^(?:<|under|below)\s*{_NUMBER}$")
+_OVER = re.compile(rf"^(?:>|over|above)\s*{_NUMBER}$")
+_RANGE = re.compile(rf"^{_NUMBER}\s+to\s+{_NUMBER}$")
+
+
+def filter_labels(filter_dict: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+    """ Returns the option label of every filter of a load_filter_dict() dictionary. """
+
+    return {
+        code: label for options in filter_dict.values() for label, code in options.items()
+    }
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^0-9a-z]", "", str(text).lower())
+
+
+def _number(value: str, unit: Optional[str]) -> float:
+    return float(value.replace("$", "")) * _UNITS[unit]
+
+
+def parse_bounds(label: str):
+    """
+    Returns the (low, high) bounds of a numeric filter option from its label, eg. "Over $5",
+    "Low (<15)" or "+Large (over $10bln)", with None for an open side. Returns None when the
+    label does not give the bounds, eg. "Overbought (90)" or "Mega ($200bln and more)".
+    """
+
+    text = label.strip().lower()
+    inner = re.search(r"\(([^)]*)\)", text)
+    if inner:
+        text = inner.group(1).strip()
+
+    match = _UNDER.match(text)
+    if match:
+        return None, _number(*match.groups())
+
+    match = _OVER.match(text)
+    if match:
+        return _number(*match.groups()), None
+
+    match = _RANGE.match(text)
+    if match:
+        return _number(*match.groups()[:2]), _number(*match.groups()[2:])
+
+    return None
+
+
+def row_filter(
+    filter_code: str, label: Optional[str], headers: Iterable[str]
+) -> Optional[Callable[[Mapping], bool]]:
+    """
+    Returns a function telling whether a row matches the filter, or None when the filter can not
+    be evaluated from the given columns. "Under" and "Over" bounds are exclusive, the bounds of a
+    range inclusive; rows without a value never match.
+
+    The bounds are compared against the rounded values shown in the table, eg. "4.99" for a price
+    of 4.994, while FinViz compares the exact values, so rows on a bound may be picked differently.
+
+    :param filter_code: filter, eg.: 'fa_pe_u20'
+    :param label: option label of the filter, eg.: 'Under 20' (see filter_labels)
+    :param headers: columns of the rows
+    """
+
+    if label is None or "_" not in filter_code:
+        return None
+
+    name, option = filter_code.rsplit("_", 1)
+
+    if name in CATEGORY_FILTERS:
+        column = CATEGORY_FILTERS[name]
+        # Only options naming a single category, eg. "Technology" (sec_technology),
+        # not groups such as "Foreign (ex-USA)" (geo_notusa)
+        if column not in headers or _normalize(label) != option:
+            return None
+        return lambda row: _normalize(row.get(column)) == option
+
+    column = NUMBER_FILTERS.get(name)
+    bounds = parse_bounds(label)
+    if column is None or column not in headers or bounds is None:
+        return None
+
+    low, high = bounds
+
+    def matches(row):
+        value = convert_numbers([row.get(column)])[0]
+        if math.isnan(value):
+            return False
+        if low is not None and high is not None:
+            return low <= value <= high
+        return value > low if low is not None else value < high
+
+    return matches
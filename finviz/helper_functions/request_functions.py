@@ -1,6 +1,14 @@
 import asyncio
+import itertools
 import os
-from typing import Callable, Dict, List
+import random
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, List, Optional, Union
+from urllib.parse import urlencode
 
 import aiohttp
 import requests
@@ -8,39 +16,136 @@ import tenacity
 import urllib3
 from lxml import html
 from requests import Response
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 
 from finviz.config import USER_AGENT, connection_settings
-from finviz.helper_functions.error_handling import ConnectionTimeout
+from finviz.helper_functions.cache_functions import get_response_cache
+from finviz.helper_functions.error_handling import ConnectionTimeout, TooManyRequests
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+STREAM_CHUNK_SIZE = 16 * 1024  # Bytes handed to stream parsers at a time
+
+_session = None
+_session_lock = threading.Lock()
+_sequential_bucket = None
+
+
+def get_session() -> requests.Session:
+    """ Returns the shared keep-alive session used by all synchronous requests. """
+
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                adapter = HTTPAdapter(
+                    pool_connections=connection_settings["POOL_CONNECTIONS"],
+                    pool_maxsize=connection_settings["POOL_MAXSIZE"],
+                    pool_block=connection_settings["POOL_BLOCK"],
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+
+    return _session
+
+
+def reset_session():
+    """ Closes the shared session, so the next request builds one from the current settings. """
+
+    global _session, _sequential_bucket
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _sequential_bucket = None
+
+
+def wait_for_rate_limit():
+    """
+    Waits for a token of the rate limit before a synchronous request, when RATE_LIMIT_SEQUENTIAL
+    is set. The bucket is shared by the threads of the process.
+    """
+
+    global _sequential_bucket
+
+    if not connection_settings["RATE_LIMIT_SEQUENTIAL"]:
+        return
+
+    if _sequential_bucket is None:
+        with _session_lock:
+            if _sequential_bucket is None:
+                _sequential_bucket = TokenBucket(
+                    connection_settings["RATE_LIMIT"], connection_settings["RATE_BURST"]
+                )
+
+    _sequential_bucket.acquire_blocking()
+
+
+def cached_response(url: str) -> Optional[Response]:
+    """ Returns the response stored in the disk cache for the URL, if the cache is enabled. """
+
+    cache = get_response_cache()
+    entry = cache.get(url) if cache is not None else None
+
+    if entry is None:
+        return None
+
+    response = Response()
+    response._content, response.url = entry
+    response.status_code = 200
+    response.encoding = "utf-8"
+    return response
+
+
+def store_response(url: str, response: Response):
+    """ Stores a successful response in the disk cache, if the cache is enabled. """
+
+    cache = get_response_cache()
+    if cache is not None and response.status_code == 200:
+        cache.set(url, response.content, response.url)
+
 
 def http_request_get(
-    url, session=None, payload=None, parse=True, user_agent=USER_AGENT
+    url, session=None, payload=None, parse=True, user_agent=USER_AGENT, refresh=False
 ):
-    """ Sends a GET HTTP request to a website and returns its HTML content and full url address. """
+    """
+    Sends a GET HTTP request to a website and returns its HTML content and full url address.
+    Requests sent with a custom (eg. logged in) session never use the disk cache. With refresh,
+    a cached response is not read but the fresh one is still stored.
+    """
 
     if payload is None:
         payload = {}
 
+    use_cache = session is None
+    if session is None:
+        session = get_session()
+
+    full_url = requests.Request("GET", url, params=payload).prepare().url
+
     try:
-        if session:
+        content = cached_response(full_url) if use_cache and not refresh else None
+
+        if content is None:
+            wait_for_rate_limit()
             content = session.get(
                 url,
                 params=payload,
                 verify=False,
                 headers={"User-Agent": user_agent},
             )
-        else:
-            content = requests.get(
-                url,
-                params=payload,
-                verify=False,
-                headers={"User-Agent": user_agent},
-            )
 
-        content.raise_for_status()  # Raise HTTPError for bad requests (4xx or 5xx)
+            content.raise_for_status()  # Raise HTTPError for bad requests (4xx or 5xx)
+            if is_throttled(content.status_code, content.content):
+                raise TooManyRequests(full_url)
+            if use_cache:
+                store_response(full_url, content)
+
         if parse:
             return html.fromstring(content.text), content.url
         else:
@@ -51,30 +156,332 @@ def http_request_get(
 
 @tenacity.retry(wait=tenacity.wait_exponential())
 def finviz_request(url: str, user_agent: str) -> Response:
-    response = requests.get(url, headers={"User-Agent": user_agent})
+    response = cached_response(url)
+    if response is not None:
+        return response
+
+    wait_for_rate_limit()
+    response = get_session().get(url, headers={"User-Agent": user_agent})
     if response.text == "Too many requests.":
         raise Exception("Too many requests.")
+
+    store_response(url, response)
     return response
 
 
+@tenacity.retry(wait=tenacity.wait_exponential())
+def finviz_stream_request(url: str, user_agent: str) -> Iterator[bytes]:
+    """
+    Streaming version of finviz_request, returns an iterator over the body chunks as they arrive.
+    With the disk cache enabled the whole body is read, so that it can be stored.
+    """
+
+    if get_response_cache() is not None:
+        return iter([finviz_request(url, user_agent).content])
+
+    wait_for_rate_limit()
+    response = get_session().get(url, headers={"User-Agent": user_agent}, stream=True)
+    chunks = response.iter_content(STREAM_CHUNK_SIZE)
+    first_chunk = next(chunks, b"")
+
+    if is_throttled(response.status_code, first_chunk):
+        response.close()
+        raise Exception("Too many requests.")
+
+    return itertools.chain([first_chunk], chunks)
+
+
+def sequential_data_iter(
+    scrape_func: Callable, urls: List[str], user_agent: str, *args, **kwargs
+) -> Iterator:
+    """ Downloads the URL's one at a time and yields each scraped page as soon as it arrives. """
+
+    for url in tqdm(urls, disable="DISABLE_TQDM" in os.environ):
+        response = finviz_request(url, user_agent)
+        kwargs["URL"] = url
+        yield scrape_func(response, *args, **kwargs)
+
+
 def sequential_data_scrape(
     scrape_func: Callable, urls: List[str], user_agent: str, *args, **kwargs
 ) -> List[Dict]:
-    data = []
+    return list(sequential_data_iter(scrape_func, urls, user_agent, *args, **kwargs))
+
+
+def sequential_stream_iter(
+    stream_parser: Callable, urls: List[str], user_agent: str
+) -> Iterator[List]:
+    """
+    Downloads the URL's one at a time and feeds each body to a new parser from the stream_parser
+    factory (eg. TableStreamParser) while it arrives. Yields what the parser returns for every chunk.
+    """
 
     for url in tqdm(urls, disable="DISABLE_TQDM" in os.environ):
-        try:
-            response = finviz_request(url, user_agent)
-            kwargs["URL"] = url
-            data.append(scrape_func(response, *args, **kwargs))
-        except Exception as exc:
-            raise exc
+        parser = stream_parser()
+        for chunk in finviz_stream_request(url, user_agent):
+            yield parser.feed(chunk)
+        yield parser.close()
+
+
+def is_throttled(status: int, body: bytes) -> bool:
+    """ Checks if FinViz rejected the request because too many requests were sent. """
+
+    return status in (429, 503) or body == b"Too many requests."
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """ Returns the number of seconds requested by a Retry-After header, if any. """
+
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def retry_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """ Returns a jittered exponential backoff delay, never shorter than Retry-After. """
+
+    ceiling = min(
+        connection_settings["RETRY_BACKOFF_MAX"],
+        connection_settings["RETRY_BACKOFF"] * 2 ** attempt,
+    )
+    delay = random.uniform(ceiling / 2, ceiling)
+
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+
+    return delay
+
+
+class TokenBucket:
+    """
+    Token bucket used to keep the request rate under the FinViz limit. acquire is awaited by
+    asynchronous requests, acquire_blocking is called before synchronous ones.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._thread_lock = threading.Lock()
+
+    def __take(self) -> float:
+        """ Private function used to take a token, or return the seconds until one is available. """
+
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+
+        return (1 - self._tokens) / self.rate
+
+    async def acquire(self):
+        """ Waits until a token is available and takes it. """
+
+        if not self.rate:
+            return
+
+        async with self._lock:
+            while True:
+                delay = self.__take()
+                if not delay:
+                    return
+
+                await asyncio.sleep(delay)
+
+    def acquire_blocking(self):
+        """ Blocking version of acquire, for synchronous requests. """
+
+        if not self.rate:
+            return
 
-    return data
+        with self._thread_lock:
+            while True:
+                delay = self.__take()
+                if not delay:
+                    return
+
+                time.sleep(delay)
+
+
+@asynccontextmanager
+async def client_session(
+    session: Optional[aiohttp.ClientSession] = None, user_agent: str = USER_AGENT
+):
+    """
+    Yields the given aiohttp session, or a new one configured from connection_settings
+    which is closed on exit.
+    """
+
+    if session is not None:
+        yield session
+        return
+
+    conn = aiohttp.TCPConnector(
+        limit_per_host=connection_settings["CONCURRENT_CONNECTIONS"]
+    )
+    timeout = aiohttp.ClientTimeout(total=connection_settings["CONNECTION_TIMEOUT"])
+
+    async with aiohttp.ClientSession(
+        connector=conn, timeout=timeout, headers={"User-Agent": user_agent}
+    ) as new_session:
+        yield new_session
+
+
+async def fetch_async(
+    session: aiohttp.ClientSession,
+    url: str,
+    user_agent: str = USER_AGENT,
+    bucket: Optional[TokenBucket] = None,
+    parser=None,
+    refresh: bool = False,
+):
+    """
+    Sends an asynchronous GET request and returns the response body and its final url.
+    Throttled responses are retried with backoff up to MAX_ATTEMPTS times, other
+    error responses raise aiohttp.ClientResponseError.
+
+    When a stream parser is given, the body is fed to it while it arrives and the parsed
+    items are returned instead of the body.
+
+    With refresh, a cached response is not read but the fresh one is still stored.
+    """
+
+    cache = get_response_cache()
+    if cache is not None and parser is not None:
+        page_html, final_url = await fetch_async(
+            session, url, user_agent, bucket, refresh=refresh
+        )
+        return parser.feed(page_html) + parser.close(), final_url
+
+    entry = cache.get(url) if cache is not None and not refresh else None
+    if entry is not None:
+        return entry
+
+    try:
+        for attempt in range(connection_settings["MAX_ATTEMPTS"]):
+            if bucket is not None:
+                await bucket.acquire()
+
+            async with session.get(url, headers={"User-Agent": user_agent}) as response:
+                if parser is None:
+                    page_html = await response.read()
+                else:
+                    page_html = await response.content.read(STREAM_CHUNK_SIZE)
+
+                if not is_throttled(response.status, page_html):
+                    response.raise_for_status()
+
+                    if parser is not None:
+                        items = parser.feed(page_html)
+                        async for chunk in response.content.iter_chunked(
+                            STREAM_CHUNK_SIZE
+                        ):
+                            items.extend(parser.feed(chunk))
+                        return items + parser.close(), str(response.url)
+
+                    if cache is not None and response.status == 200:
+                        cache.set(url, page_html, str(response.url))
+                    return page_html, str(response.url)
+
+                delay = retry_delay(
+                    attempt, parse_retry_after(response.headers.get("Retry-After"))
+                )
+
+            if attempt < connection_settings["MAX_ATTEMPTS"] - 1:
+                await asyncio.sleep(delay)
+    except (asyncio.TimeoutError, requests.exceptions.Timeout):
+        raise ConnectionTimeout(url)
+
+    raise TooManyRequests(url)
+
+
+async def async_http_request_get(
+    url, session=None, payload=None, parse=True, user_agent=USER_AGENT, refresh=False
+):
+    """ Asynchronous version of http_request_get, it runs on the caller's event loop. """
+
+    if payload:
+        url = f"{url}?{urlencode(payload)}"
+
+    async with client_session(session, user_agent) as active_session:
+        page_html, final_url = await fetch_async(
+            active_session, url, user_agent, refresh=refresh
+        )
+
+    if parse:
+        return html.fromstring(page_html), final_url
+    return page_html.decode("utf-8"), final_url
+
+
+_DEFAULT_EXECUTOR = object()
+_parse_executors = {}
+_parse_executors_lock = threading.Lock()
+
+
+def get_parse_executor(kind: Union[str, Executor, None]) -> Optional[Executor]:
+    """
+    Returns the shared executor for "thread" or "process" parsing, creating it on first use.
+    Executor instances are returned unchanged and None disables the executor.
+    """
+
+    if kind is None or isinstance(kind, Executor):
+        return kind
+
+    executor_classes = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+    if kind not in executor_classes:
+        raise ValueError(f"Invalid parse executor: {kind}")
+
+    with _parse_executors_lock:
+        if kind not in _parse_executors:
+            _parse_executors[kind] = executor_classes[kind](
+                max_workers=connection_settings["PARSE_WORKERS"]
+            )
+
+    return _parse_executors[kind]
+
+
+def scrape_page(scrape_function: Callable, page_html: bytes, css_select: bool, url: str, *args):
+    """
+    Parses (if css_select is set) and scrapes a downloaded page. It is a module level
+    function, so that it can be sent to a process pool together with its arguments.
+    """
+
+    if css_select:
+        return scrape_function(html.fromstring(page_html), *args, URL=url)
+    return scrape_function(page_html, *args, URL=url)
 
 
 class Connector:
-    """ Used to make asynchronous HTTP requests. """
+    """
+    Used to make asynchronous HTTP requests.
+
+    The downloaded pages are scraped on the event loop, unless a parse executor is given
+    ("thread", "process" or an Executor instance, PARSE_EXECUTOR by default; None scrapes
+    on the event loop whatever PARSE_EXECUTOR is set to). Scrape functions
+    and their arguments must be picklable module level objects to use a process pool.
+
+    With a stream_parser factory (eg. TableStreamParser) each body is parsed on the event loop
+    while it downloads, and the scrape function and parse executor are not used.
+
+    With return_exceptions, a URL that fails is stored with its exception instead of
+    stopping all requests. With refresh, cached responses are not read.
+    """
 
     def __init__(
         self,
@@ -82,61 +489,178 @@ class Connector:
         urls: List[str],
         user_agent: str,
         *args,
-        css_select: bool = False
+        css_select: bool = False,
+        parse_executor: Union[str, Executor, None] = _DEFAULT_EXECUTOR,
+        stream_parser: Optional[Callable] = None,
+        return_exceptions: bool = False,
+        refresh: bool = False
     ):
         self.scrape_function = scrape_function
         self.urls = urls
         self.user_agent = user_agent
         self.arguments = args
         self.css_select = css_select
+        self.stream_parser = stream_parser
+        self.return_exceptions = return_exceptions
+        self.refresh = refresh
+        if parse_executor is _DEFAULT_EXECUTOR:
+            parse_executor = connection_settings["PARSE_EXECUTOR"]
+        self.parse_executor = get_parse_executor(parse_executor)
         self.data = []
 
     async def __http_request__async(
         self,
         url: str,
         session: aiohttp.ClientSession,
+        bucket: TokenBucket,
     ):
         """ Sends asynchronous http request to URL address and scrapes the webpage. """
 
-        try:
-            async with session.get(
-                url, headers={"User-Agent": self.user_agent}
-            ) as response:
-                page_html = await response.read()
-
-                if page_html.decode("utf-8") == "Too many requests.":
-                    raise Exception("Too many requests.")
-
-                if self.css_select:
-                    return self.scrape_function(
-                        html.fromstring(page_html), *self.arguments
-                    )
-                return self.scrape_function(page_html, *self.arguments)
-        except (asyncio.TimeoutError, requests.exceptions.Timeout):
-            raise ConnectionTimeout(url)
-
-    async def __async_scraper(self):
-        """ Adds a URL's into a list of tasks and requests their response asynchronously. """
-
-        async_tasks = []
-        conn = aiohttp.TCPConnector(
-            limit_per_host=connection_settings["CONCURRENT_CONNECTIONS"]
+        if self.stream_parser is not None:
+            data, _ = await fetch_async(
+                session, url, self.user_agent, bucket, self.stream_parser(), self.refresh
+            )
+            return data
+
+        page_html, _ = await fetch_async(
+            session, url, self.user_agent, bucket, refresh=self.refresh
+        )
+        scrape_arguments = (
+            self.scrape_function,
+            page_html,
+            self.css_select,
+            url,
+            *self.arguments,
         )
-        timeout = aiohttp.ClientTimeout(total=connection_settings["CONNECTION_TIMEOUT"])
 
-        async with aiohttp.ClientSession(
-            connector=conn, timeout=timeout, headers={"User-Agent": self.user_agent}
-        ) as session:
-            for url in self.urls:
-                async_tasks.append(self.__http_request__async(url, session))
+        if self.parse_executor is None:
+            return scrape_page(*scrape_arguments)
 
-            self.data = await asyncio.gather(*async_tasks)
+        return await asyncio.get_running_loop().run_in_executor(
+            self.parse_executor, scrape_page, *scrape_arguments
+        )
 
-    def run_connector(self):
-        """ Starts the asynchronous loop and returns the scraped data. """
+    async def __worker(
+        self,
+        queue: asyncio.Queue,
+        session: aiohttp.ClientSession,
+        bucket: TokenBucket,
+        progress_bar: tqdm,
+        store: Callable,
+    ):
+        """ Takes URL's from the queue one at a time until it is empty. """
+
+        while True:
+            try:
+                index, url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
 
-        asyncio.set_event_loop(asyncio.SelectorEventLoop())
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(self.__async_scraper())
+            try:
+                data = await self.__http_request__async(url, session, bucket)
+            except Exception as error:
+                if not self.return_exceptions:
+                    raise
+                data = error
+
+            store(index, data)
+            progress_bar.update()
+
+    async def __async_scraper(self, session: aiohttp.ClientSession, store: Callable):
+        """ Requests the URL's through a bounded pool of workers sharing one rate limiter. """
+
+        queue = asyncio.Queue()
+        for index, url in enumerate(self.urls):
+            queue.put_nowait((index, url))
+
+        bucket = TokenBucket(
+            connection_settings["RATE_LIMIT"], connection_settings["RATE_BURST"]
+        )
+        worker_count = min(
+            connection_settings["CONCURRENT_CONNECTIONS"], len(self.urls)
+        )
+
+        with tqdm(
+            total=len(self.urls), disable="DISABLE_TQDM" in os.environ
+        ) as progress_bar:
+            await asyncio.gather(
+                *[
+                    self.__worker(queue, session, bucket, progress_bar, store)
+                    for _ in range(worker_count)
+                ]
+            )
+
+    async def run_async(self, session: Optional[aiohttp.ClientSession] = None):
+        """
+        Scrapes all URL's on the running event loop and returns the scraped data.
+        A shared aiohttp session may be passed in, it is left open afterwards.
+        """
+
+        self.data = [None] * len(self.urls)
+
+        async with client_session(session, self.user_agent) as active_session:
+            await self.__async_scraper(active_session, self.data.__setitem__)
 
         return self.data
+
+    async def aiter_pages(self, session: Optional[aiohttp.ClientSession] = None):
+        """
+        Yields the scraped pages in URL order, each one as soon as it and
+        all pages before it have been downloaded.
+        """
+
+        loop = asyncio.get_running_loop()
+        pages = [loop.create_future() for _ in self.urls]
+
+        def fail_pending(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is not None:
+                for page in pages:
+                    if not page.done():
+                        page.set_exception(task.exception())
+
+        async with client_session(session, self.user_agent) as active_session:
+            scraper = asyncio.ensure_future(
+                self.__async_scraper(
+                    active_session, lambda index, data: pages[index].set_result(data)
+                )
+            )
+            scraper.add_done_callback(fail_pending)
+
+            try:
+                for page in pages:
+                    yield await page
+            finally:
+                if not scraper.done():
+                    scraper.cancel()
+                    await asyncio.gather(scraper, return_exceptions=True)
+
+    def iter_pages(self):
+        """
+        Synchronous version of aiter_pages: runs one event loop, session and rate limiter for all
+        the URL's and yields the scraped pages in URL order as they arrive. Requests only progress
+        while the caller waits for the next page.
+        """
+
+        if not self.urls:
+            return
+
+        loop = asyncio.SelectorEventLoop()
+        pages = self.aiter_pages()
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(pages.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(pages.aclose())
+            loop.close()
+
+    def run_connector(self):
+        """ Starts a new event loop, returns the scraped data and closes the loop. """
+
+        loop = asyncio.SelectorEventLoop()
+        try:
+            return loop.run_until_complete(self.run_async())
+        finally:
+            loop.close()
@@ -1,7 +1,15 @@
+import abc
 import csv
+import datetime
+import gzip
 import io
+import json
+import math
 import re
 import sqlite3
+from array import array
+
+from finviz.helper_functions.conversion import convert_table
 
 
 def create_connection(sqlite_file):
@@ -38,41 +46,280 @@ def export_to_csv(headers, data, filename=None, mode="w", newline=""):
     return stream.getvalue()
 
 
-def export_to_db(headers, data, filename):
-    """ Exports the generated table into a SQLite database into a file."""
+def clean_field_name(field):
+    """ Returns the SQLite column name of a table header, eg.: '52W High' -> 'High52W'. """
+
+    field_cleaned = field.replace("%", "Pct").replace("$", "Dollar")
+    field_cleaned = re.sub(r"[^\w\s]", "", field_cleaned)
+    field_cleaned = field_cleaned.replace(" ", "")
+    field_cleaned = field_cleaned.replace("50DHigh", "High50D")
+    field_cleaned = field_cleaned.replace("50DLow", "Low50D")
+    field_cleaned = field_cleaned.replace("52WHigh", "High52W")
+    field_cleaned = field_cleaned.replace("52WLow", "Low52W")
+    return field_cleaned
+
+
+def quote_identifier(name):
+    """ Quotes a table or column name for use in an SQL statement. """
+
+    return '"' + name.replace('"', '""') + '"'
+
+
+SQLITE_TYPES = {"number": "REAL", "percent": "REAL", "date": "TEXT", "str": "TEXT"}
+SNAPSHOT_COLUMN = "Snapshot"
+INDEX_COLUMNS = ("Ticker", "Sector", "Industry", "Country")
+
+
+def __sqlite_value(value):
+    """ Converts a cell to a value SQLite can store: NaN becomes NULL and dates ISO strings. """
+
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def export_to_db(
+    headers,
+    data,
+    filename,
+    table_name="screener_results",
+    schema=None,
+    key_columns=("Ticker",),
+    snapshot=None,
+    chunk_size=1000,
+):
+    """
+    Exports the generated table into a SQLite database into a file.
+
+    Rows are inserted with executemany in transactions of chunk_size rows. Columns found in the
+    schema are stored as REAL, the others as TEXT. Each row is stamped with a snapshot time
+    (now by default), and rows with the same key columns and snapshot are replaced, so daily
+    snapshots can be appended to the same table. Columns missing from an existing table are added.
+    """
+
+    schema = schema or {}
+    snapshot = snapshot or datetime.datetime.now().isoformat(timespec="seconds")
+    if isinstance(snapshot, (datetime.date, datetime.datetime)):
+        snapshot = snapshot.isoformat()
 
-    field_list = ""
-    table_name = "screener_results"  # name of the table to be created
+    field_names = [clean_field_name(field) for field in headers]
+    field_types = [SQLITE_TYPES[schema.get(field, "str")] for field in headers]
+    table = quote_identifier(table_name)
     conn = create_connection(filename)
-    c = conn.cursor()
 
-    for field in headers:
-        field_cleaned = re.sub(r"[^\w\s]", "", field)
-        field_cleaned = field_cleaned.replace(" ", "")
-        field_cleaned = field_cleaned.replace("50DHigh", "High50D")
-        field_cleaned = field_cleaned.replace("50DLow", "Low50D")
-        field_cleaned = field_cleaned.replace("52WHigh", "High52W")
-        field_cleaned = field_cleaned.replace("52WLow", "Low52W")
-        field_list += field_cleaned + " TEXT, "
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        with conn:
+            column_definitions = [(SNAPSHOT_COLUMN, "TEXT")] + list(
+                zip(field_names, field_types)
+            )
+            definitions = ", ".join(
+                f"{quote_identifier(name)} {type_}" for name, type_ in column_definitions
+            )
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({definitions})")
+
+            # Tables written by earlier exports may lack some of the columns
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for name, type_ in column_definitions:
+                if name not in existing:
+                    conn.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {quote_identifier(name)} {type_}"
+                    )
+
+            key_names = [clean_field_name(field) for field in key_columns if field in headers]
+            if key_names:
+                conn.execute(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS "
+                    f"{quote_identifier(f'{table_name}_key')} ON {table} "
+                    f"({', '.join(map(quote_identifier, key_names + [SNAPSHOT_COLUMN]))})"
+                )
+
+            for field in [SNAPSHOT_COLUMN] + [f for f in INDEX_COLUMNS if f in field_names]:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS "
+                    f"{quote_identifier(f'{table_name}_{field}')} ON {table} "
+                    f"({quote_identifier(field)})"
+                )
+
+        columns = ", ".join(map(quote_identifier, [SNAPSHOT_COLUMN] + field_names))
+        placeholders = ", ".join("?" * (len(field_names) + 1))
+        statement = f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})"
+
+        for start in range(0, len(data), chunk_size):
+            converted = convert_table(headers, data[start : start + chunk_size], schema)
+            rows = zip(*(converted[field] for field in headers))
+            with conn:
+                conn.executemany(
+                    statement,
+                    ([snapshot] + [__sqlite_value(value) for value in row] for row in rows),
+                )
+    finally:
+        conn.close()
+
+
+class RowSink(abc.ABC):
+    """
+    Base class of the files rows are written into as they arrive. Every batch is flushed,
+    so a run that stops halfway still leaves the rows written so far on disk.
+    Files ending with ".gz" are gzip compressed, unless compress says otherwise.
+    """
+
+    def __init__(self, filename, compress=None):
+        if compress is None:
+            compress = str(filename).endswith(".gz")
+
+        if compress:
+            self._file = gzip.open(filename, "wt", encoding="utf-8", newline="")
+        else:
+            self._file = open(filename, "w", encoding="utf-8", newline="")
+
+        self.row_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    c.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({field_list[:-2]});")
+    @abc.abstractmethod
+    def _write_row(self, row):
+        """ Writes a single row into the file, without flushing it. """
 
-    inserts = ""
-    for row in data:
+    def write_rows(self, rows):
+        """ Writes a batch of rows and flushes them to the file. """
 
-        insert_fields = "("
-        for field, value in row.items():
+        for row in rows:
+            self._write_row(row)
+            self.row_count += 1
 
-            insert_fields += '"' + value + '", '
+        self._file.flush()
 
-        inserts += insert_fields[:-2] + "), "
+    def write(self, row):
+        """ Writes a single row. """
 
-    insert_lines = inserts[:-2]
+        self.write_rows([row])
+
+    def close(self):
+        self._file.close()
+
+
+class CsvSink(RowSink):
+    """
+    Writes rows into a CSV file. The headers are taken from the first row when not given.
+    Columns outside of the given headers are left out, but a row with columns the first row
+    did not have raises ValueError, as they can not be added once the header line is written.
+    """
+
+    def __init__(self, filename, headers=None, compress=None):
+        super().__init__(filename, compress)
+        self.headers = headers
+        self._writer = None
+
+    def _write_row(self, row):
+        if self._writer is None:
+            extrasaction = "raise" if self.headers is None else "ignore"
+            self.headers = list(self.headers or row.keys())
+            self._writer = csv.DictWriter(self._file, self.headers, extrasaction=extrasaction)
+            self._writer.writeheader()
+
+        try:
+            self._writer.writerow(row)
+        except ValueError as error:
+            new_columns = [key for key in row if key not in self.headers]
+            raise ValueError(
+                f"Row has columns missing from the CSV headers: {new_columns}. "
+                "Pass headers to CsvSink or use a JsonLinesSink."
+            ) from error
+
+
+class JsonLinesSink(RowSink):
+    """ Writes rows into a JSON Lines file, one object per line. Missing numbers (NaN) are null. """
+
+    def _write_row(self, row):
+        self._file.write(
+            json.dumps(
+                {
+                    key: None if isinstance(value, float) and math.isnan(value) else value
+                    for key, value in row.items()
+                },
+                default=str,
+            )
+        )
+        self._file.write("\n")
+
+
+def import_pyarrow(method):
+    """ Imports pyarrow, which is only needed by the Arrow exports. """
 
     try:
-        c.execute(f"INSERT INTO {table_name} VALUES {insert_lines};")
-    except sqlite3.Error as error:
-        print("An error has occurred", error.args[0])
+        import pyarrow
+    except ImportError as error:
+        raise ImportError(
+            f"pyarrow is required for {method}(). Install with: pip install pyarrow"
+        ) from error
+
+    return pyarrow
+
+
+def columns_to_arrow(headers, columns, method="to_arrow"):
+    """
+    Builds a pyarrow Table from a dictionary of columns (see Screener.to_columns).
+    Float arrays and the codes of dictionary-encoded columns are copied into Arrow buffers
+    as a whole, without converting every value. They are not wrapped in place, as the Table
+    would then change with the columns and they could not grow while the Table exists.
+    """
+
+    pa = import_pyarrow(method)
+    import pyarrow.compute as pc
+
+    arrow_columns = []
+
+    for header in headers:
+        column = columns[header]
+
+        if isinstance(column, array):
+            values = pa.Array.from_buffers(
+                pa.float64(), len(column), [None, pa.py_buffer(column.tobytes())]
+            )
+            missing = pc.is_nan(values)
+            if pc.any(missing).as_py():  # Missing values are stored as nulls, not NaN
+                values = pc.if_else(missing, pa.scalar(None, pa.float64()), values)
+            arrow_columns.append(values)
+        elif hasattr(column, "codes"):  # DictionaryColumn
+            # The unsigned codes never reach 2 ** 31, so they can be read as signed indices.
+            # array("I") is 4 bytes wide on the usual platforms, otherwise the codes are converted.
+            if column.codes.itemsize == 4:
+                indices = pa.Array.from_buffers(
+                    pa.int32(), len(column), [None, pa.py_buffer(column.codes.tobytes())]
+                )
+            else:
+                indices = pa.array(column.codes, pa.int32())
+            arrow_columns.append(
+                pa.DictionaryArray.from_arrays(indices, pa.array(column.values, pa.string()))
+            )
+        else:
+            arrow_columns.append(pa.array(column))
+
+    return pa.table(arrow_columns, names=headers)
+
+
+def export_to_parquet(table, filename, **kwargs):
+    """ Writes a pyarrow Table into a Parquet file. """
+
+    import_pyarrow("to_parquet")
+    import pyarrow.parquet as pq
+
+    pq.write_table(table, filename, **kwargs)
+
+
+def export_to_feather(table, filename, **kwargs):
+    """ Writes a pyarrow Table into an Arrow IPC (Feather v2) file. """
+
+    import_pyarrow("to_feather")
+    import pyarrow.feather as feather
 
-    conn.commit()
-    conn.close()
+    feather.write_feather(table, filename, **kwargs)
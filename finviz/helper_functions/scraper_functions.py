@@ -1,17 +1,49 @@
 import datetime
+import functools
 import os
 import time
 
 import requests
 from lxml import etree, html
 
-
-def get_table(page_html: requests.Response, headers, rows=None, **kwargs):
-    """ Private function used to return table data inside a list of dictionaries. """
-    if isinstance(page_html, str):
-        page_parsed = html.fromstring(page_html)
-    else:
-        page_parsed = html.fromstring(page_html.text)
+import finviz.helper_functions.xpath_selectors as select
+
+ROWS_PER_PAGE = 20  # Number of rows FinViz shows on a screener page
+# Labels of the snapshot table of a quote page, in the order they are shown
+SNAPSHOT_FIELDS = [
+    "Index", "P/E", "EPS (ttm)", "Insider Own", "Shs Outstand", "Perf Week",
+    "Market Cap", "Forward P/E", "EPS next Y", "Insider Trans", "Shs Float", "Perf Month",
+    "Enterprise Value", "PEG", "EPS next Q", "Inst Own", "Short Float", "Perf Quarter",
+    "Income", "P/S", "EPS this Y", "Inst Trans", "Short Ratio", "Perf Half Y",
+    "Sales", "P/B", "ROA", "Short Interest", "Perf YTD",
+    "Book/sh", "P/C", "EPS next 5Y", "ROE", "52W High", "Perf Year",
+    "Cash/sh", "P/FCF", "EPS past 3/5Y", "ROIC", "52W Low", "Perf 3Y",
+    "Dividend Est.", "EV/EBITDA", "Sales past 3/5Y", "Gross Margin", "Volatility", "Perf 5Y",
+    "Dividend TTM", "EV/Sales", "EPS Y/Y TTM", "Oper. Margin", "ATR (14)", "Perf 10Y",
+    "Dividend Ex-Date", "Quick Ratio", "Sales Y/Y TTM", "Profit Margin", "RSI (14)", "Recom",
+    "Dividend Gr. 3/5Y", "Current Ratio", "EPS Q/Q", "SMA20", "Beta", "Target Price",
+    "Payout", "Debt/Eq", "Sales Q/Q", "SMA50", "Rel Volume", "Prev Close",
+    "Employees", "LT Debt/Eq", "Earnings", "SMA200", "Avg Volume", "Price",
+    "IPO", "Option/Short", "EPS/Sales Surpr.", "Trades", "Volume", "Change",
+]
+
+
+def parse_page(page):
+    """ Returns the parsed HTML of a page given as a response, bytes, string or parsed tree. """
+
+    if isinstance(page, html.HtmlElement):
+        return page
+    if isinstance(page, requests.Response):
+        page = page.content
+    return html.fromstring(page)
+
+
+def get_table(page_html, headers, rows=None, **kwargs):
+    """
+    Private function used to return table data inside a list of dictionaries.
+    The page may be a response, raw bytes or string, or an already parsed tree.
+    """
+    page_parsed = parse_page(page_html)
     # When we call this method from Portfolio we don't fill the rows argument.
     # Conversely, we always fill the rows argument when we call this method from Screener.
     # Also, in the portfolio page, we don't need the last row - it's redundant.
@@ -21,8 +53,7 @@ def get_table(page_html: requests.Response, headers, rows=None, **kwargs):
     data_sets = []
     # Select the HTML of the rows and append each column text to a list
     all_rows = [
-        column.xpath("td//text()")
-        for column in page_parsed.cssselect('tr[valign="top"]')
+        select.CELL_TEXTS(column) for column in select.SCREENER_ROWS(page_parsed)
     ]
 
     # If rows is different from -2, this function is called from Screener
@@ -38,16 +69,58 @@ def get_table(page_html: requests.Response, headers, rows=None, **kwargs):
     return data_sets
 
 
+class TableStreamParser:
+    """
+    Incremental version of get_table for screener pages. The body is fed in chunks while it
+    downloads and every call returns the rows completed so far. The elements of a row are
+    freed once it is read, so the page is never held as a whole tree.
+    """
+
+    def __init__(self, headers, rows=None):
+        self.headers = headers
+        self.rows = rows
+        self.row_count = 0
+        self._parser = etree.HTMLPullParser(events=("end",), tag="tr")
+
+    def feed(self, chunk):
+        """ Parses the next chunk of the body and returns the rows it completed. """
+
+        self._parser.feed(chunk)
+        return self.__read_rows()
+
+    def close(self):
+        """ Finishes the page and returns the remaining rows. """
+
+        self._parser.close()
+        return self.__read_rows()
+
+    def __read_rows(self):
+        """ Private function used to convert the finished rows to dictionaries and free them. """
+
+        data_sets = []
+
+        for _, row in self._parser.read_events():
+            if row.get("valign") == "top" and self.row_count != self.rows:
+                data_sets.append(dict(zip(self.headers, select.CELL_TEXTS(row))))
+                self.row_count += 1
+
+            row.clear()
+            while row.getprevious() is not None:
+                del row.getparent()[0]
+
+        return data_sets
+
+
 def get_total_rows(page_content):
-    """ Returns the total number of rows(results). """
+    """ Returns the total number of rows(results) from the "#1 / <total> Total" counter. """
 
-    options=[('class="count-text whitespace-nowrap">#1 / ',' Total</div>'),('class="count-text">#1 / ',' Total</td>')]
-    page_text = str(html.tostring(page_content))
-    for option_beg,option_end in options:
-        if option_beg in page_text:
-            total_number = page_text.split(option_beg)[1].split(option_end)[0]
+    for counter in select.COUNT_TEXT(parse_page(page_content)):
+        counter_text = counter.text_content()
+
+        if "#1 / " in counter_text and "Total" in counter_text:
+            total_number = counter_text.split("#1 / ")[1].split("Total")[0]
             try:
-                return int(total_number)
+                return int(total_number.strip().replace(",", ""))
             except ValueError:
                 return 0
     return 0
@@ -56,22 +129,29 @@ def get_total_rows(page_content):
 def get_page_urls(page_content, rows, url):
     """ Returns a list containing all of the page URL addresses. """
 
+    page_content = parse_page(page_content)
     total_pages = int(
-        [i.text.split("/")[1] for i in page_content.cssselect('option[value="1"]')][0]
+        [i.text.split("/")[1] for i in select.FIRST_PAGE_OPTION(page_content)][0]
     )
-    urls = []
 
-    for page_number in range(1, total_pages + 1):
-        sequence = 1 + (page_number - 1) * 20
+    return get_page_urls_from_rows(min(rows, total_pages * ROWS_PER_PAGE), url)
+
 
-        if sequence - 20 <= rows < sequence:
-            break
-        urls.append(url + f"&r={str(sequence)}")
+def get_page_urls_from_rows(rows, url, first_page=1):
+    """
+    Returns the URL addresses of the pages needed to read the given number of rows
+    (eg. from get_total_rows), starting at first_page.
+    """
 
-    return urls
+    last_page = (rows + ROWS_PER_PAGE - 1) // ROWS_PER_PAGE
+
+    return [
+        url + f"&r={str(1 + (page_number - 1) * ROWS_PER_PAGE)}"
+        for page_number in range(first_page, last_page + 1)
+    ]
 
 
-def download_chart_image(page_content: requests.Response, **kwargs):
+def download_chart_image(page_content, **kwargs):
     """ Downloads a .png image of a chart into the "charts" folder. """
     file_name = f"{kwargs['URL'].split('t=')[1]}_{int(time.time())}.png"
 
@@ -79,40 +159,424 @@ def download_chart_image(page_content: requests.Response, **kwargs):
         os.mkdir("charts")
 
     with open(os.path.join("charts", file_name), "wb") as handle:
-        handle.write(page_content.content)
+        handle.write(getattr(page_content, "content", page_content))
 
 
-def get_analyst_price_targets_for_export(
-    ticker=None, page_content=None, last_ratings=5
-):
+class QuotePage:
     """
-    Extract analyst price targets from a stock page for CSV export.
-
-    :param ticker: stock symbol
-    :param page_content: parsed HTML content
-    :param last_ratings: number of ratings to return
-    :return: list of dictionaries
+    Sections of a quote page (quote.ashx): header, snapshot, insider transactions, news and
+    analyst ratings. Each section is extracted once, when it is first needed. Its elements are
+    found in one pass over the elements of their tag: the tables (insider, news and ratings),
+    the snapshot rows or the header, so a caller reading one section does not search the
+    elements of the others.
     """
-    analyst_price_targets = []
 
-    try:
-        # Try new table class first
-        tables = page_content.cssselect('table.js-table-ratings')
-        if not tables:
-            # Fallback to old class
-            tables = page_content.cssselect('table.fullview-ratings-outer')
+    def __init__(self, page, ticker=None):
+        """
+        :param page: HTTP response, raw bytes or string, or parsed HTML of the page
+        :param ticker: stock symbol, used when the page has no ticker header
+        :type ticker: str
+        """
+
+        self.page = parse_page(page)
+        self.ticker = ticker
+
+    @functools.cached_property
+    def _header(self):
+        """
+        Private function used to find the ticker header, the company link and the links
+        to the sector, industry and country screens.
+        """
+
+        ticker_header = None
+        company_link = None
+        quote_links = []
+
+        for element in self.page.iter("h1", "h2", "div"):
+            classes = element.get("class", "").split()
+
+            if element.tag == "h1":
+                if ticker_header is None and "quote-header_ticker-wrapper_ticker" in classes:
+                    ticker_header = element
+            elif element.tag == "h2":
+                if company_link is None and "quote-header_ticker-wrapper_company" in classes:
+                    links = select.TAB_LINKS(element)
+                    company_link = links[0] if links else None
+            elif "quote-links" in classes:
+                quote_links.extend(select.TAB_LINKS(element))
+
+        return ticker_header, company_link, quote_links
+
+    @functools.cached_property
+    def _snapshot_rows(self):
+        """ Private function used to find the rows of the snapshot table. """
+
+        return [
+            row for row in self.page.iter("tr") if "table-dark-row" in row.get("class", "").split()
+        ]
+
+    @functools.cached_property
+    def _tables(self):
+        """
+        Private function used to find the insider, news and ratings tables, keyed by section
+        ("old_" keys hold the tables of the previous page layout).
+        """
+
+        tables = {}
+
+        for table in self.page.iter("table"):
+            classes = table.get("class", "").split()
+
+            if table.get("id") == "news-table":
+                tables.setdefault("news", table)
+            elif "js-table-ratings" in classes:
+                tables.setdefault("ratings", table)
+            elif "fullview-ratings-outer" in classes:
+                tables.setdefault("old_ratings", table)
+            elif "styled-table-new" in classes:
+                if "insider" not in tables:
+                    headers = select.THEAD_TH(table)
+                    if any("Insider Trading" in h.text_content() for h in headers):
+                        tables["insider"] = table
+            elif "body-table" in classes and "insider-trading-table" in classes:
+                tables.setdefault("old_insider", table)
+
+        return tables
+
+    @functools.cached_property
+    def _snapshot(self):
+        """ Private function used to extract the label/value pairs of the snapshot table. """
+
+        data = {}
+
+        for row in self._snapshot_rows:
+            cells = select.SNAPSHOT_CELLS(row)
+            # Cells come in pairs: label, value, label, value, ...
+            for i in range(0, len(cells) - 1, 2):
+                label = cells[i].text_content().strip()
+                value = cells[i + 1].text_content().strip()
+                if label:
+                    data[label] = value
+
+        # Fallback to old xpath method if new method returns empty
+        if len(data) == 0:
+            for row in [select.CELL_TEXTS(row) for row in self._snapshot_rows]:
+                for column in range(0, min(11, len(row) - 1)):
+                    if column % 2 == 0:
+                        data[row[column]] = row[column + 1]
+
+        return data
+
+    @functools.cached_property
+    def _stock(self):
+        """ Private function used to extract the header and the snapshot of the stock. """
+
+        data = {}
+        ticker_header, company_link, quote_links = self._header
+
+        # Extract basic info from the new header structure
+        if ticker_header is not None:
+            data["Ticker"] = ticker_header.text_content().strip()
+        else:
+            data["Ticker"] = self.ticker
+
+        # Company name and website
+        if company_link is not None:
+            data["Company"] = company_link.text_content().strip()
+            website = company_link.attrib.get("href", "")
+            data["Website"] = website if website.startswith("http") else None
+        else:
+            data["Company"] = ""
+            data["Website"] = None
+
+        # Sector, Industry, Country from the quote-links section
+        sector_industry_country = []
+        for link in quote_links:
+            href = link.attrib.get("href", "")
+            # Links to screener with sector/industry/country filters
+            if "f=sec_" in href or "f=ind_" in href or "f=geo_" in href:
+                sector_industry_country.append(link.text_content().strip())
+
+        if len(sector_industry_country) >= 3:
+            data["Sector"] = sector_industry_country[0]
+            data["Industry"] = sector_industry_country[1]
+            data["Country"] = sector_industry_country[2]
+        elif len(sector_industry_country) == 2:
+            data["Sector"] = sector_industry_country[0]
+            data["Industry"] = sector_industry_country[1]
+            data["Country"] = ""
+        elif len(sector_industry_country) == 1:
+            data["Sector"] = sector_industry_country[0]
+            data["Industry"] = ""
+            data["Country"] = ""
+
+        # Extract financial data from the snapshot table
+        # The table uses tr.table-dark-row with td.snapshot-td2 cells
+        for row in self._snapshot_rows:
+            cells = select.SNAPSHOT_CELLS(row)
+            # Cells come in pairs: label, value, label, value, ...
+            for i in range(0, len(cells) - 1, 2):
+                # Get label text (may contain links) and value text (usually in <b> tag)
+                label = cells[i].text_content().strip()
+                value = cells[i + 1].text_content().strip()
+
+                if not label:
+                    continue
 
-        if not tables:
-            return analyst_price_targets
+                # Handle special cases
+                if label == "EPS next Y" and "EPS next Y" in data:
+                    # Second occurrence is EPS growth next Y
+                    data["EPS growth next Y"] = value
+                    continue
+                elif label == "Volatility":
+                    vols = value.split()
+                    if len(vols) >= 2:
+                        data["Volatility (Week)"] = vols[0]
+                        data["Volatility (Month)"] = vols[1]
+                    elif len(vols) == 1:
+                        data["Volatility (Week)"] = vols[0]
+                        data["Volatility (Month)"] = vols[0]
+                    continue
+
+                data[label] = value
 
-        table = tables[0]
+        return data
 
-        # Get rows from tbody if present
-        tbody = table.cssselect('tbody')
+    @functools.cached_property
+    def _insider(self):
+        """ Private function used to extract the insider transactions. """
+
+        insider_table = self._tables.get("insider")
+        # Fallback to old class if not found
+        if insider_table is None:
+            insider_table = self._tables.get("old_insider")
+
+        if insider_table is None:
+            return []
+
+        # Extract headers
+        header_elements = select.THEAD_TH(insider_table)
+        if header_elements:
+            headers = [h.text_content().strip() for h in header_elements]
+        else:
+            # Fallback for old structure
+            all_rows = select.TR(insider_table)
+            first_row = all_rows[0] if all_rows else None
+            if first_row is None:
+                return []
+            headers = [td.text_content().strip() for td in select.TD(first_row)]
+
+        # Extract data rows
+        data = []
+        tbody = select.TBODY(insider_table)
         if tbody:
-            rows = tbody[0].cssselect('tr')
+            rows = select.TR(tbody[0])
         else:
-            rows = table.cssselect('tr')
+            rows = select.TR(insider_table)[1:]  # Skip header row
+
+        for row in rows:
+            cells = select.TD(row)
+            if len(cells) >= len(headers):
+                row_data = {}
+                for i, header in enumerate(headers):
+                    row_data[header] = cells[i].text_content().strip()
+                data.append(row_data)
+
+        return data
+
+    @functools.cached_property
+    def _news(self):
+        """ Private function used to extract the news table. """
+
+        news_table = self._tables.get("news")
+        if news_table is None:
+            return []
+
+        results = []
+        current_date = datetime.datetime.now().date()
+
+        for row in select.TR(news_table):
+            try:
+                cells = select.TD(row)
+                if len(cells) < 2:
+                    continue
+
+                # Get timestamp from first cell
+                raw_timestamp = cells[0].text_content().strip()
+
+                # Parse timestamp - handles various formats:
+                # "Today 12:00PM", "Jan-18-26 12:00PM", "12:00PM"
+                parsed_timestamp = None
+
+                if "Today" in raw_timestamp:
+                    # Format: "Today 12:00PM"
+                    time_part = raw_timestamp.replace("Today", "").strip()
+                    try:
+                        parsed_time = datetime.datetime.strptime(time_part, "%I:%M%p")
+                        parsed_timestamp = datetime.datetime.combine(
+                            datetime.datetime.now().date(), parsed_time.time()
+                        )
+                        current_date = parsed_timestamp.date()
+                    except ValueError:
+                        continue
+                elif len(raw_timestamp) > 8 and "-" in raw_timestamp:
+                    # Format: "Jan-18-26 12:00PM" (full date with time)
+                    try:
+                        parsed_timestamp = datetime.datetime.strptime(
+                            raw_timestamp, "%b-%d-%y %I:%M%p"
+                        )
+                        current_date = parsed_timestamp.date()
+                    except ValueError:
+                        # Try alternative format
+                        try:
+                            parsed_timestamp = datetime.datetime.strptime(
+                                raw_timestamp, "%b-%d-%Y %I:%M%p"
+                            )
+                            current_date = parsed_timestamp.date()
+                        except ValueError:
+                            continue
+                else:
+                    # Format: "12:00PM" (time only, use current_date)
+                    try:
+                        parsed_time = datetime.datetime.strptime(raw_timestamp, "%I:%M%p")
+                        parsed_timestamp = datetime.datetime.combine(
+                            current_date, parsed_time.time()
+                        )
+                    except ValueError:
+                        continue
+
+                if parsed_timestamp is None:
+                    continue
+
+                # Get headline and URL from news link
+                news_link = select.NEWS_LINK(cells[1])
+                if not news_link:
+                    continue
+
+                headline = news_link[0].text_content().strip()
+                url = news_link[0].get("href", "")
+
+                # Get source from news-link-right span
+                source = ""
+                source_elem = select.NEWS_SOURCE(cells[1])
+                if source_elem:
+                    source_text = source_elem[0].text_content().strip()
+                    # Remove parentheses: "(MarketWatch)" -> "MarketWatch"
+                    source = source_text.strip("()")
+
+                results.append((
+                    parsed_timestamp.strftime("%Y-%m-%d %H:%M"),
+                    headline,
+                    url,
+                    source
+                ))
+            except (IndexError, AttributeError):
+                continue
+
+        return results
+
+    @functools.cached_property
+    def _ratings(self):
+        """ Private function used to extract the cell texts of the ratings rows, newest first. """
+
+        # Try new table class first, then fallback to old class
+        table = self._tables.get("ratings")
+        if table is None:
+            table = self._tables.get("old_ratings")
+
+        if table is None:
+            return []
+
+        # Get rows from tbody if present, otherwise from table directly
+        tbody = select.TBODY(table)
+        if tbody:
+            rows = select.TR(tbody[0])
+        else:
+            rows = select.TR(table)
+
+        ratings = []
+        for row in rows:
+            cells = select.TD(row)
+            if len(cells) >= 4:
+                ratings.append([cell.text_content().strip() for cell in cells])
+
+        return ratings
+
+    # The sections are extracted once, callers get copies they can modify freely
+
+    @property
+    def snapshot(self):
+        """ Returns the label/value pairs of the snapshot table as they are shown. """
+
+        return dict(self._snapshot)
+
+    @property
+    def stock(self):
+        """ Returns the stock data: the header (ticker, company, sector...) and the snapshot. """
+
+        return dict(self._stock)
+
+    @property
+    def insider(self):
+        """ Returns the insider transactions as a list of dictionaries. """
+
+        return [dict(transaction) for transaction in self._insider]
+
+    @property
+    def news(self):
+        """ Returns the news as a list of (timestamp, headline, url, source) tuples. """
+
+        return list(self._news)
+
+    def analyst_price_targets(self, last_ratings=5):
+        """
+        Returns the most recent analyst ratings as dictionaries with date, category, analyst,
+        rating and target_from/target_to or target (see get_analyst_price_targets).
+        """
+
+        analyst_price_targets = []
+
+        for rating_data in self._ratings:
+            rating_data = [val.replace("→", "->").replace("$", "") for val in rating_data if val]
+
+            if len(rating_data) < 4:
+                continue
+
+            # Parse date
+            date_str = parse_rating_date(rating_data[0])
+            if date_str is None:
+                continue
+
+            data = {
+                "date": date_str,
+                "category": rating_data[1],
+                "analyst": rating_data[2],
+                "rating": rating_data[3],
+            }
+
+            # Handle price targets (5th column if present)
+            if len(rating_data) >= 5 and rating_data[4]:
+                price_str = rating_data[4].replace(" ", "")
+                if "->" in price_str:
+                    parts = price_str.split("->")
+                    if len(parts) == 2:
+                        try:
+                            data["target_from"] = float(parts[0]) if parts[0] else 0.0
+                            data["target_to"] = float(parts[1]) if parts[1] else 0.0
+                        except ValueError:
+                            pass
+                else:
+                    try:
+                        data["target"] = float(price_str)
+                    except ValueError:
+                        pass
+
+            analyst_price_targets.append(data)
+
+        return analyst_price_targets[:last_ratings]
+
+    def export_ratings(self, last_ratings=5):
+        """ Returns the most recent analyst ratings in the row format of the CSV export. """
 
         headers = [
             "ticker",
@@ -123,19 +587,13 @@ def get_analyst_price_targets_for_export(
             "price_from",
             "price_to",
         ]
-        count = 0
+        analyst_price_targets = []
 
-        for row_elem in rows:
-            if count == last_ratings:
+        for row in self._ratings:
+            if len(analyst_price_targets) == last_ratings:
                 break
 
-            cells = row_elem.cssselect('td')
-            if len(cells) < 4:
-                continue
-
-            row = [cell.text_content().strip() for cell in cells]
             row = [val for val in row if val]  # Remove empty values
-
             if len(row) < 4:
                 continue
 
@@ -150,16 +608,12 @@ def get_analyst_price_targets_for_export(
                     price_from = strings[0].strip()
                     price_to = strings[1].strip()
 
-            try:
-                date_str = datetime.datetime.strptime(row[0], "%b-%d-%y").strftime("%Y-%m-%d")
-            except ValueError:
-                try:
-                    date_str = datetime.datetime.strptime(row[0], "%b-%d-%Y").strftime("%Y-%m-%d")
-                except ValueError:
-                    continue
+            date_str = parse_rating_date(row[0])
+            if date_str is None:
+                continue
 
             elements = [
-                ticker,
+                self.ticker,
                 date_str,
                 row[1],
                 row[2],
@@ -167,50 +621,55 @@ def get_analyst_price_targets_for_export(
                 price_from,
                 price_to,
             ]
-            data = dict(zip(headers, elements))
-            analyst_price_targets.append(data)
-            count += 1
-    except Exception:
-        pass
+            analyst_price_targets.append(dict(zip(headers, elements)))
+
+        return analyst_price_targets
+
+
+def parse_rating_date(value):
+    """ Returns the date of an analyst rating ("Jan-05-24") as YYYY-MM-DD, or None. """
+
+    for date_format in ("%b-%d-%y", "%b-%d-%Y"):
+        try:
+            return datetime.datetime.strptime(value, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+
+    return None
+
+
+def get_analyst_price_targets_for_export(
+    ticker=None, page_content=None, last_ratings=5
+):
+    """
+    Extract analyst price targets from a stock page for CSV export.
 
-    return analyst_price_targets
+    :param ticker: stock symbol
+    :param page_content: raw or parsed HTML content, or a QuotePage
+    :param last_ratings: number of ratings to return
+    :return: list of dictionaries
+    """
 
+    try:
+        if not isinstance(page_content, QuotePage):
+            page_content = QuotePage(page_content, ticker)
+        return page_content.export_ratings(last_ratings)
+    except Exception:
+        return []
 
-def download_ticker_details(page_content: requests.Response, **kwargs):
+
+def download_ticker_details(page_content, **kwargs):
     """
     Download and parse ticker details from a stock page.
 
-    :param page_content: HTTP response containing the page
+    :param page_content: HTTP response, raw bytes or parsed HTML of the page
     :return: dictionary with ticker data and analyst price targets
     """
-    data = {}
     ticker = kwargs["URL"].split("=")[1]
-    page_parsed = html.fromstring(page_content.text)
-
-    # Use the new table structure with snapshot-td2 cells
-    all_rows = page_parsed.cssselect('tr.table-dark-row')
-
-    for row in all_rows:
-        cells = row.cssselect('td.snapshot-td2')
-        # Cells come in pairs: label, value, label, value, ...
-        for i in range(0, len(cells) - 1, 2):
-            label = cells[i].text_content().strip()
-            value = cells[i + 1].text_content().strip()
-            if label:
-                data[label] = value
-
-    # Fallback to old xpath method if new method returns empty
-    if len(data) == 0:
-        all_rows_old = [
-            row.xpath("td//text()")
-            for row in page_parsed.cssselect('tr.table-dark-row')
-        ]
-        for row in all_rows_old:
-            for column in range(0, min(11, len(row) - 1)):
-                if column % 2 == 0:
-                    data[row[column]] = row[column + 1]
+    quote_page = QuotePage(page_content, ticker)
+    data = quote_page.snapshot
 
     if len(data) == 0:
         print(f"-> Unable to parse page for ticker: {ticker}")
 
-    return {ticker: [data, get_analyst_price_targets_for_export(ticker, page_parsed)]}
+    return {ticker: [data, get_analyst_price_targets_for_export(ticker, quote_page)]}
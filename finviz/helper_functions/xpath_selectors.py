@@ -0,0 +1,43 @@
+"""
+Selectors shared by all scrapers. Each one is translated from CSS to XPath and
+compiled once at import, instead of on every cssselect() call. Call them with
+the element to search in, eg.: SCREENER_ROWS(page_parsed).
+"""
+
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+
+def css(selector: str) -> CSSSelector:
+    """ Returns a compiled XPath extractor for an HTML CSS selector. """
+
+    return CSSSelector(selector, translator="html")
+
+
+# Generic table parts
+TBODY = css("tbody")
+TR = css("tr")
+TD = css("td")
+TH = css("th")
+THEAD_TH = css("thead th")
+CHILD_TD = etree.XPath("td")
+CELL_TEXTS = etree.XPath("td//text()")
+
+# Screener (screener.ashx) and crypto (crypto_performance.ashx) tables
+SCREENER_ROWS = css('tr[valign="top"]')
+SCREENER_HEADER_ROWS = css('tr[valign="middle"]')
+FIRST_PAGE_OPTION = css('option[value="1"]')
+COUNT_TEXT = css(".count-text")
+
+# Quote page (quote.ashx)
+TAB_LINKS = css("a.tab-link")
+SNAPSHOT_CELLS = css("td.snapshot-td2")
+NEWS_LINK = css("a.tab-link-news")
+NEWS_SOURCE = css("div.news-link-right span")
+
+# News page (news.ashx)
+NEWS_DATES = css('td[class="nn-date"]')
+NEWS_LINKS = css('a[class="nn-tab-link"]')
+
+# Portfolio page (portfolio.ashx)
+OPTIONS = css("option")
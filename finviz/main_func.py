@@ -1,278 +1,201 @@
-from datetime import datetime
-
-from lxml import etree
-
-from finviz.helper_functions.request_functions import http_request_get
-from finviz.helper_functions.scraper_functions import get_table
+from urllib.parse import urlencode
+
+import finviz.helper_functions.xpath_selectors as select
+from finviz.config import USER_AGENT, cache_settings
+from finviz.helper_functions.cache_functions import PageCache
+from finviz.helper_functions.request_functions import (
+    Connector,
+    async_http_request_get,
+    http_request_get,
+)
+from finviz.helper_functions.scraper_functions import QuotePage, get_table
 
 STOCK_URL = "https://finviz.com/quote.ashx"
 NEWS_URL = "https://finviz.com/news.ashx"
 CRYPTO_URL = "https://finviz.com/crypto_performance.ashx"
-STOCK_PAGE = {}
+STOCK_PAGE = PageCache(
+    max_entries=cache_settings["PAGE_MAX_ENTRIES"],
+    max_size=cache_settings["PAGE_MAX_SIZE"],
+    ttl=cache_settings["PAGE_TTL"],
+)
 
 
-def get_page(ticker, force_refresh=False):
+def get_quote_page(ticker, force_refresh=False):
     """
-    Fetches and caches the stock page for a given ticker.
+    Fetches and caches the stock page for a given ticker as a QuotePage, so that all the
+    sections (stock data, insider, news, ratings) come from a single parse of the page.
 
     :param ticker: stock symbol
     :type ticker: str
-    :param force_refresh: force re-fetching the page
+    :param force_refresh: force re-fetching the page, skipping the response cache too
     :type force_refresh: bool
+    :return: QuotePage
     """
-    global STOCK_PAGE
 
-    if force_refresh or ticker not in STOCK_PAGE:
-        STOCK_PAGE[ticker], _ = http_request_get(
-            url=STOCK_URL, payload={"t": ticker}, parse=True
+    def load_page():
+        page_html, _ = http_request_get(
+            url=STOCK_URL, payload={"t": ticker}, parse=False, refresh=force_refresh
         )
+        return QuotePage(page_html, ticker), len(page_html)
 
+    return STOCK_PAGE.get_or_load(ticker, load_page, force_refresh)
 
-def get_stock(ticker):
+
+def get_page(ticker, force_refresh=False):
     """
-    Returns a dictionary containing stock data.
+    Fetches and caches the stock page for a given ticker.
 
     :param ticker: stock symbol
     :type ticker: str
-    :return dict
+    :param force_refresh: force re-fetching the page, skipping the response cache too
+    :type force_refresh: bool
+    :return: parsed stock page
     """
 
-    get_page(ticker)
-    page_parsed = STOCK_PAGE[ticker]
-
-    data = {}
-
-    # Extract basic info from the new header structure
-    # Ticker
-    ticker_elem = page_parsed.cssselect('h1.quote-header_ticker-wrapper_ticker')
-    if ticker_elem:
-        data["Ticker"] = ticker_elem[0].text_content().strip()
-    else:
-        data["Ticker"] = ticker
-
-    # Company name and website
-    company_elem = page_parsed.cssselect('h2.quote-header_ticker-wrapper_company a.tab-link')
-    if company_elem:
-        data["Company"] = company_elem[0].text_content().strip()
-        company_link = company_elem[0].attrib.get("href", "")
-        data["Website"] = company_link if company_link.startswith("http") else None
-    else:
-        data["Company"] = ""
-        data["Website"] = None
-
-    # Sector, Industry, Country from the quote-links section
-    quote_links = page_parsed.cssselect('div.quote-links a.tab-link')
-    sector_industry_country = []
-    for link in quote_links:
-        href = link.attrib.get("href", "")
-        # Links to screener with sector/industry/country filters
-        if "f=sec_" in href or "f=ind_" in href or "f=geo_" in href:
-            sector_industry_country.append(link.text_content().strip())
-
-    if len(sector_industry_country) >= 3:
-        data["Sector"] = sector_industry_country[0]
-        data["Industry"] = sector_industry_country[1]
-        data["Country"] = sector_industry_country[2]
-    elif len(sector_industry_country) == 2:
-        data["Sector"] = sector_industry_country[0]
-        data["Industry"] = sector_industry_country[1]
-        data["Country"] = ""
-    elif len(sector_industry_country) == 1:
-        data["Sector"] = sector_industry_country[0]
-        data["Industry"] = ""
-        data["Country"] = ""
-
-    # Extract financial data from the snapshot table
-    # The table uses tr.table-dark-row with td.snapshot-td2 cells
-    all_rows = page_parsed.cssselect('tr.table-dark-row')
-
-    for row in all_rows:
-        cells = row.cssselect('td.snapshot-td2')
-        # Cells come in pairs: label, value, label, value, ...
-        for i in range(0, len(cells) - 1, 2):
-            label_cell = cells[i]
-            value_cell = cells[i + 1]
-
-            # Get label text (may contain links)
-            label = label_cell.text_content().strip()
-            # Get value text (usually in <b> tag)
-            value = value_cell.text_content().strip()
-
-            if not label:
-                continue
+    return get_quote_page(ticker, force_refresh).page
+
+
+def _page_content(page_html, **kwargs):
+    """ Private function used to return the downloaded page unchanged for the caller to parse. """
+
+    return page_html
+
+
+def get_quote_pages(tickers, force_refresh=False):
+    """
+    Fetches the stock pages of many tickers concurrently through the Connector.
+    Duplicate tickers are requested once and pages are shared with get_quote_page
+    through STOCK_PAGE.
+
+    :param tickers: collection of stock symbols
+    :type tickers: list
+    :param force_refresh: force re-fetching the pages, skipping the response cache too
+    :type force_refresh: bool
+    :return: dictionary mapping each ticker to its QuotePage, or to the exception raised
+        while fetching or parsing it
+    """
+
+    tickers = list(dict.fromkeys(tickers))
+    pages = {}
+
+    for ticker in tickers:
+        quote_page = None if force_refresh else STOCK_PAGE.get(ticker)
+        if quote_page is not None:
+            pages[ticker] = quote_page
+
+    missing = [ticker for ticker in tickers if ticker not in pages]
+
+    if missing:
+        async_connector = Connector(
+            _page_content,
+            [f"{STOCK_URL}?{urlencode({'t': ticker})}" for ticker in missing],
+            USER_AGENT,
+            return_exceptions=True,
+            refresh=force_refresh,
+        )
 
-            # Handle special cases
-            if label == "EPS next Y" and "EPS next Y" in data:
-                # Second occurrence is EPS growth next Y
-                data["EPS growth next Y"] = value
+        for ticker, page_html in zip(missing, async_connector.run_connector()):
+            if isinstance(page_html, Exception):
+                pages[ticker] = page_html
                 continue
-            elif label == "Volatility":
-                vols = value.split()
-                if len(vols) >= 2:
-                    data["Volatility (Week)"] = vols[0]
-                    data["Volatility (Month)"] = vols[1]
-                elif len(vols) == 1:
-                    data["Volatility (Week)"] = vols[0]
-                    data["Volatility (Month)"] = vols[0]
+
+            try:
+                pages[ticker] = QuotePage(page_html, ticker)
+            except Exception as error:  # eg. an empty body, which lxml can not parse
+                pages[ticker] = error
                 continue
 
-            data[label] = value
+            STOCK_PAGE.set(ticker, pages[ticker], len(page_html))
 
-    return data
+    return {ticker: pages[ticker] for ticker in tickers}
 
 
-def get_insider(ticker):
+def _parse_pages(tickers, parse_function):
+    """
+    Private function used to fetch the pages of many tickers and extract a section of each one.
+    A ticker whose page could not be fetched or parsed is mapped to the exception.
     """
-    Returns a list of dictionaries containing all recent insider transactions.
 
-    :param ticker: stock symbol
-    :return: list
+    results = {}
+
+    for ticker, quote_page in get_quote_pages(tickers).items():
+        if isinstance(quote_page, Exception):
+            results[ticker] = quote_page
+            continue
+
+        try:
+            results[ticker] = parse_function(quote_page)
+        except Exception as error:
+            results[ticker] = error
+
+    return results
+
+
+def get_stocks(tickers):
     """
+    Batch version of get_stock, the pages are fetched concurrently.
 
-    get_page(ticker)
-    page_parsed = STOCK_PAGE[ticker]
+    :param tickers: collection of stock symbols
+    :type tickers: list
+    :return: dictionary mapping each ticker to its stock data, or to the exception
+        raised for that ticker
+    """
 
-    # Try new table structure first (styled-table-new)
-    outer_tables = page_parsed.cssselect('table.styled-table-new')
+    return _parse_pages(tickers, lambda quote_page: quote_page.stock)
 
-    # Find the insider trading table by checking for the "Insider Trading" header
-    insider_table = None
-    for table in outer_tables:
-        headers = table.cssselect('thead th')
-        if headers and any("Insider Trading" in h.text_content() for h in headers):
-            insider_table = table
-            break
 
-    # Fallback to old class if not found
-    if insider_table is None:
-        old_tables = page_parsed.cssselect('table.body-table.insider-trading-table')
-        if old_tables:
-            insider_table = old_tables[0]
+def get_insiders(tickers):
+    """ Batch version of get_insider, returns a dictionary of ticker to transactions. """
 
-    if insider_table is None:
-        return []
+    return _parse_pages(tickers, lambda quote_page: quote_page.insider)
 
-    # Extract headers
-    header_elements = insider_table.cssselect('thead th')
-    if header_elements:
-        headers = [h.text_content().strip() for h in header_elements]
-    else:
-        # Fallback for old structure
-        first_row = insider_table.cssselect('tr')[0] if insider_table.cssselect('tr') else None
-        if first_row is None:
-            return []
-        headers = [td.text_content().strip() for td in first_row.cssselect('td')]
-
-    # Extract data rows
-    data = []
-    tbody = insider_table.cssselect('tbody')
-    if tbody:
-        rows = tbody[0].cssselect('tr')
-    else:
-        rows = insider_table.cssselect('tr')[1:]  # Skip header row
-
-    for row in rows:
-        cells = row.cssselect('td')
-        if len(cells) >= len(headers):
-            row_data = {}
-            for i, header in enumerate(headers):
-                row_data[header] = cells[i].text_content().strip()
-            data.append(row_data)
-
-    return data
 
+def get_stocks_news(tickers):
+    """ Batch version of get_news, returns a dictionary of ticker to news or exception. """
 
-def get_news(ticker):
+    return _parse_pages(tickers, lambda quote_page: quote_page.news)
+
+
+def get_stocks_analyst_price_targets(tickers, last_ratings=5):
+    """ Batch version of get_analyst_price_targets, returns a dictionary of ticker to ratings. """
+
+    return _parse_pages(
+        tickers, lambda quote_page: quote_page.analyst_price_targets(last_ratings)
+    )
+
+
+def get_stock(ticker):
     """
-    Returns a list of tuples containing (timestamp, headline, url, source) for stock news.
+    Returns a dictionary containing stock data.
 
     :param ticker: stock symbol
-    :return: list of tuples (timestamp, headline, url, source)
+    :type ticker: str
+    :return dict
     """
 
-    get_page(ticker)
-    page_parsed = STOCK_PAGE[ticker]
-    news_table = page_parsed.cssselect('table#news-table')
+    return get_quote_page(ticker).stock
 
-    if len(news_table) == 0:
-        return []
 
-    rows = news_table[0].cssselect('tr')
+def get_insider(ticker):
+    """
+    Returns a list of dictionaries containing all recent insider transactions.
 
-    results = []
-    current_date = datetime.now().date()
+    :param ticker: stock symbol
+    :return: list
+    """
 
-    for row in rows:
-        try:
-            cells = row.cssselect('td')
-            if len(cells) < 2:
-                continue
+    return get_quote_page(ticker).insider
 
-            # Get timestamp from first cell
-            raw_timestamp = cells[0].text_content().strip()
-
-            # Parse timestamp - handles various formats:
-            # "Today 12:00PM", "Jan-18-26 12:00PM", "12:00PM"
-            parsed_timestamp = None
-
-            if "Today" in raw_timestamp:
-                # Format: "Today 12:00PM"
-                time_part = raw_timestamp.replace("Today", "").strip()
-                try:
-                    parsed_time = datetime.strptime(time_part, "%I:%M%p")
-                    parsed_timestamp = datetime.combine(datetime.now().date(), parsed_time.time())
-                    current_date = parsed_timestamp.date()
-                except ValueError:
-                    continue
-            elif len(raw_timestamp) > 8 and "-" in raw_timestamp:
-                # Format: "Jan-18-26 12:00PM" (full date with time)
-                try:
-                    parsed_timestamp = datetime.strptime(raw_timestamp, "%b-%d-%y %I:%M%p")
-                    current_date = parsed_timestamp.date()
-                except ValueError:
-                    # Try alternative format
-                    try:
-                        parsed_timestamp = datetime.strptime(raw_timestamp, "%b-%d-%Y %I:%M%p")
-                        current_date = parsed_timestamp.date()
-                    except ValueError:
-                        continue
-            else:
-                # Format: "12:00PM" (time only, use current_date)
-                try:
-                    parsed_time = datetime.strptime(raw_timestamp, "%I:%M%p")
-                    parsed_timestamp = datetime.combine(current_date, parsed_time.time())
-                except ValueError:
-                    continue
-
-            if parsed_timestamp is None:
-                continue
 
-            # Get headline and URL from news link
-            news_link = cells[1].cssselect('a.tab-link-news')
-            if not news_link:
-                continue
+def get_news(ticker):
+    """
+    Returns a list of tuples containing (timestamp, headline, url, source) for stock news.
 
-            headline = news_link[0].text_content().strip()
-            url = news_link[0].get("href", "")
-
-            # Get source from news-link-right span
-            source = ""
-            source_elem = cells[1].cssselect('div.news-link-right span')
-            if source_elem:
-                source_text = source_elem[0].text_content().strip()
-                # Remove parentheses: "(MarketWatch)" -> "MarketWatch"
-                source = source_text.strip("()")
-
-            results.append((
-                parsed_timestamp.strftime("%Y-%m-%d %H:%M"),
-                headline,
-                url,
-                source
-            ))
-        except (IndexError, AttributeError):
-            continue
+    :param ticker: stock symbol
+    :return: list of tuples (timestamp, headline, url, source)
+    """
 
-    return results
+    return get_quote_page(ticker).news
 
 
 def get_all_news():
@@ -283,13 +206,13 @@ def get_all_news():
 
     page_parsed, _ = http_request_get(url=NEWS_URL, parse=True)
     all_dates = [
-        row.text_content() for row in page_parsed.cssselect('td[class="nn-date"]')
+        row.text_content() for row in select.NEWS_DATES(page_parsed)
     ]
     all_headlines = [
-        row.text_content() for row in page_parsed.cssselect('a[class="nn-tab-link"]')
+        row.text_content() for row in select.NEWS_LINKS(page_parsed)
     ]
     all_links = [
-        row.get("href") for row in page_parsed.cssselect('a[class="nn-tab-link"]')
+        row.get("href") for row in select.NEWS_LINKS(page_parsed)
     ]
 
     return list(zip(all_dates, all_headlines, all_links))
@@ -303,9 +226,8 @@ def get_crypto(pair):
     """
 
     page_parsed, _ = http_request_get(url=CRYPTO_URL, parse=True)
-    page_html, _ = http_request_get(url=CRYPTO_URL, parse=False)
-    crypto_headers = page_parsed.cssselect('tr[valign="middle"]')[0].xpath("td//text()")
-    crypto_table_data = get_table(page_html, crypto_headers)
+    crypto_headers = select.CELL_TEXTS(select.SCREENER_HEADER_ROWS(page_parsed)[0])
+    crypto_table_data = get_table(page_parsed, crypto_headers)
 
     return crypto_table_data[pair]
 
@@ -328,81 +250,72 @@ def get_analyst_price_targets(ticker, last_ratings=5):
     :return: list of dictionaries
     """
 
-    analyst_price_targets = []
-
     try:
-        get_page(ticker)
-        page_parsed = STOCK_PAGE[ticker]
+        quote_page = get_quote_page(ticker)
+    except Exception:
+        return []
 
-        # Try new table class first
-        tables = page_parsed.cssselect('table.js-table-ratings')
-        if not tables:
-            # Fallback to old class
-            tables = page_parsed.cssselect('table.fullview-ratings-outer')
+    return quote_page.analyst_price_targets(last_ratings)
 
-        if not tables:
-            return []
 
-        table = tables[0]
+async def get_quote_page_async(ticker, session=None, force_refresh=False):
+    """
+    Asynchronous version of get_quote_page, it runs on the caller's event loop.
 
-        # Get rows from tbody if present, otherwise from table directly
-        tbody = table.cssselect('tbody')
-        if tbody:
-            rows = tbody[0].cssselect('tr')
-        else:
-            rows = table.cssselect('tr')
+    :param ticker: stock symbol
+    :type ticker: str
+    :param session: optional shared aiohttp.ClientSession
+    :param force_refresh: force re-fetching the page, skipping the response cache too
+    :type force_refresh: bool
+    :return: QuotePage
+    """
+
+    quote_page = None if force_refresh else STOCK_PAGE.get(ticker)
+
+    if quote_page is None:
+        page_html, _ = await async_http_request_get(
+            url=STOCK_URL,
+            session=session,
+            payload={"t": ticker},
+            parse=False,
+            refresh=force_refresh,
+        )
+        quote_page = QuotePage(page_html, ticker)
+        STOCK_PAGE.set(ticker, quote_page, len(page_html))
+
+    return quote_page
+
+
+async def get_page_async(ticker, session=None, force_refresh=False):
+    """ Asynchronous version of get_page. """
+
+    return (await get_quote_page_async(ticker, session, force_refresh)).page
 
-        for row in rows:
-            try:
-                cells = row.cssselect('td')
-                if len(cells) < 4:
-                    continue
-
-                # Extract text from each cell
-                rating_data = [cell.text_content().strip() for cell in cells]
-                rating_data = [val.replace("→", "->").replace("$", "") for val in rating_data if val]
-
-                if len(rating_data) < 4:
-                    continue
-
-                # Parse date
-                try:
-                    date_str = datetime.strptime(rating_data[0], "%b-%d-%y").strftime("%Y-%m-%d")
-                except ValueError:
-                    try:
-                        date_str = datetime.strptime(rating_data[0], "%b-%d-%Y").strftime("%Y-%m-%d")
-                    except ValueError:
-                        continue
-
-                data = {
-                    "date": date_str,
-                    "category": rating_data[1],
-                    "analyst": rating_data[2],
-                    "rating": rating_data[3],
-                }
-
-                # Handle price targets (5th column if present)
-                if len(rating_data) >= 5 and rating_data[4]:
-                    price_str = rating_data[4].replace(" ", "")
-                    if "->" in price_str:
-                        parts = price_str.split("->")
-                        if len(parts) == 2:
-                            try:
-                                data["target_from"] = float(parts[0]) if parts[0] else 0.0
-                                data["target_to"] = float(parts[1]) if parts[1] else 0.0
-                            except ValueError:
-                                pass
-                    else:
-                        try:
-                            data["target"] = float(price_str)
-                        except ValueError:
-                            pass
-
-                analyst_price_targets.append(data)
-            except (IndexError, AttributeError):
-                continue
 
+async def get_stock_async(ticker, session=None):
+    """ Asynchronous version of get_stock. """
+
+    return (await get_quote_page_async(ticker, session)).stock
+
+
+async def get_insider_async(ticker, session=None):
+    """ Asynchronous version of get_insider. """
+
+    return (await get_quote_page_async(ticker, session)).insider
+
+
+async def get_news_async(ticker, session=None):
+    """ Asynchronous version of get_news. """
+
+    return (await get_quote_page_async(ticker, session)).news
+
+
+async def get_analyst_price_targets_async(ticker, last_ratings=5, session=None):
+    """ Asynchronous version of get_analyst_price_targets. """
+
+    try:
+        quote_page = await get_quote_page_async(ticker, session)
     except Exception:
-        pass
+        return []
 
-    return analyst_price_targets[:last_ratings]
+    return quote_page.analyst_price_targets(last_ratings)
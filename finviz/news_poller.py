@@ -0,0 +1,131 @@
+import datetime
+import json
+import os
+import time
+
+from finviz.main_func import get_quote_pages
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"  # Format of the news timestamps (see QuotePage.news)
+
+
+class NewsPoller(object):
+    """
+    Polls the news of many tickers and returns only the items that were not seen before.
+
+    For every ticker the poller keeps a cursor with the URLs of the most recent items seen,
+    bounded to max_seen_urls, and an item is new when its URL is not in the cursor. Timestamps
+    are not compared: FinViz shows recent items as "Today" or a time only, which are dated with
+    the local date, so they can be a day off from the earlier items. Cursors can be kept in a
+    JSON file, so a restarted poller carries on where it stopped instead of replaying the news
+    it already returned.
+    """
+
+    def __init__(self, tickers, interval=60, cursor_file=None, since=None, max_seen_urls=1000):
+        """
+        :param tickers: collection of stock symbols
+        :type tickers: list
+        :param interval: seconds between the start of two polls
+        :type interval: float
+        :param cursor_file: JSON file the cursors are loaded from and saved to after each poll
+        :type cursor_file: str
+        :param since: time ("YYYY-MM-DD HH:MM" or datetime) from which the news of tickers
+            without a cursor are returned. By default, their first poll only sets the cursor.
+        :type since: str
+        :param max_seen_urls: number of URLs kept per ticker, more than a news table holds
+        :type max_seen_urls: int
+        """
+
+        if isinstance(since, str):
+            since = datetime.datetime.strptime(since, TIMESTAMP_FORMAT)
+
+        self.tickers = list(dict.fromkeys(tickers))
+        self.interval = interval
+        self.cursor_file = cursor_file
+        self.since = since.strftime(TIMESTAMP_FORMAT) if since is not None else None
+        self.max_seen_urls = max_seen_urls
+        self.cursors = {}
+        self.errors = {}
+
+        if cursor_file is not None and os.path.exists(cursor_file):
+            with open(cursor_file, "r", encoding="utf-8") as file:
+                self.cursors = json.load(file)
+
+    def __iter__(self):
+        return self.run()
+
+    def poll(self):
+        """
+        Fetches the news of every ticker concurrently and returns the new items, oldest first,
+        as (ticker, timestamp, headline, url, source) tuples. Tickers whose page could not be
+        fetched keep their cursor and are listed in self.errors until their next success.
+        """
+
+        new_items = []
+
+        for ticker, quote_page in get_quote_pages(self.tickers, force_refresh=True).items():
+            if isinstance(quote_page, Exception):
+                self.errors[ticker] = quote_page
+                continue
+
+            self.errors.pop(ticker, None)
+            for item in self.__update_cursor(ticker, quote_page.news):
+                new_items.append((ticker, *item))
+
+        self.save_cursors()
+        new_items.sort(key=lambda item: item[1])
+        return new_items
+
+    def run(self, max_polls=None):
+        """
+        Generator that polls every self.interval seconds and yields the new items one by one.
+
+        :param max_polls: number of polls after which the generator stops, None to poll forever
+        :type max_polls: int
+        """
+
+        polls = 0
+
+        while max_polls is None or polls < max_polls:
+            started = time.monotonic()
+            yield from self.poll()
+            polls += 1
+
+            if max_polls is None or polls < max_polls:
+                time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def __update_cursor(self, ticker, news):
+        """ Private function used to return the new items of a ticker and move its cursor. """
+
+        cursor = self.cursors.get(ticker)
+
+        if cursor is None:
+            # Without a cursor the items before since (all of them by default) count as seen
+            cursor = {
+                "urls": [
+                    item[2] for item in news if self.since is None or item[0] < self.since
+                ]
+            }
+
+        seen_urls = set(cursor["urls"])
+        new_items = []
+
+        for item in news:
+            if item[2] not in seen_urls:
+                seen_urls.add(item[2])
+                new_items.append(item)
+
+        new_items.sort(key=lambda item: item[0])
+        urls = cursor["urls"] + [item[2] for item in new_items]
+        self.cursors[ticker] = {"urls": urls[-self.max_seen_urls :]}
+        return new_items
+
+    def save_cursors(self):
+        """ Writes the cursors to self.cursor_file, replacing the file atomically. """
+
+        if self.cursor_file is None:
+            return
+
+        temporary_file = f"{self.cursor_file}.tmp"
+        with open(temporary_file, "w", encoding="utf-8") as file:
+            json.dump(self.cursors, file, indent=1, sort_keys=True)
+        os.replace(temporary_file, self.cursor_file)
@@ -3,12 +3,15 @@ import csv
 import requests
 from lxml import html
 
+import finviz.helper_functions.xpath_selectors as select
 from finviz.config import USER_AGENT
 from finviz.helper_functions.display_functions import create_table_string
 from finviz.helper_functions.error_handling import (InvalidPortfolioID,
                                                     InvalidTicker,
-                                                    NonexistentPortfolioName)
+                                                    NonexistentPortfolioName,
+                                                    NoPortfolio)
 from finviz.helper_functions.request_functions import http_request_get
+from finviz.helper_functions.save_data import export_to_db
 from finviz.helper_functions.scraper_functions import get_table
 
 LOGIN_URL = "https://finviz.com/login_submit.ashx"
@@ -32,6 +35,18 @@ PORTFOLIO_HEADERS = [
     "Gain%",
     "Change$",
 ]
+PORTFOLIO_SCHEMA = {
+    "No.": "number",
+    "Price": "number",
+    "Change%": "percent",
+    "Volume": "number",
+    "Shares": "number",
+    "Cost": "number",
+    "Market Value": "number",
+    "Gain$": "number",
+    "Gain%": "percent",
+    "Change$": "number",
+}
 
 
 class Portfolio(object):
@@ -79,6 +94,31 @@ class Portfolio(object):
 
         return create_table_string(table_list)
 
+    def to_sqlite(self, filename, table_name="portfolio", snapshot=None):
+        """Exports the portfolio positions into a SQLite database, appended as a snapshot.
+
+        :param filename: SQLite database file path
+        :type filename: str
+        :param table_name: name of the table to create or append to
+        :type table_name: str
+        :param snapshot: snapshot time of the rows (datetime or ISO string), now by default
+        :type snapshot: datetime
+        :raises NoPortfolio: if the user has not created a portfolio
+        """
+
+        if not self.created:
+            raise NoPortfolio("to_sqlite")
+
+        export_to_db(
+            PORTFOLIO_HEADERS,
+            self.data,
+            filename,
+            table_name=table_name,
+            schema=PORTFOLIO_SCHEMA,
+            key_columns=("No.", "Ticker"),
+            snapshot=snapshot,
+        )
+
     def create_portfolio(self, name, file, drop_invalid_ticker=False):
         """
         Creates a new portfolio from a .csv file.
@@ -147,7 +187,7 @@ class Portfolio(object):
                 )
         else:  # else the user has passed a name
             # We remove the first element, since it's redundant
-            for portfolio in html.fromstring(self._page_content).cssselect("option")[
+            for portfolio in select.OPTIONS(html.fromstring(self._page_content))[
                 1:
             ]:
                 if portfolio.text == portfolio_name:
@@ -1,20 +1,37 @@
+import functools
+import itertools
 import json
+import os
 import pathlib
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import parse_qs as urlparse_qs
 from urllib.parse import urlencode, urlparse
 
-import requests
 from lxml import html as lxml_html
 
-from finviz.config import USER_AGENT
+from finviz.config import USER_AGENT, connection_settings, screener_settings
 import finviz.helper_functions.scraper_functions as scrape
+import finviz.helper_functions.xpath_selectors as select
+from finviz.helper_functions.column_store import ColumnStore
+from finviz.helper_functions.conversion import (convert_rows, convert_table, get_schema,
+                                                plan_custom_columns)
 from finviz.helper_functions.display_functions import create_table_string
 from finviz.helper_functions.error_handling import InvalidTableType, NoResults
+from finviz.helper_functions.filter_functions import filter_labels, row_filter
 from finviz.helper_functions.request_functions import (Connector,
+                                                       async_http_request_get,
+                                                       get_session,
                                                        http_request_get,
-                                                       sequential_data_scrape)
-from finviz.helper_functions.save_data import export_to_csv, export_to_db
-
+                                                       reset_session,
+                                                       sequential_data_iter,
+                                                       sequential_data_scrape,
+                                                       sequential_stream_iter)
+from finviz.helper_functions.save_data import (CsvSink, columns_to_arrow,
+                                               export_to_csv, export_to_db,
+                                               export_to_feather, export_to_parquet)
+
+SCREENER_URL = "https://finviz.com/screener.ashx"
+STOCK_URL = "https://finviz.com/quote.ashx"
 TABLE_TYPES = {
     "Overview": "111",
     "Valuation": "121",
@@ -24,11 +41,87 @@ TABLE_TYPES = {
     "Financial": "161",
     "Technical": "171",
 }
+# Disjoint filters a screen can be split into by Screener.sharded. The options of the filters
+# named in SHARD_FILTER_NAMES are read from load_filter_dict(), these lists are used when it fails.
+SHARD_FILTER_NAMES = {"exchange": "Exchange", "sector": "Sector"}
+SHARD_FILTERS = {
+    "exchange": ["exch_amex", "exch_nasd", "exch_nyse"],
+    "sector": [
+        "sec_basicmaterials",
+        "sec_communicationservices",
+        "sec_consumercyclical",
+        "sec_consumerdefensive",
+        "sec_energy",
+        "sec_financial",
+        "sec_healthcare",
+        "sec_industrials",
+        "sec_realestate",
+        "sec_technology",
+        "sec_utilities",
+    ],
+}
+
+
+def _shard_filters(shard_by):
+    """
+    Returns the filters of a shard_by name: the options of its filter in load_filter_dict(),
+    or SHARD_FILTERS when they can not be loaded. A list of filters is returned as it is.
+    """
+
+    if shard_by not in SHARD_FILTERS:
+        return shard_by
+
+    try:
+        options = Screener.load_filter_dict()[SHARD_FILTER_NAMES[shard_by]]
+    except (OSError, ValueError, KeyError):
+        return SHARD_FILTERS[shard_by]
+
+    return list(options.values()) or SHARD_FILTERS[shard_by]
+
+
+def _init_shard_worker(screener_url, settings, processes):
+    """
+    Prepares a worker process of Screener.sharded: it gets its own connection pool, the screener
+    URL and connection settings of the caller, and its share of the rate limit, which applies to
+    its synchronous requests as well.
+    """
+
+    global SCREENER_URL
+
+    SCREENER_URL = screener_url
+    connection_settings.update(settings)
+    connection_settings["RATE_LIMIT"] = settings["RATE_LIMIT"] / processes
+    connection_settings["RATE_BURST"] = max(1, settings["RATE_BURST"] // processes)
+    connection_settings["RATE_LIMIT_SEQUENTIAL"] = True
+    reset_session()
+
+
+def _scrape_page_shard(urls, headers, rows, user_agent, request_method):
+    """ Downloads and scrapes a range of table pages in a worker process. """
+
+    if request_method == "async":
+        return Connector(scrape.get_table, urls, user_agent, headers, rows).run_connector()
+
+    return sequential_data_scrape(scrape.get_table, urls, user_agent, headers, rows)
+
+
+def _scan_filter_shard(kwargs):
+    """ Downloads the table of one filter shard in a worker process, as (headers, rows). """
+
+    try:
+        screener = Screener(**kwargs)
+    except NoResults:
+        return None, []
+
+    return screener.headers, list(screener.data)
 
 
 class Screener(object):
     """ Used to download data from https://www.finviz.com/screener.ashx. """
 
+    # Set by subclasses which download the table outside of the constructor
+    _deferred = False
+
     @classmethod
     def init_from_url(cls, url, rows=None):
         """
@@ -59,6 +152,153 @@ class Screener(object):
 
         return cls(tickers, filters, rows, order, signal, table, custom)
 
+    @classmethod
+    def from_fields(
+        cls, fields, tickers=None, filters=None, rows=None, order="", signal="", **kwargs
+    ):
+        """
+        Initializes from a list of fields, eg.: ['P/E', 'Perf Week', 'RSI'], instead of joining
+        the Valuation, Performance and Technical tables. The fields are mapped to custom table
+        columns and fetched in the fewest passes allowed by MAX_CUSTOM_COLUMNS (one when there
+        is no limit); the rows of the extra passes are merged into the first one by Ticker.
+        The passes are kept, so that a refinement or a lazy download fetches them again.
+
+        :param fields: collection of column headers or custom column id's
+        :type fields: list
+        :param kwargs: other Screener arguments, eg.: request_method='async', typed=True
+        """
+
+        if cls._deferred:
+            raise TypeError(f"{cls.__name__} does not download in its constructor")
+
+        passes = plan_custom_columns(fields, screener_settings["MAX_CUSTOM_COLUMNS"])
+
+        if len(passes) > 1 and (kwargs.get("stream") or kwargs.get("sink") is not None):
+            raise ValueError("stream and sink need all the fields in a single pass")
+
+        screener = cls(tickers, filters, rows, order, signal, custom=passes[0], **kwargs)
+
+        if len(passes) > 1:
+            screener._custom_passes = [list(screener._custom)] + passes[1:]
+            if screener._data is not None:  # lazy screeners merge the passes when they download
+                screener.__merge_passes(screener._data)
+
+        return screener
+
+    @classmethod
+    def sharded(cls, *args, shard_by="page", processes=None, **kwargs):
+        """
+        Downloads a large screen with several worker processes, each with its own connection pool,
+        and merges their rows. Takes the same arguments as Screener, except stream, sink and lazy.
+
+        shard_by="page" reads the first page, splits the other pages into one contiguous range per
+        process and keeps the order of the screen. shard_by="exchange" or "sector" (or a list of
+        disjoint filters) runs one screen per filter added to the query; their rows are sorted by
+        Ticker, since each shard has its own order. Either way, a ticker is kept once. The
+        exchanges and sectors are the options of load_filter_dict(), or SHARD_FILTERS when it
+        can not be loaded, in which case exchanges added by FinViz since are left out.
+
+        :param shard_by: 'page', 'exchange', 'sector' or a list of filters
+        :type shard_by: str
+        :param processes: number of worker processes, defaults to the number of CPUs
+        :type processes: int
+        """
+
+        if cls._deferred:
+            raise TypeError(f"{cls.__name__} does not download in its constructor")
+        if kwargs.get("stream") or kwargs.get("sink") is not None or kwargs.get("lazy"):
+            raise ValueError("sharded screens do not support stream, sink and lazy")
+
+        processes = processes or os.cpu_count() or 1
+        screener = cls(*args, lazy=True, **kwargs)
+        worker_options = dict(
+            max_workers=processes,
+            initializer=_init_shard_worker,
+            initargs=(SCREENER_URL, dict(connection_settings), processes),
+        )
+
+        if shard_by == "page":
+            screener._read_first_page(
+                *http_request_get(
+                    SCREENER_URL, payload=screener._payload(), user_agent=screener._user_agent
+                )
+            )
+            urls = screener._page_urls()
+            size = -(-len(urls) // processes) or 1
+
+            with ProcessPoolExecutor(**worker_options) as pool:
+                shards = pool.map(
+                    _scrape_page_shard,
+                    [urls[start : start + size] for start in range(0, len(urls), size)],
+                    itertools.repeat(screener.headers),
+                    itertools.repeat(screener._rows),
+                    itertools.repeat(screener._user_agent),
+                    itertools.repeat(screener._request_method),
+                )
+                pages = [screener._first_page_rows]
+                pages.extend(itertools.chain.from_iterable(shards))
+
+            rows = itertools.chain.from_iterable(pages)
+        else:
+            rows = screener.__scan_filter_shards(shard_by, worker_options)
+
+        if "Ticker" in screener.headers:  # rows can move between pages while they are scanned
+            unique_rows = {}
+            for row in rows:
+                unique_rows.setdefault(row["Ticker"], row)
+            rows = unique_rows.values()
+
+        rows = list(rows)[: screener._rows]
+        screener._rows = screener._total_rows = len(rows)
+        screener._lazy = False
+        screener.data = (
+            screener._new_store(rows) if screener._columnar else screener._convert_rows(rows)
+        )
+
+        return screener
+
+    def __scan_filter_shards(self, shard_by, worker_options):
+        """
+        Private function used to download the table of every filter shard in the worker processes
+        and return their rows sorted by Ticker.
+        """
+
+        if self._rows is not None:
+            raise ValueError("rows needs shard_by='page', filter shards have no common order")
+
+        shard_filters = SHARD_FILTERS.get(shard_by, shard_by)
+        prefixes = {shard_filter.rsplit("_", 1)[0] for shard_filter in shard_filters}
+        if any(item.rsplit("_", 1)[0] in prefixes for item in self._filters):
+            raise ValueError(f"The screen is already filtered by {sorted(prefixes)}")
+
+        shard_filters = _shard_filters(shard_by)
+
+        shards = [
+            dict(
+                tickers=self._tickers,
+                filters=self._filters + [shard_filter],
+                order=self._order,
+                signal=self._signal,
+                table=next(name for name, code in TABLE_TYPES.items() if code == self._table),
+                custom=self._custom or None,
+                user_agent=self._user_agent,
+                request_method=self._request_method,
+            )
+            for shard_filter in shard_filters
+        ]
+
+        with ProcessPoolExecutor(**worker_options) as pool:
+            results = list(pool.map(_scan_filter_shard, shards))
+
+        headers = next((headers for headers, _ in results if headers), None)
+        if headers is None:
+            raise NoResults(urlencode(self._payload()))
+
+        self.headers = headers
+        self._total_rows = None
+        rows = itertools.chain.from_iterable(shard_rows for _, shard_rows in results)
+        return sorted(rows, key=lambda row: row["Ticker"])
+
     def __init__(
         self,
         tickers=None,
@@ -70,6 +310,13 @@ class Screener(object):
         custom=None,
         user_agent=USER_AGENT,
         request_method="sequential",
+        stream=False,
+        stream_parse=False,
+        typed=False,
+        columnar=False,
+        sink=None,
+        lazy=False,
+        local_refine=True,
     ):
         """
         Initializes all variables to its values
@@ -88,7 +335,26 @@ class Screener(object):
         :type table: str
         :param custom: collection of custom columns eg.: ['1', '21', '23', '45']
         :type custom: list
-        :var self.data: list of dictionaries containing row data
+        :param request_method: 'sequential' or 'async' - used for table pages, ticker details and charts
+        :type request_method: str
+        :param stream: only fetch the first page now and download the rest while iterating (see iter_rows)
+        :type stream: bool
+        :param stream_parse: parse table pages incrementally while they download (see TableStreamParser)
+        :type stream_parse: bool
+        :param typed: convert the cells to numbers and dates, column by column (see conversion.COLUMN_TYPES)
+        :type typed: bool
+        :param columnar: store the table column by column instead of one dictionary per row
+        :type columnar: bool
+        :param sink: CsvSink or JsonLinesSink the rows are written to as the pages arrive
+        :type sink: RowSink
+        :param lazy: only download the table when it is first used (data, headers, iteration,
+            len or an export), so that the query can be refined with add() without requests
+        :type lazy: bool
+        :param local_refine: answer narrowing refinements (extra filters, lower rows) from the
+            rows already held when possible, instead of downloading the table again
+        :type local_refine: bool
+        :var self.data: list of dictionaries containing row data (empty when streaming),
+            or a ColumnStore of row mappings when columnar is set
         :type self.data: list
         """
 
@@ -118,14 +384,46 @@ class Screener(object):
             ):  # 0 (No.) is required for the sequence algorithm to work
                 self._custom = ["0"] + self._custom
 
+        self._custom_passes = None  # the custom columns of each pass, set by from_fields
         self._rows = rows
         self._order = order
         self._signal = signal
         self._user_agent = user_agent
         self._request_method = request_method
+        self._stream = stream
+        self._stream_parse = stream_parse
+        self._typed = typed
+        self._columnar = columnar
+        self._sink = sink
+        self._lazy = lazy
+        self._local_refine = local_refine
 
         self.analysis = []
-        self.data = self.__search_screener()
+        self._headers = None
+        self.data = [] if self._deferred else self.__search_screener_unless_lazy()
+
+    @property
+    def data(self):
+        """ Rows of the table, downloaded on first use when the screener is lazy. """
+
+        self.__fetch()
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def headers(self):
+        """ Headers of the table, downloaded on first use when the screener is lazy. """
+
+        if self._headers is None:
+            self.__fetch()
+        return self._headers
+
+    @headers.setter
+    def headers(self, value):
+        self._headers = value
 
     def __call__(
         self,
@@ -145,8 +443,30 @@ class Screener(object):
         # and show their performance:
         stock_list(filters=['fa_div_high'], table='Performance')
         # Shows performance of stocks with large market cap and high dividend yield
+
+        A lazy screener only records the refinements, the table is downloaded once when it is
+        used. The screener is returned, so that refinements can be chained:
+
+        stock_list = Screener(filters=['cap_large'], lazy=True)
+        stock_list(filters=['fa_div_high'])(table='Performance').to_csv('stocks')
+
+        Refinements that only narrow the screen (extra filters, a lower rows) are answered from
+        the rows already held when the filters can be evaluated locally (see filter_functions).
+        Numeric bounds are compared against the rounded values the table shows.
         """
 
+        # FinViz keeps one option per filter name, so another option of a filter already used
+        # (eg. cap_mega after cap_large) replaces it instead of narrowing the screen
+        filter_names = [code.rsplit("_", 1)[0] for code in self._filters + list(filters or [])]
+        narrowing = (
+            not tickers
+            and not custom
+            and len(set(filter_names)) == len(filter_names)
+            and (not table or TABLE_TYPES.get(table) == self._table)
+            and (not order or order == self._order)
+            and (not signal or signal == self._signal)
+        )
+
         if tickers:
             [self._tickers.append(item) for item in tickers]
 
@@ -155,6 +475,7 @@ class Screener(object):
 
         if table:
             self._table = self.__check_table(table)
+            self._custom_passes = None
 
         if order:
             self._order = order
@@ -167,15 +488,20 @@ class Screener(object):
 
         if custom:
             self._custom = custom
+            self._custom_passes = None
 
         self.analysis = []
-        self.data = self.__search_screener()
+        refined = self.__refine_locally(filters or [], rows) if narrowing else None
+        self.data = self.__search_screener_unless_lazy() if refined is None else refined
+        return self
 
     add = __call__
 
     def __str__(self):
         """ Returns a readable representation of a table. """
 
+        self.__reject_stream("str")
+
         table_list = [self.headers]
 
         for row in self.data:
@@ -201,15 +527,52 @@ class Screener(object):
     def __len__(self):
         """ Returns an int with the number of total rows. """
 
+        self.__fetch()
         return int(self._rows)
 
     def __getitem__(self, position):
         """ Returns a dictionary containing specific row data. """
 
+        self.__reject_stream("__getitem__")
+
         return self.data[position]
 
     get = __getitem__
 
+    def __iter__(self):
+        """ Iterates over the table rows. """
+
+        return self.iter_rows()
+
+    def iter_rows(self):
+        """
+        Yields the table rows as dictionaries. When the screener was created with stream=True,
+        the pages are downloaded while iterating and only the current page is kept in memory.
+        """
+
+        if not self._stream:
+            yield from self.data
+            return
+
+        self.__fetch()
+        row_count = 0
+        for page in self.__iter_pages():
+            page = self._emit_rows(page[: self._rows - row_count])
+            row_count += len(page)
+            yield from page
+
+    def __reject_stream(self, method):
+        """
+        Private function used to refuse the methods which need the whole table when the
+        screener streams its rows: data is empty then, so they would silently see no rows.
+        """
+
+        if self._stream:
+            raise TypeError(
+                f"{method}() needs the whole table, which is not kept with stream=True. "
+                "Iterate over the rows instead."
+            )
+
     @staticmethod
     def __check_table(input_table):
         """ Checks if the user input for table type is correct. Otherwise, raises an InvalidTableType error. """
@@ -238,7 +601,9 @@ class Screener(object):
 
         # Get html from main filter page, ft=4 ensures all filters are present
         url = "https://finviz.com/screener.ashx?ft=4"
-        response = requests.get(url, headers={"User-Agent": USER_AGENT}, verify=False)
+        response = get_session().get(
+            url, headers={"User-Agent": USER_AGENT}, verify=False
+        )
         response.raise_for_status()
         html_content = response.text
 
@@ -260,7 +625,7 @@ class Screener(object):
                 break
 
         if filters_table is None:
-            raise Exception("Could not locate filter parameters")
+            raise ValueError("Could not locate filter parameters")
 
         # Populate dict with filtering options and corresponding filter tags
         filter_dict = {}
@@ -304,14 +669,30 @@ class Screener(object):
 
         return filter_dict
 
-    def to_sqlite(self, filename):
+    def to_sqlite(self, filename, table_name="screener_results", snapshot=None):
         """Exports the generated table into a SQLite database.
+        Numeric columns are stored as REAL and every export is appended as a snapshot,
+        replacing the rows of a ticker exported with the same snapshot time.
 
         :param filename: SQLite database file path
         :type filename: str
+        :param table_name: name of the table to create or append to
+        :type table_name: str
+        :param snapshot: snapshot time of the rows (datetime or ISO string), now by default
+        :type snapshot: datetime
         """
 
-        export_to_db(self.headers, self.data, filename)
+        self.__reject_stream("to_sqlite")
+
+        headers = self.data.headers if isinstance(self.data, ColumnStore) else self.headers
+        export_to_db(
+            headers,
+            self.data,
+            filename,
+            table_name=table_name,
+            schema=self.schema,
+            snapshot=snapshot,
+        )
 
     def to_csv(self, filename: str):
         """Exports the generated table into a CSV file.
@@ -321,6 +702,8 @@ class Screener(object):
         :type filename: str
         """
 
+        self.__reject_stream("to_csv")
+
         if filename and filename.endswith(".csv"):
             filename = filename[:-4]
 
@@ -341,6 +724,19 @@ class Screener(object):
 
         return export_to_csv(self.headers, self.data, f"{filename}.csv")
 
+    def to_columns(self, typed=True):
+        """
+        Returns the table as a dictionary of columns. Numeric columns are converted
+        in one batch into arrays of floats, where missing values are NaN.
+
+        :param typed: convert the columns with the table schema, or keep the cells as they are
+        :type typed: bool
+        """
+
+        self.__reject_stream("to_columns")
+
+        return convert_table(self.headers, self.data, self.schema if typed else {})
+
     def to_dataframe(self):
         """Exports the generated table to a pandas DataFrame.
 
@@ -349,6 +745,9 @@ class Screener(object):
         :return: pandas DataFrame
         :raises ImportError: if pandas is not installed
         """
+
+        self.__reject_stream("to_dataframe")
+
         try:
             import pandas as pd
         except ImportError:
@@ -357,8 +756,52 @@ class Screener(object):
                 "Install with: pip install pandas"
             )
 
+        if isinstance(self.data, ColumnStore):
+            return pd.DataFrame(
+                {header: list(self.data.column(header)) for header in self.data.headers}
+            )
+
         return pd.DataFrame(self.data)
 
+    def to_arrow(self):
+        """Exports the generated table to a pyarrow Table with typed columns.
+
+        The columns of a typed columnar screener are copied as they are. The rows of any other
+        screener are first converted into a ColumnStore, so the Table has the same schema
+        (including dictionary-encoded Ticker, Sector, Industry and Country) either way.
+
+        Requires pyarrow to be installed: pip install pyarrow
+
+        :return: pyarrow Table
+        :raises ImportError: if pyarrow is not installed
+        """
+
+        self.__reject_stream("to_arrow")
+
+        store = self.data
+        if not (isinstance(store, ColumnStore) and self._typed):
+            store = ColumnStore(self.headers, store, self.schema)
+
+        return columns_to_arrow(store.headers, store.columns)
+
+    def to_parquet(self, filename, **kwargs):
+        """Exports the generated table into a Parquet file (requires pyarrow).
+
+        :param filename: Parquet file path
+        :type filename: str
+        """
+
+        export_to_parquet(self.to_arrow(), filename, **kwargs)
+
+    def to_feather(self, filename, **kwargs):
+        """Exports the generated table into an Arrow IPC (Feather) file (requires pyarrow).
+
+        :param filename: Feather file path
+        :type filename: str
+        """
+
+        export_to_feather(self.to_arrow(), filename, **kwargs)
+
     def get_charts(self, period="d", size="l", chart_type="c", ta="1"):
         """
         Downloads the charts of all tickers shown by the table.
@@ -373,31 +816,44 @@ class Screener(object):
         :type ta: str
         """
 
+        self.__reject_stream("get_charts")
+
         encoded_payload = urlencode(
             {"ty": chart_type, "ta": ta, "p": period, "s": size}
         )
 
-        sequential_data_scrape(
+        self.__scrape_pages(
             scrape.download_chart_image,
             [
                 f"https://finviz.com/chart.ashx?{encoded_payload}&t={row.get('Ticker')}"
                 for row in self.data
             ],
-            self._user_agent,
         )
 
-    def get_ticker_details(self):
+    def get_ticker_details(self, sink=None, analysis_sink=None):
         """
         Downloads the details of all tickers shown by the table.
+
+        A CsvSink without headers gets the table headers followed by the snapshot fields
+        (scrape.SNAPSHOT_FIELDS), since the first row does not show all the fields the others
+        may have. Snapshot labels missing from that list are left out of the file.
+
+        :param sink: CsvSink or JsonLinesSink each row is written to once its details arrive
+        :type sink: RowSink
+        :param analysis_sink: sink the analyst price targets are written to as they arrive
+        :type analysis_sink: RowSink
         """
 
-        ticker_data = sequential_data_scrape(
+        self.__reject_stream("get_ticker_details")
+
+        if isinstance(sink, CsvSink) and sink.headers is None:
+            sink.headers = self.headers + [
+                field for field in scrape.SNAPSHOT_FIELDS if field not in self.headers
+            ]
+
+        ticker_data = self.__iter_scraped(
             scrape.download_ticker_details,
-            [
-                f"https://finviz.com/quote.ashx?&t={row.get('Ticker')}"
-                for row in self.data
-            ],
-            self._user_agent,
+            [f"{STOCK_URL}?{urlencode({'t': row.get('Ticker')})}" for row in self.data],
         )
 
         for entry in ticker_data:
@@ -410,8 +866,64 @@ class Screener(object):
                         ticker_generic.update(value[0])
                         self.analysis.extend(value[1])
 
+                        if sink is not None:
+                            sink.write(ticker_generic)
+                        if analysis_sink is not None:
+                            analysis_sink.write_rows(value[1])
+
         return self.data
 
+    def __iter_scraped(self, scrape_func, urls, *args):
+        """
+        Private function used to yield the scraped pages as they are downloaded. Asynchronous
+        requests all go through one Connector, so they share its session and rate limiter.
+        """
+
+        if self._request_method == "async":
+            yield from Connector(scrape_func, urls, self._user_agent, *args).iter_pages()
+        else:
+            yield from sequential_data_iter(scrape_func, urls, self._user_agent, *args)
+
+    def __scrape_pages(self, scrape_func, urls, *args):
+        """
+        Private function used to download and scrape pages with the configured request method.
+        Asynchronous requests go through the Connector and share its rate limiter.
+        """
+
+        if self._request_method == "async":
+            async_connector = Connector(scrape_func, urls, self._user_agent, *args)
+            return async_connector.run_connector()
+
+        return sequential_data_scrape(scrape_func, urls, self._user_agent, *args)
+
+    def __table_connector(self, urls):
+        """ Private function used to return the Connector downloading and scraping table pages. """
+
+        if self._stream_parse:
+            return Connector(None, urls, self._user_agent, stream_parser=self._stream_parser())
+
+        return Connector(scrape.get_table, urls, self._user_agent, self.headers, self._rows)
+
+    def __scrape_table_pages(self, urls):
+        """
+        Private function used to download and scrape table pages, page by page. With stream_parse
+        the sequential requests are scraped incrementally and all their rows are returned at once.
+        """
+
+        if self._request_method == "async":
+            return self.__table_connector(urls).run_connector()
+
+        if not self._stream_parse:
+            return self.__scrape_pages(scrape.get_table, urls, self.headers, self._rows)
+
+        return [
+            list(
+                itertools.chain.from_iterable(
+                    sequential_stream_iter(self._stream_parser(), urls, self._user_agent)
+                )
+            )
+        ]
+
     def __check_rows(self):
         """
         Checks if the user input for row number is correct.
@@ -432,18 +944,18 @@ class Screener(object):
         headers = []
 
         # Try new structure with <th> elements first
-        header_rows = self._page_content.cssselect('tr[valign="middle"]')
+        header_rows = select.SCREENER_HEADER_ROWS(self._page_content)
         if not header_rows:
             return headers
 
         header_row = header_rows[0]
 
         # Try <th> elements first (new structure)
-        header_elements = header_row.cssselect('th')
+        header_elements = select.TH(header_row)
 
         # Fallback to <td> elements (old structure)
         if not header_elements:
-            header_elements = header_row.xpath("td")
+            header_elements = select.CHILD_TD(header_row)
 
         for header_element in header_elements:
             # Use text_content() to get all text including from nested elements
@@ -454,47 +966,343 @@ class Screener(object):
 
         return headers
 
-    def __search_screener(self):
-        """ Private function used to return data from the FinViz screener. """
-
-        self._page_content, self._url = http_request_get(
-            "https://finviz.com/screener.ashx",
-            payload={
-                "v": self._table,
-                "t": ",".join(self._tickers),
-                "f": ",".join(self._filters),
-                "o": self._order,
-                "s": self._signal,
-                "c": ",".join(self._custom),
-            },
-            user_agent=self._user_agent,
-        )
+    def __iter_pages(self):
+        """ Private function used to yield the scraped table pages in order as they are downloaded. """
+
+        yield self._first_page_rows
+        urls = self._page_urls()
+
+        if self._request_method == "async":
+            yield from self.__table_connector(urls).iter_pages()
+        elif self._stream_parse:
+            yield from sequential_stream_iter(
+                self._stream_parser(), urls, self._user_agent
+            )
+        else:
+            yield from sequential_data_iter(
+                scrape.get_table, urls, self._user_agent, self.headers, self._rows
+            )
 
+    def _payload(self):
+        """ Returns the query parameters of the screener request. """
+
+        return {
+            "v": self._table,
+            "t": ",".join(self._tickers),
+            "f": ",".join(self._filters),
+            "o": self._order,
+            "s": self._signal,
+            "c": ",".join(self._custom_passes[0] if self._custom_passes else self._custom),
+        }
+
+    def _read_first_page(self, page_content, url):
+        """ Reads the total rows, the table headers and the first rows from the parsed first page. """
+
+        self._page_content, self._url = page_content, url
         self._rows = self.__check_rows()
         self.headers = self.__get_table_headers()
+        self._first_page_rows = scrape.get_table(page_content, self.headers, self._rows)
 
-        if self._request_method == "async":
+    def _stream_parser(self):
+        """ Returns a factory of incremental parsers for the table pages. """
+
+        return functools.partial(scrape.TableStreamParser, self.headers, self._rows)
+
+    @property
+    def schema(self):
+        """ Returns the column types of the table, eg.: {'Ticker': 'str', 'Price': 'number'}. """
+
+        return get_schema(self._table, self._custom)
+
+    def _convert_rows(self, rows):
+        """ Converts a batch of rows column by column when the screener is typed. """
+
+        if not self._typed:
+            return rows
+        return convert_rows(self.headers, rows, self.schema)
+
+    def _emit_rows(self, rows):
+        """ Converts a batch of rows (when typed) and writes it to the sink, if there is one. """
+
+        rows = self._convert_rows(rows)
+        if self._sink is not None:
+            self._sink.write_rows(rows)
+        return rows
+
+    def _new_store(self, rows=()):
+        """ Returns a ColumnStore for the table, which converts its columns when typed is set. """
+
+        return ColumnStore(self.headers, rows, self.schema if self._typed else {})
+
+    def _page_urls(self):
+        """ Returns the URL addresses of the table pages after the first one. """
+
+        return scrape.get_page_urls_from_rows(self._rows, self._url, first_page=2)
+
+    def __collect_pages(self, data):
+        """
+        Private function used to add the table pages to data (a list or a ColumnStore)
+        and the sink page by page as they arrive.
+        """
+
+        for page in self.__iter_pages():
+            data.extend(self._emit_rows(page[: self._rows - len(data)]))
+
+        return data
+
+    def __merge_passes(self, data):
+        """
+        Private function used to download the extra passes of a screen split by from_fields
+        and add their columns to the rows of the first pass.
+        """
+
+        for custom in self._custom_passes[1:]:
+            self.__merge_columns(
+                data,
+                Screener(
+                    self._tickers,
+                    self._filters,
+                    self._rows,
+                    self._order,
+                    self._signal,
+                    custom=custom,
+                    user_agent=self._user_agent,
+                    request_method=self._request_method,
+                    stream_parse=self._stream_parse,
+                    typed=self._typed,
+                ),
+            )
+
+    def __merge_columns(self, data, other):
+        """
+        Private function used to add the columns of another pass of the same screen to data,
+        matching the rows by Ticker. Tickers missing from the other pass get None.
+        """
+
+        headers = [header for header in other.headers if header not in self.headers]
+        rows = {row["Ticker"]: row for row in other.data}
+        missing = dict.fromkeys(headers)
+
+        for row in data:
+            other_row = rows.get(row["Ticker"], missing)
+            row.update({header: other_row[header] for header in headers})
+
+        self.headers.extend(headers)
+        self._custom.extend(column for column in other._custom if column not in self._custom)
+
+    def __refine_locally(self, filters, rows):
+        """
+        Private function used to return the rows of a narrowed screen from the rows already held,
+        or None when the table has to be downloaded again: the filters can only be evaluated when
+        every row of the wider screen is held and FinViz's meaning of each one is known. Like a
+        download, it raises NoResults when no row matches. self._url is set to the narrowed query,
+        but no page of it is downloaded, so self._page_content is None afterwards.
+        """
+
+        if not self._local_refine or self._data is None or self._stream or self._sink is not None:
+            return None
+        if not filters and rows is None:  # a plain call downloads the table again
+            return None
+
+        held = self._data
+        complete = len(held) == self._total_rows
+
+        if filters:
+            if not complete:
+                return None
+
+            # The option labels come from filters.json, which is downloaded once when missing.
+            # Network errors (requests' exceptions are OSErrors) fall back to a new download.
+            try:
+                labels = filter_labels(self.load_filter_dict())
+            except (OSError, ValueError):
+                return None
+
+            checks = [row_filter(code, labels.get(code), self.headers) for code in filters]
+            if None in checks:
+                return None
+
+            held = [row for row in held if all(check(row) for check in checks)]
+            if not held:
+                raise NoResults(urlencode(self._payload()))
+            self._total_rows = len(held)
+
+        if rows is not None and rows > len(held) and not complete:
+            return None
+
+        held = held[:rows]
+        self._rows = len(held)
+        self._url = f"{SCREENER_URL}?{urlencode(self._payload())}"
+        self._page_content = None
+
+        if isinstance(self._data, ColumnStore):
+            return self._new_store(held)
+        return list(held)
+
+    def __fetch(self):
+        """ Private function used to download the table, unless it is up to date with the query. """
+
+        if self._data is None:
+            self._data = self.__search_screener()
+
+    def __search_screener_unless_lazy(self):
+        """
+        Private function used to return data from the FinViz screener, or None when the
+        screener is lazy. The data property downloads the table when it is None.
+        """
+
+        if self._lazy:
+            self._headers = None
+            return None
+
+        return self.__search_screener()
+
+    def __search_screener(self):
+        """
+        Private function used to return data from the FinViz screener.
+        In stream mode only the first page is requested and an empty list is returned.
+        The extra passes of a screen split by from_fields are merged into the rows.
+        """
+
+        self._read_first_page(
+            *http_request_get(
+                SCREENER_URL, payload=self._payload(), user_agent=self._user_agent
+            )
+        )
+
+        if self._stream:
+            return []
+
+        if self._columnar:
+            data = self.__collect_pages(self._new_store())
+        elif self._sink is not None:
+            return self.__collect_pages([])
+        else:
+            pages_data = self.__scrape_table_pages(self._page_urls())
+
+            data = list(self._first_page_rows)
+            for page in pages_data:
+                for row in page:
+                    data.append(row)
+
+            data = self._convert_rows(data[: self._rows])
+
+        if self._custom_passes:
+            self.__merge_passes(data)
+
+        return data
+
+
+class AsyncScreener(Screener):
+    """
+    Screener for asyncio applications. Requests run on the caller's event loop and may share
+    one aiohttp.ClientSession. Example usage:
+
+    stock_list = await AsyncScreener.create(filters=['cap_large'], stream=True)
+    async for row in stock_list.aiter_rows():
+        print(row['Ticker'])
+    """
+
+    _deferred = True
+
+    def __init__(self, *args, session=None, **kwargs):
+        """
+        Takes the same arguments as Screener, but does not download anything. Use create instead.
+
+        :param session: shared session used for all requests of this screener
+        :type session: aiohttp.ClientSession
+        """
+
+        if kwargs.get("lazy"):
+            raise TypeError("AsyncScreener can not be lazy, create() downloads the table")
+
+        self._session = session
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    async def create(cls, *args, session=None, **kwargs):
+        """ Creates the screener and downloads its table (only the first page when stream=True). """
+
+        screener = cls(*args, session=session, **kwargs)
+        screener._read_first_page(
+            *await async_http_request_get(
+                SCREENER_URL,
+                session=session,
+                payload=screener._payload(),
+                user_agent=screener._user_agent,
+            )
+        )
+
+        if not screener._stream:
+            async for row in screener.__aiter_table():
+                screener.data.append(row)
+
+            if screener._columnar:
+                screener.data = screener._new_store(screener.data)
+
+        return screener
+
+    # The methods below download with blocking requests or run their own event loop,
+    # which would stall or fail inside the caller's loop
+
+    def __call__(self, *args, **kwargs):
+        raise TypeError("AsyncScreener can not be refined, create a new one with create()")
+
+    add = __call__
+
+    def get_charts(self, *args, **kwargs):
+        raise TypeError("AsyncScreener can not download charts")
+
+    def get_ticker_details(self, *args, **kwargs):
+        raise TypeError("AsyncScreener can not download details, use get_stock_async instead")
+
+    def __aiter__(self):
+        """ Iterates asynchronously over the table rows. """
+
+        return self.aiter_rows()
+
+    async def aiter_rows(self):
+        """
+        Yields the table rows as dictionaries. When the screener was created with stream=True,
+        the pages are downloaded while iterating and only the current page is kept in memory.
+        """
+
+        if not self._stream:
+            for row in self.data:
+                yield row
+            return
+
+        async for row in self.__aiter_table():
+            yield row
+
+    async def __aiter_table(self):
+        """ Private function used to download the table pages and yield their rows in order. """
+
+        row_count = 0
+        for row in self._emit_rows(self._first_page_rows):
+            row_count += 1
+            yield row
+
+        if self._stream_parse:
             async_connector = Connector(
-                scrape.get_table,
-                scrape.get_page_urls(self._page_content, self._rows, self._url),
+                None,
+                self._page_urls(),
                 self._user_agent,
-                self.headers,
-                self._rows,
-                css_select=True,
+                stream_parser=self._stream_parser(),
             )
-            pages_data = async_connector.run_connector()
         else:
-            pages_data = sequential_data_scrape(
+            async_connector = Connector(
                 scrape.get_table,
-                scrape.get_page_urls(self._page_content, self._rows, self._url),
+                self._page_urls(),
                 self._user_agent,
                 self.headers,
                 self._rows,
             )
 
-        data = []
-        for page in pages_data:
-            for row in page:
-                data.append(row)
+        async for page in async_connector.aiter_pages(self._session):
+            for row in self._emit_rows(page[: self._rows - row_count]):
+                row_count += 1
+                yield row
 
-        return data
+            if row_count == self._rows:
+                return
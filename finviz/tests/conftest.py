@@ -5,11 +5,16 @@ These tests make real HTTP requests to finviz.com.
 Use appropriate rate limiting and be respectful of the service.
 """
 
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Generator
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 
+from finviz.tests.pages import quote_page, screener_page
+
 # Test tickers - using well-known, stable stocks
 TEST_TICKERS = {
     "large_cap": "AAPL",      # Apple - large cap, lots of data
@@ -82,3 +87,100 @@ def analyst_data(test_ticker: str) -> list:
     """Cached analyst price targets for the session."""
     from finviz import get_analyst_price_targets
     return get_analyst_price_targets(test_ticker)
+
+
+class LocalServer:
+    """Stand-in HTTP server used by the offline tests.
+
+    Map a path (including the query string) to ``(status, headers, body)`` in
+    ``routes``, or to a callable returning one. Paths without a route are
+    passed to ``fallback`` when it is set. Every request is recorded in
+    ``requests``.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.fallback = None
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.path)
+                if self.path in server.routes:
+                    route = server.routes[self.path]
+                    status, headers, body = route() if callable(route) else route
+                elif server.fallback is not None:
+                    status, headers, body = server.fallback(self.path)
+                else:
+                    status, headers, body = 404, {}, b""
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def local_server() -> Generator:
+    """Local HTTP server for tests that must not touch finviz.com."""
+    with LocalServer() as server:
+        yield server
+
+
+@pytest.fixture
+def fake_quotes(local_server, monkeypatch) -> Generator:
+    """
+    Serves fake quote pages from the local server; the ticker BAD returns 404 and EMPTY an empty
+    page. The news of a ticker are read from the server's ``news`` dictionary, default news are
+    served otherwise.
+    """
+    from finviz.main_func import STOCK_PAGE
+
+    def serve(path):
+        ticker = parse_qs(urlparse(path).query)["t"][0]
+        if ticker == "BAD":
+            return 404, {}, b"Not found"
+        if ticker == "EMPTY":
+            return 200, {}, b""
+        return 200, {}, quote_page(ticker, local_server.news.get(ticker))
+
+    local_server.news = {}
+    local_server.fallback = serve
+    monkeypatch.setattr("finviz.main_func.STOCK_URL", f"{local_server.url}/quote.ashx")
+    STOCK_PAGE.invalidate()
+    yield local_server
+    STOCK_PAGE.invalidate()
+
+
+@pytest.fixture
+def fake_screener(local_server, monkeypatch) -> Generator:
+    """Serves fake screener pages with 45 rows from the local server, honouring custom columns."""
+    from finviz.helper_functions.conversion import CUSTOM_COLUMNS
+
+    def serve(path):
+        query = parse_qs(urlparse(path).query)
+        headers = None
+        if "c" in query:
+            headers = [CUSTOM_COLUMNS[column] for column in query["c"][0].split(",")]
+        return 200, {}, screener_page(45, int(query.get("r", ["1"])[0]), headers)
+
+    local_server.fallback = serve
+    monkeypatch.setattr("finviz.screener.SCREENER_URL", f"{local_server.url}/screener.ashx")
+    yield local_server
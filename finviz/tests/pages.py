@@ -0,0 +1,95 @@
+"""
+Fake FinViz pages served by the offline tests.
+
+The pages follow the markup the scrapers expect, with only the tables they read. Fixtures serving
+them from a local server are defined in conftest.py.
+"""
+
+SCREENER_HEADERS = [
+    "No.", "Ticker", "Company", "Sector", "Market Cap", "P/E", "Price", "Change", "Volume"
+]
+SECTORS = ["Technology", "Healthcare", "Energy"]
+
+
+def screener_row(number: int) -> list:
+    """Cells of the fake screener row with the given number."""
+    return [
+        str(number),
+        f"T{number:04d}",
+        f"Company {number}",
+        SECTORS[number % len(SECTORS)],
+        f"{number}.5B",
+        "-" if number % 7 == 0 else f"{number % 50}.10",
+        f"{number}.00",
+        f"{number % 5}.50%",
+        f"{number * 1000:,}",
+    ]
+
+
+def screener_rows(count: int) -> list:
+    """Fake screener rows 1 to count as dictionaries, like Screener.data."""
+    return [dict(zip(SCREENER_HEADERS, screener_row(number))) for number in range(1, count + 1)]
+
+
+def custom_row(number: int, headers: list) -> list:
+    """Cells of the fake screener row with the given number, for any columns."""
+    cells = dict(zip(SCREENER_HEADERS, screener_row(number)))
+    return [cells.get(header, f"{number}.25") for header in headers]
+
+
+def screener_page(total: int, start: int = 1, headers: list = None) -> bytes:
+    """HTML of a fake screener page laid out like screener.ashx, with custom headers if given."""
+    headers = headers or SCREENER_HEADERS
+    head = "".join(f"<th>{header}</th>" for header in headers)
+    rows = "".join(
+        '<tr valign="top">'
+        + "".join(f"<td><a>{cell}</a></td>" for cell in custom_row(number, headers))
+        + "</tr>"
+        for number in range(start, min(start + 20, total + 1))
+    )
+    return (
+        f'<html><body><div class="count-text whitespace-nowrap">#1 / {total} Total</div>'
+        f'<select><option value="1">Page 1/{(total + 19) // 20}</option></select>'
+        f'<table><tr valign="middle">{head}</tr>{rows}</table></body></html>'
+    ).encode()
+
+
+def quote_page(ticker: str, news=None, snapshot=None) -> bytes:
+    """HTML of a fake quote page with snapshot, ratings, news and insider tables.
+
+    ``news`` is a list of ``(timestamp, headline, url)`` rows, eg.
+    ``("Jan-02-26 10:00AM", "Headline", "https://news/1")``. ``snapshot`` is a list of
+    ``(label, value)`` pairs replacing the default snapshot table.
+    """
+    if news is None:
+        news = [
+            (f"Jan-0{day}-26 10:00AM", f"{ticker} headline {day}", f"https://news/{ticker}/{day}")
+            for day in range(3, 0, -1)
+        ]
+    snapshot = "".join(
+        f'<td class="snapshot-td2">{label}</td><td class="snapshot-td2"><b>{value}</b></td>'
+        for label, value in snapshot
+        or [("P/E", "30.50"), ("Price", "100.25"), ("Volatility", "1.5% 2.5%")]
+    )
+    news_rows = "".join(
+        f'<tr><td>{timestamp}</td><td><a class="tab-link-news" href="{url}">{headline}</a>'
+        f'<div class="news-link-right"><span>(Wire)</span></div></td></tr>'
+        for timestamp, headline, url in news
+    )
+    return (
+        f'<html><head><meta charset="utf-8"></head><body>'
+        f'<h1 class="quote-header_ticker-wrapper_ticker">{ticker}</h1>'
+        f'<h2 class="quote-header_ticker-wrapper_company">'
+        f'<a class="tab-link" href="https://example.com">{ticker} Inc</a></h2>'
+        f'<div class="quote-links">'
+        f'<a class="tab-link" href="screener.ashx?f=sec_technology">Technology</a>'
+        f'<a class="tab-link" href="screener.ashx?f=ind_software">Software</a>'
+        f'<a class="tab-link" href="screener.ashx?f=geo_usa">USA</a></div>'
+        f'<table><tr class="table-dark-row">{snapshot}</tr></table>'
+        f'<table class="js-table-ratings"><tbody><tr><td>Jan-05-26</td><td>Upgrade</td>'
+        f"<td>Bank</td><td>Buy</td><td>$90 → $120</td></tr></tbody></table>"
+        f'<table id="news-table">{news_rows}</table>'
+        f'<table class="styled-table-new"><thead>'
+        f"<tr><th>Insider Trading</th><th>Relationship</th></tr>"
+        f"</thead><tbody><tr><td>DOE JOHN</td><td>CEO</td></tr></tbody></table></body></html>"
+    ).encode()
@@ -0,0 +1,56 @@
+"""
+Tests for the asyncio API.
+
+These tests run offline against a local stand-in server.
+"""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from finviz import AsyncScreener
+
+
+class TestAsyncScreener:
+    """Tests for AsyncScreener running on the caller's event loop."""
+
+    def test_create_downloads_table(self, fake_screener):
+        """create() should download every page on the running loop."""
+
+        async def main():
+            return await AsyncScreener.create(filters=["cap_largeover"])
+
+        screener = asyncio.run(main())
+        assert len(screener.data) == len(screener) == 45
+        assert screener.headers[1] == "Ticker"
+        assert screener[44]["Ticker"] == "T0045"
+
+    def test_aiter_rows_streams_with_shared_session(self, fake_screener):
+        """aiter_rows() should stream rows through a caller-owned session."""
+
+        async def main():
+            async with aiohttp.ClientSession() as session:
+                screener = await AsyncScreener.create(stream=True, session=session)
+                assert screener.data == []
+                rows = [row async for row in screener]
+                assert not session.closed
+            return rows
+
+        rows = asyncio.run(main())
+        assert [row["No."] for row in rows] == [str(number) for number in range(1, 46)]
+
+    def test_blocking_methods_are_rejected(self, fake_screener):
+        """Methods that would block the event loop should raise instead of stalling it."""
+
+        async def main():
+            return await AsyncScreener.create(rows=5)
+
+        screener = asyncio.run(main())
+        for method in (screener, screener.add, screener.get_charts, screener.get_ticker_details):
+            with pytest.raises(TypeError):
+                method()
+
+        with pytest.raises(TypeError):
+            AsyncScreener(lazy=True)
+        assert len(fake_screener.requests) == 1
@@ -0,0 +1,176 @@
+"""
+Tests for the response and page caches.
+
+These tests run offline and do not contact finviz.com.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from finviz import Screener
+from finviz.config import cache_settings
+from finviz.helper_functions.cache_functions import (
+    PageCache,
+    ResponseCache,
+    get_response_cache,
+    normalize_url,
+)
+from finviz.helper_functions.error_handling import TooManyRequests
+from finviz.helper_functions.request_functions import http_request_get
+
+
+@pytest.fixture
+def response_cache(tmp_path, monkeypatch):
+    """Enables the disk cache in a temporary directory."""
+    monkeypatch.setitem(cache_settings, "ENABLED", True)
+    monkeypatch.setitem(cache_settings, "DIRECTORY", str(tmp_path))
+    return tmp_path
+
+
+class TestResponseCache:
+    """Tests for the on-disk response cache."""
+
+    def test_normalize_url(self):
+        """Query parameters should be sorted and empty ones dropped."""
+        assert normalize_url("https://FinViz.com/screener.ashx?v=111&t=&f=cap_large") == (
+            "https://finviz.com/screener.ashx?f=cap_large&v=111"
+        )
+
+    def test_round_trip(self, tmp_path):
+        """Stored bodies should come back decompressed with their final url."""
+        cache = ResponseCache(str(tmp_path), 1024 * 1024)
+        cache.set("https://finviz.com/quote.ashx?t=AAPL", b"<html>AAPL</html>")
+        assert cache.get("https://finviz.com/quote.ashx?t=AAPL") == (
+            b"<html>AAPL</html>",
+            "https://finviz.com/quote.ashx?t=AAPL",
+        )
+
+    def test_uncached_endpoint(self, tmp_path):
+        """Endpoints without a TTL should never be stored."""
+        cache = ResponseCache(str(tmp_path), 1024 * 1024)
+        cache.set("https://finviz.com/portfolio.ashx", b"private")
+        assert cache.get("https://finviz.com/portfolio.ashx") is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """The oldest entries should be evicted once max_size is exceeded."""
+        cache = ResponseCache(str(tmp_path), 1500)
+        for number in range(3):
+            cache.set(f"https://finviz.com/quote.ashx?t=T{number}", os.urandom(1000))
+        assert cache.get("https://finviz.com/quote.ashx?t=T0") is None
+        assert cache.get("https://finviz.com/quote.ashx?t=T2") is not None
+
+    def test_screener_uses_cache(self, fake_screener, response_cache):
+        """A repeated screen should be answered from disk without requests."""
+        first = Screener(filters=["cap_largeover"])
+        request_count = len(fake_screener.requests)
+
+        second = Screener(filters=["cap_largeover"], request_method="async")
+        assert len(fake_screener.requests) == request_count
+        assert second.data == first.data
+
+    def test_throttled_body_is_not_stored(self, local_server, response_cache):
+        """A "Too many requests." page served with status 200 should raise and stay uncached."""
+        local_server.fallback = lambda path: (200, {}, b"Too many requests.")
+        url = f"{local_server.url}/screener.ashx"
+
+        with pytest.raises(TooManyRequests):
+            http_request_get(url, payload={"v": "111"})
+        assert get_response_cache().get(f"{url}?v=111") is None
+
+        local_server.fallback = lambda path: (200, {}, b"<html>page</html>")
+        http_request_get(url, payload={"v": "111"})
+        assert get_response_cache().get(f"{url}?v=111") is not None
+
+    def test_refresh_skips_but_updates_cache(self, local_server, response_cache):
+        """A refreshed request should reach the server and replace the cached response."""
+        local_server.fallback = lambda path: (200, {}, b"<html>old</html>")
+        url = f"{local_server.url}/quote.ashx"
+        http_request_get(url, payload={"t": "AAPL"}, parse=False)
+
+        local_server.fallback = lambda path: (200, {}, b"<html>new</html>")
+        assert http_request_get(url, payload={"t": "AAPL"}, parse=False)[0] == "<html>old</html>"
+        assert http_request_get(url, payload={"t": "AAPL"}, parse=False, refresh=True)[0] == (
+            "<html>new</html>"
+        )
+        assert http_request_get(url, payload={"t": "AAPL"}, parse=False)[0] == "<html>new</html>"
+        assert len(local_server.requests) == 2
+
+
+class TestPageCache:
+    """Tests for the in-memory parsed page cache."""
+
+    def test_lru_eviction_by_entries(self):
+        """The least recently used entry should be evicted first."""
+        cache = PageCache(max_entries=2, max_size=1000, ttl=60)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache.get("a")
+        cache["c"] = 3
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_eviction_by_size(self):
+        """Entries should be evicted once their total size exceeds max_size."""
+        cache = PageCache(max_entries=10, max_size=100, ttl=60)
+        cache.set("a", 1, size=60)
+        cache.set("b", 2, size=60)
+        assert "a" not in cache
+        assert cache.stats()["size"] == 60
+
+    def test_ttl_expiry(self):
+        """Expired entries should be reported as misses."""
+        cache = PageCache(max_entries=10, max_size=100, ttl=0.01)
+        cache["a"] = 1
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert cache.stats()["misses"] == 1
+
+    def test_invalidate(self):
+        """invalidate should drop one key or everything."""
+        cache = PageCache(max_entries=10, max_size=100, ttl=60)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache.invalidate("a")
+        assert "a" not in cache and "b" in cache
+        cache.invalidate()
+        assert len(cache) == 0
+
+    def test_get_or_load_loads_once(self):
+        """Concurrent loads of the same key should call the loader once."""
+        cache = PageCache(max_entries=10, max_size=100, ttl=60)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return "page", 10
+
+        threads = [
+            threading.Thread(target=cache.get_or_load, args=("AAPL", loader))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert cache["AAPL"] == "page"
+
+    def test_get_or_load_failure(self):
+        """A failing loader should store nothing and leave no pending load behind."""
+        cache = PageCache(max_entries=10, max_size=100, ttl=60)
+
+        def loader():
+            raise ValueError("broken page")
+
+        for ticker in ("AAPL", "MSFT"):
+            with pytest.raises(ValueError):
+                cache.get_or_load(ticker, loader)
+
+        assert "AAPL" not in cache and not cache._loading
+        assert cache.get_or_load("AAPL", lambda: ("page", 10)) == "page"
@@ -0,0 +1,61 @@
+"""
+Tests for the columnar storage of screener tables.
+
+These tests run offline.
+"""
+
+import math
+from array import array
+
+import pytest
+
+from finviz.helper_functions.column_store import ColumnStore, DictionaryColumn
+from finviz.helper_functions.conversion import get_schema
+from finviz.helper_functions.save_data import columns_to_arrow
+from finviz.tests.pages import SCREENER_HEADERS, screener_rows
+
+ROWS = screener_rows(7)
+
+
+class TestColumnStore:
+    """Tests for ColumnStore and its row views."""
+
+    def test_rows_read_like_dicts(self):
+        """Without a schema the rows should equal the original dictionaries."""
+        store = ColumnStore(SCREENER_HEADERS, ROWS)
+        assert len(store) == 7
+        assert [dict(row) for row in store] == ROWS
+        assert store[-1]["Ticker"] == "T0007"
+        assert store[1:3] == ROWS[1:3]
+        with pytest.raises(IndexError):
+            store[7]
+
+    def test_typed_and_dictionary_columns(self):
+        """Numeric columns should be float arrays and repeated strings encoded once."""
+        store = ColumnStore(SCREENER_HEADERS, ROWS, get_schema("111"))
+        assert isinstance(store.column("Market Cap"), array)
+        assert store[0]["Market Cap"] == 1.5e9
+        assert math.isnan(store[6]["P/E"])
+        sectors = store.column("Sector")
+        assert isinstance(sectors, DictionaryColumn)
+        assert len(sectors.values) == 3
+
+    def test_set_value(self):
+        """Rows should be updatable, including with new columns."""
+        store = ColumnStore(SCREENER_HEADERS, ROWS, get_schema("111"))
+        store[0].update({"Price": "2.50", "Employees": "100"})
+        assert store[0]["Price"] == 2.5
+        assert store[0]["Employees"] == "100" and store[1]["Employees"] is None
+        assert store.headers[-1] == "Employees"
+
+    def test_arrow_table_does_not_share_memory(self):
+        """The Arrow table should not change, or stop the store growing, when the store does."""
+        pytest.importorskip("pyarrow")
+        store = ColumnStore(SCREENER_HEADERS, ROWS, get_schema("111"))
+        table = columns_to_arrow(store.headers, store.columns)
+
+        store[0].update({"Price": "9.00", "Sector": "Energy"})
+        store.extend(screener_rows(8)[7:])
+        assert len(store) == 8
+        assert table.column("Price")[0].as_py() == 1.0
+        assert table.column("Sector")[0].as_py() == "Healthcare" and table.num_rows == 7
@@ -0,0 +1,54 @@
+"""
+Tests for the typed conversion of screener cells.
+
+These tests run offline.
+"""
+
+import datetime
+import math
+
+from finviz.helper_functions.conversion import (
+    CUSTOM_COLUMNS,
+    TABLE_COLUMNS,
+    convert_column,
+    convert_table,
+    get_schema,
+    plan_custom_columns,
+)
+from finviz.screener import TABLE_TYPES
+
+
+class TestConversion:
+    """Tests for the column converters and the schema registry."""
+
+    def test_convert_numbers(self):
+        """Suffixes, percents, separators and missing markers should be converted."""
+        column = convert_column(["2.45B", "12.30%", "1,234,567", "-", "", "1.5K"], "number")
+        assert list(column[:3]) == [2.45e9, 12.3, 1234567.0]
+        assert math.isnan(column[3]) and math.isnan(column[4])
+        assert column[5] == 1500.0
+
+    def test_convert_dates(self):
+        """Dates should become datetime.date objects and missing ones None."""
+        assert convert_column(["12/12/1980", "-"], "date") == [datetime.date(1980, 12, 12), None]
+
+    def test_convert_table(self):
+        """Unknown headers should be kept as strings and conversion should be idempotent."""
+        rows = [{"Ticker": "AAPL", "Price": "255.53", "Notes": "x"}]
+        columns = convert_table(["Ticker", "Price", "Notes"], rows, get_schema("111"))
+        assert columns["Ticker"] == ["AAPL"] and columns["Notes"] == ["x"]
+        assert columns["Price"] == convert_column([255.53], "number")
+
+    def test_schema_registry(self):
+        """Every table type and custom column id should have a schema."""
+        assert set(TABLE_COLUMNS) == set(TABLE_TYPES.values()) - {"152"}
+        assert CUSTOM_COLUMNS["0"] == "No." and CUSTOM_COLUMNS["70"] == "IPO Date"
+        schema = get_schema("152", ["0", "1", "65"])
+        assert schema == {"No.": "number", "Ticker": "str", "Price": "number"}
+
+    def test_plan_custom_columns(self):
+        """Fields should be split into the fewest passes, each keeping No. and Ticker."""
+        fields = ["P/E", "perf week", "RSI", "Ticker", "7"]
+        assert plan_custom_columns(fields) == [["0", "1", "7", "42", "59"]]
+        assert plan_custom_columns(fields, 4) == [["0", "1", "7", "42"], ["0", "1", "59"]]
+        assert plan_custom_columns([]) == [["0", "1"]]
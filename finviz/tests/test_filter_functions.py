@@ -0,0 +1,39 @@
+"""
+Tests for the client-side evaluation of screener filters.
+
+These tests run offline.
+"""
+
+from finviz.helper_functions.filter_functions import parse_bounds, row_filter
+
+
+class TestFilterFunctions:
+    """Tests for parse_bounds and row_filter."""
+
+    def test_parse_bounds(self):
+        """Bounds should be read from the labels with their units, or not at all."""
+        assert parse_bounds("Under $5") == (None, 5.0)
+        assert parse_bounds("Over 500K") == (500e3, None)
+        assert parse_bounds("Low (<15)") == (None, 15.0)
+        assert parse_bounds("+Large (over $10bln)") == (10e9, None)
+        assert parse_bounds("Large ($10bln to $200bln)") == (10e9, 200e9)
+        assert parse_bounds("Positive (>0%)") == (0.0, None)
+        assert parse_bounds("Overbought (90)") is None
+        assert parse_bounds("Mega ($200bln and more)") is None
+
+    def test_row_filter(self):
+        """Rows should be matched on the column of the filter, typed or not."""
+        headers = ["Ticker", "Sector", "Market Cap", "P/E"]
+        large = row_filter("cap_largeover", "+Large (over $10bln)", headers)
+        assert large({"Market Cap": "12.5B"}) and not large({"Market Cap": 9.9e9})
+        assert not row_filter("fa_pe_u20", "Under 20", headers)({"P/E": "-"})
+        sector = row_filter("sec_basicmaterials", "Basic Materials", headers)
+        assert sector({"Sector": "Basic Materials"}) and not sector({"Sector": "Energy"})
+
+    def test_filters_that_can_not_be_evaluated(self):
+        """Groups, unknown labels and columns that are not held should give None."""
+        headers = ["Ticker", "Country", "Price"]
+        assert row_filter("geo_notusa", "Foreign (ex-USA)", headers) is None
+        assert row_filter("sh_price_u5", None, headers) is None
+        assert row_filter("fa_pe_u20", "Under 20", headers) is None
+        assert row_filter("ta_rsi_ob90", "Overbought (90)", ["RSI"]) is None
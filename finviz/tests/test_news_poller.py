@@ -0,0 +1,107 @@
+"""
+Tests for the NewsPoller.
+
+These tests run offline against a local stand-in server whose news tables change between polls.
+"""
+
+import pytest
+
+from finviz import NewsPoller
+from finviz.config import cache_settings
+
+
+def publish(server, ticker, *items):
+    """Adds (timestamp, headline) items at the top of a ticker's news table."""
+    server.news[ticker] = [
+        (timestamp, headline, f"https://news/{headline}") for timestamp, headline in items
+    ] + server.news.get(ticker, [])
+
+
+class TestNewsPoller:
+    """Tests for the NewsPoller class."""
+
+    def test_only_new_items_are_returned(self, fake_quotes):
+        """The first poll should set the cursors, the next ones return only new items."""
+        publish(fake_quotes, "AAPL", ("Jan-02-26 10:00AM", "a1"))
+        publish(fake_quotes, "MSFT", ("Jan-02-26 09:00AM", "m1"))
+        poller = NewsPoller(["AAPL", "MSFT"])
+
+        assert poller.poll() == []
+        assert poller.poll() == []
+
+        publish(fake_quotes, "AAPL", ("Jan-02-26 11:00AM", "a2"))
+        publish(fake_quotes, "MSFT", ("Jan-02-26 10:30AM", "m2"))
+        assert [item[:3] for item in poller.poll()] == [
+            ("MSFT", "2026-01-02 10:30", "m2"),
+            ("AAPL", "2026-01-02 11:00", "a2"),
+        ]
+        assert poller.poll() == []
+
+    def test_same_minute_items_are_deduplicated_by_url(self, fake_quotes):
+        """Items published in the minute of the cursor should be told apart by their URL."""
+        publish(fake_quotes, "AAPL", ("Jan-02-26 10:00AM", "a1"))
+        poller = NewsPoller(["AAPL"], since="2026-01-01 00:00")
+        assert [item[2] for item in poller.poll()] == ["a1"]
+
+        publish(fake_quotes, "AAPL", ("Jan-02-26 10:00AM", "a2"))
+        assert [item[2] for item in poller.poll()] == ["a2"]
+        assert poller.cursors["AAPL"] == {"urls": ["https://news/a1", "https://news/a2"]}
+
+    def test_items_dated_before_the_previous_ones_are_returned(self, fake_quotes):
+        """An item dated a day earlier, eg. "Today" dated in another timezone, is still new."""
+        publish(fake_quotes, "AAPL", ("Jan-03-26 01:00AM", "a1"))
+        poller = NewsPoller(["AAPL"])
+        assert poller.poll() == []
+
+        publish(fake_quotes, "AAPL", ("Jan-02-26 11:30PM", "a2"))
+        assert [item[2] for item in poller.poll()] == ["a2"]
+
+    def test_seen_urls_are_bounded(self, fake_quotes):
+        """The cursor should keep only the most recent max_seen_urls URLs."""
+        publish(fake_quotes, "AAPL", ("Jan-02-26 10:00AM", "a1"), ("Jan-02-26 09:00AM", "a0"))
+        poller = NewsPoller(["AAPL"], since="2026-01-01 00:00", max_seen_urls=2)
+        poller.poll()
+
+        publish(fake_quotes, "AAPL", ("Jan-02-26 11:00AM", "a2"))
+        assert [item[2] for item in poller.poll()] == ["a2"]
+        assert poller.cursors["AAPL"] == {"urls": ["https://news/a1", "https://news/a2"]}
+
+    def test_polls_skip_the_response_cache(self, fake_quotes, tmp_path, monkeypatch):
+        """Polls should fetch fresh pages even while the disk cache holds an unexpired copy."""
+        monkeypatch.setitem(cache_settings, "ENABLED", True)
+        monkeypatch.setitem(cache_settings, "DIRECTORY", str(tmp_path))
+        publish(fake_quotes, "AAPL", ("Jan-02-26 10:00AM", "a1"))
+        poller = NewsPoller(["AAPL"], since="2026-01-01 00:00")
+        assert [item[2] for item in poller.poll()] == ["a1"]
+
+        publish(fake_quotes, "AAPL", ("Jan-02-26 11:00AM", "a2"))
+        assert [item[2] for item in poller.poll()] == ["a2"]
+        assert len(fake_quotes.requests) == 2
+
+    def test_invalid_since(self):
+        """since should be rejected unless it is formatted like the news timestamps."""
+        with pytest.raises(ValueError):
+            NewsPoller(["AAPL"], since="Jan-02-26")
+
+    def test_cursors_survive_a_restart(self, fake_quotes, tmp_path):
+        """A new poller using the same cursor file should not replay the news."""
+        cursor_file = str(tmp_path / "cursors.json")
+        publish(fake_quotes, "AAPL", ("Jan-02-26 10:00AM", "a1"))
+        NewsPoller(["AAPL"], cursor_file=cursor_file, since="2026-01-01 00:00").poll()
+
+        publish(fake_quotes, "AAPL", ("Jan-02-26 11:00AM", "a2"))
+        poller = NewsPoller(["AAPL"], cursor_file=cursor_file, since="2026-01-01 00:00")
+        assert [item[2] for item in poller.poll()] == ["a2"]
+
+    def test_failed_tickers_keep_their_cursor(self, fake_quotes):
+        """A ticker whose page fails should be reported without stopping the others."""
+        publish(fake_quotes, "AAPL", ("Jan-02-26 10:00AM", "a1"))
+        poller = NewsPoller(["AAPL", "BAD"], since="2026-01-01 00:00")
+        assert [item[2] for item in poller.poll()] == ["a1"]
+        assert list(poller.errors) == ["BAD"] and "BAD" not in poller.cursors
+
+    def test_run(self, fake_quotes):
+        """run() should yield the new items of successive polls."""
+        publish(fake_quotes, "AAPL", ("Jan-02-26 10:00AM", "a1"))
+        poller = NewsPoller(["AAPL"], interval=0, since="2026-01-01 00:00")
+        assert [item[2] for item in poller.run(max_polls=2)] == ["a1"]
@@ -0,0 +1,173 @@
+"""
+Tests for the request helpers.
+
+These tests run offline and do not contact finviz.com.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from finviz.config import connection_settings
+from finviz.helper_functions.error_handling import TooManyRequests
+from finviz.helper_functions.request_functions import (
+    Connector,
+    TokenBucket,
+    get_session,
+    http_request_get,
+    parse_retry_after,
+    reset_session,
+)
+from finviz.helper_functions.scraper_functions import get_table
+from finviz.tests.pages import SCREENER_HEADERS, screener_page
+
+
+class TestSharedSession:
+    """Tests for the shared keep-alive session."""
+
+    def test_session_is_shared(self):
+        """Every call should return the same pooled session."""
+        assert get_session() is get_session()
+
+    def test_pool_uses_config(self):
+        """The mounted adapter should be sized from connection_settings."""
+        adapter = get_session().get_adapter("https://finviz.com")
+        assert adapter._pool_maxsize == connection_settings["POOL_MAXSIZE"]
+        assert adapter._pool_connections == connection_settings["POOL_CONNECTIONS"]
+
+    def test_reset_session(self):
+        """reset_session should build a fresh session on the next call."""
+        old_session = get_session()
+        reset_session()
+        assert get_session() is not old_session
+
+    def test_sequential_rate_limit(self, local_server, monkeypatch):
+        """With RATE_LIMIT_SEQUENTIAL the synchronous requests should share the token bucket."""
+        monkeypatch.setitem(connection_settings, "RATE_LIMIT", 50)
+        monkeypatch.setitem(connection_settings, "RATE_BURST", 2)
+        monkeypatch.setitem(connection_settings, "RATE_LIMIT_SEQUENTIAL", True)
+        local_server.routes["/page"] = (200, {}, b"ok")
+        reset_session()
+
+        start = time.monotonic()
+        for _ in range(7):
+            http_request_get(f"{local_server.url}/page", parse=False)
+        assert time.monotonic() - start >= 0.09
+        reset_session()
+
+
+class TestConnector:
+    """Tests for the asynchronous Connector scheduler."""
+
+    def test_results_keep_url_order(self, local_server):
+        """Results should line up with the URL list regardless of completion order."""
+        urls = []
+        for number in range(10):
+            local_server.routes[f"/page?n={number}"] = (200, {}, str(number).encode())
+            urls.append(f"{local_server.url}/page?n={number}")
+
+        data = Connector(lambda page, **kwargs: page.decode(), urls, "test").run_connector()
+        assert data == [str(number) for number in range(10)]
+
+    def test_iter_pages_shares_one_rate_limiter(self, local_server, monkeypatch):
+        """iter_pages should yield pages in URL order from a single run and token bucket."""
+        buckets = []
+        monkeypatch.setattr(
+            "finviz.helper_functions.request_functions.TokenBucket",
+            lambda *args: buckets.append(TokenBucket(*args)) or buckets[-1],
+        )
+        monkeypatch.setitem(connection_settings, "CONCURRENT_CONNECTIONS", 2)
+        urls = []
+        for number in range(7):
+            local_server.routes[f"/page?n={number}"] = (200, {}, str(number).encode())
+            urls.append(f"{local_server.url}/page?n={number}")
+
+        pages = Connector(lambda page, **kwargs: page.decode(), urls, "test").iter_pages()
+        assert list(pages) == [str(number) for number in range(7)]
+        assert len(buckets) == 1
+
+    def test_token_bucket_limits_rate(self):
+        """Requests beyond the burst should be spaced out by the rate."""
+
+        async def take(bucket, count):
+            for _ in range(count):
+                await bucket.acquire()
+
+        bucket = TokenBucket(rate=50, burst=2)
+        start = time.monotonic()
+        asyncio.run(take(bucket, 7))
+        assert time.monotonic() - start >= 0.09
+
+
+class TestAsyncRetries:
+    """Tests for retrying throttled asynchronous requests."""
+
+    def test_throttled_page_is_retried(self, local_server, monkeypatch):
+        """A throttled page should be retried instead of failing the whole run."""
+        monkeypatch.setitem(connection_settings, "RETRY_BACKOFF", 0.01)
+        responses = iter([
+            (429, {"Retry-After": "0"}, b""),
+            (200, {}, b"Too many requests."),
+        ])
+        local_server.routes["/slow"] = lambda: next(responses, (200, {}, b"ok"))
+        local_server.routes["/fast"] = (200, {}, b"ok")
+
+        urls = [f"{local_server.url}/fast", f"{local_server.url}/slow"]
+        data = Connector(lambda page, **kwargs: page, urls, "test").run_connector()
+        assert data == [b"ok", b"ok"]
+        assert local_server.requests.count("/slow") == 3
+
+    def test_gives_up_after_max_attempts(self, local_server, monkeypatch):
+        """TooManyRequests should be raised once MAX_ATTEMPTS is reached."""
+        monkeypatch.setitem(connection_settings, "RETRY_BACKOFF", 0.01)
+        monkeypatch.setitem(connection_settings, "MAX_ATTEMPTS", 2)
+        local_server.routes["/busy"] = (429, {}, b"")
+        sleeps = []
+        sleep = asyncio.sleep
+
+        async def record_sleep(delay):
+            sleeps.append(delay)
+            await sleep(delay)
+
+        monkeypatch.setattr("finviz.helper_functions.request_functions.asyncio.sleep", record_sleep)
+
+        with pytest.raises(TooManyRequests):
+            Connector(lambda page, **kwargs: page, [f"{local_server.url}/busy"], "test").run_connector()
+        assert len(local_server.requests) == 2
+        assert len(sleeps) == 1  # No backoff after the last attempt
+
+    def test_parse_retry_after(self):
+        """Retry-After may hold seconds or an HTTP date."""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+class TestParseExecutor:
+    """Tests for handing pages to a parse executor."""
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_pages_are_scraped_in_executor(self, local_server, executor):
+        """Executors should return the same data as parsing on the event loop."""
+        local_server.routes["/screener.ashx?r=1"] = (200, {}, screener_page(45))
+        urls = [f"{local_server.url}/screener.ashx?r=1"]
+
+        inline = Connector(get_table, urls, "test", SCREENER_HEADERS, 45).run_connector()
+        offloaded = Connector(
+            get_table, urls, "test", SCREENER_HEADERS, 45, parse_executor=executor
+        ).run_connector()
+        assert offloaded == inline
+        assert len(offloaded[0]) == 20
+
+    def test_default_executor(self, monkeypatch):
+        """PARSE_EXECUTOR should be the default, which None turns off for one Connector."""
+        monkeypatch.setitem(connection_settings, "PARSE_EXECUTOR", "thread")
+        assert isinstance(Connector(get_table, [], "test").parse_executor, ThreadPoolExecutor)
+        assert Connector(get_table, [], "test", parse_executor=None).parse_executor is None
+
+    def test_invalid_executor(self):
+        """Unknown executor names should be rejected."""
+        with pytest.raises(ValueError):
+            Connector(get_table, [], "test", parse_executor="gpu")
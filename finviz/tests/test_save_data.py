@@ -0,0 +1,127 @@
+"""
+Tests for the table exports.
+
+These tests run offline.
+"""
+
+import csv
+import gzip
+import json
+import math
+import sqlite3
+
+import pytest
+
+from finviz.helper_functions.conversion import get_schema
+from finviz.helper_functions.error_handling import NoPortfolio
+from finviz.helper_functions.save_data import CsvSink, JsonLinesSink, RowSink, export_to_db
+from finviz.portfolio import Portfolio
+from finviz.tests.pages import SCREENER_HEADERS, screener_rows
+
+ROWS = screener_rows(2500)
+
+
+def query(filename, statement):
+    """Runs a query on a SQLite file and returns all rows."""
+    conn = sqlite3.connect(filename)
+    try:
+        return conn.execute(statement).fetchall()
+    finally:
+        conn.close()
+
+
+class TestExportToDb:
+    """Tests for the SQLite export."""
+
+    def test_typed_batched_export(self, tmp_path):
+        """Large tables and quotes should be written with typed columns."""
+        filename = tmp_path / "screen.sqlite3"
+        rows = [dict(ROWS[0], Company='Say "Hi" Inc')] + ROWS[1:]
+        export_to_db(SCREENER_HEADERS, rows, filename, schema=get_schema("111"), chunk_size=100)
+
+        assert query(filename, "SELECT COUNT(*) FROM screener_results") == [(2500,)]
+        first_row = "SELECT Company, MarketCap, PE FROM screener_results LIMIT 1"
+        assert query(filename, first_row) == [('Say "Hi" Inc', 1.5e9, 1.1)]
+        missing = "SELECT COUNT(*) FROM screener_results WHERE PE IS NULL"
+        assert query(filename, missing) == [(357,)]
+        assert query(filename, "PRAGMA journal_mode") == [("wal",)]
+
+        indexes = {row[1] for row in query(filename, "PRAGMA index_list(screener_results)")}
+        assert {"screener_results_key", "screener_results_Ticker"} <= indexes
+
+    def test_snapshots_are_appended_and_upserted(self, tmp_path):
+        """Each snapshot should be appended, exporting the same snapshot again replaces it."""
+        filename = tmp_path / "screen.sqlite3"
+        for snapshot in ["2026-01-01", "2026-01-02"]:
+            export_to_db(
+                SCREENER_HEADERS, ROWS[:10], filename, table_name="daily", snapshot=snapshot
+            )
+        changed = [dict(row, Price="99.00") for row in ROWS[:10]]
+        export_to_db(
+            SCREENER_HEADERS + ["Employees"],
+            [dict(row, Employees="10") for row in changed],
+            filename,
+            table_name="daily",
+            snapshot="2026-01-02",
+        )
+
+        assert query(filename, "SELECT Snapshot, COUNT(*) FROM daily GROUP BY Snapshot") == [
+            ("2026-01-01", 10),
+            ("2026-01-02", 10),
+        ]
+        latest = "SELECT DISTINCT Price, Employees FROM daily WHERE Snapshot = '2026-01-02'"
+        assert query(filename, latest) == [("99.00", "10")]
+
+    def test_portfolio_without_positions(self, tmp_path):
+        """Exporting before a portfolio was created should raise NoPortfolio."""
+        portfolio = Portfolio.__new__(Portfolio)
+        portfolio.created = False
+        with pytest.raises(NoPortfolio, match="to_sqlite"):
+            portfolio.to_sqlite(tmp_path / "portfolio.sqlite3")
+        assert not list(tmp_path.iterdir())
+
+
+class TestSinks:
+    """Tests for the files rows are written to as they arrive."""
+
+    def test_csv_sink_flushes_every_batch(self, tmp_path):
+        """Rows should be readable before the sink is closed."""
+        filename = tmp_path / "rows.csv"
+        with CsvSink(filename) as sink:
+            sink.write_rows(ROWS[:20])
+            with open(filename, newline="") as handle:
+                assert list(csv.DictReader(handle)) == ROWS[:20]
+            sink.write(ROWS[20])
+
+        assert sink.row_count == 21
+
+    def test_csv_sink_new_columns(self, tmp_path):
+        """Columns missing from the first row should raise, unless the headers were given."""
+        with CsvSink(tmp_path / "rows.csv") as sink:
+            sink.write(ROWS[0])
+            with pytest.raises(ValueError, match="Extra"):
+                sink.write(dict(ROWS[1], Extra="new"))
+        assert sink.row_count == 1
+
+        with CsvSink(tmp_path / "given.csv", headers=list(ROWS[0])) as sink:
+            sink.write(dict(ROWS[1], Extra="left out"))
+        with open(tmp_path / "given.csv", newline="") as handle:
+            assert list(csv.DictReader(handle)) == [ROWS[1]]
+
+    def test_row_sink_is_abstract(self, tmp_path):
+        """RowSink should not be usable without a _write_row implementation."""
+        with pytest.raises(TypeError):
+            RowSink(tmp_path / "rows.txt")
+
+    def test_gzip_csv_and_json_lines(self, tmp_path):
+        """".gz" files should be compressed and NaN should be written as null."""
+        with CsvSink(tmp_path / "rows.csv.gz", headers=["Ticker", "Price"]) as sink:
+            sink.write_rows(ROWS[:3])
+        with gzip.open(tmp_path / "rows.csv.gz", "rt") as handle:
+            lines = handle.read().splitlines()
+        assert lines == ["Ticker,Price", "T0001,1.00", "T0002,2.00", "T0003,3.00"]
+
+        with JsonLinesSink(tmp_path / "rows.jsonl") as sink:
+            sink.write({"Ticker": "T0001", "P/E": math.nan})
+        with open(tmp_path / "rows.jsonl") as handle:
+            assert json.loads(handle.readline()) == {"Ticker": "T0001", "P/E": None}
@@ -0,0 +1,100 @@
+"""
+Tests for the page scrapers.
+
+These tests run offline on fake pages laid out like finviz.com.
+"""
+
+from lxml import html
+
+from finviz.helper_functions.scraper_functions import (
+    QuotePage,
+    TableStreamParser,
+    download_ticker_details,
+    get_table,
+    get_total_rows,
+)
+from finviz.tests.pages import SCREENER_HEADERS, quote_page, screener_page
+
+
+class TestScreenerPage:
+    """Tests for the screener page scrapers."""
+
+    def test_get_table_accepts_bytes_and_tree(self):
+        """get_table should give the same rows for raw bytes and a parsed tree."""
+        page = screener_page(45)
+        from_bytes = get_table(page, SCREENER_HEADERS, 45)
+        from_tree = get_table(html.fromstring(page), SCREENER_HEADERS, 45)
+        assert from_bytes == from_tree
+        assert from_bytes[0]["Ticker"] == "T0001"
+        assert len(from_bytes) == 20
+
+    def test_get_total_rows(self):
+        """The total should be read from the new and the old counter markup."""
+        old_counter = b'<table><tr><td class="count-text">#1 / 55 Total</td></tr></table>'
+        assert get_total_rows(html.fromstring(screener_page(45))) == 45
+        assert get_total_rows(old_counter) == 55
+        assert get_total_rows(b"<p>No results</p>") == 0
+
+    def test_stream_parser_matches_get_table(self):
+        """Feeding a page in small chunks should give the rows of get_table, before the page ends."""
+        page = screener_page(45)
+        parser = TableStreamParser(SCREENER_HEADERS, 20)
+
+        rows = []
+        for start in range(0, len(page), 512):
+            rows.extend(parser.feed(page[start : start + 512]))
+            if start < len(page) // 2:
+                early_rows = len(rows)
+
+        rows.extend(parser.close())
+        assert rows == get_table(page, SCREENER_HEADERS, 20)
+        assert early_rows > 0
+
+
+class TestQuotePage:
+    """Tests for the quote page extractor."""
+
+    def test_sections(self):
+        """Every section should be read from a single parse of the page."""
+        page = QuotePage(quote_page("AAPL"), "AAPL")
+        assert page.stock["Ticker"] == "AAPL" and page.stock["Sector"] == "Technology"
+        assert page.snapshot["P/E"] == "30.50"
+        assert page.insider[0]["Insider Trading"] == "DOE JOHN"
+        assert [item[1] for item in page.news] == [f"AAPL headline {day}" for day in (3, 2, 1)]
+        assert page.analyst_price_targets()[0]["target_to"] == 120.0
+        assert page.export_ratings()[0]["price_from"] == "90"
+
+    def test_sections_are_cached_and_copied(self):
+        """A section should be extracted once, and callers should get copies of it."""
+        page = QuotePage(html.fromstring(quote_page("AAPL")))
+        assert page._stock is page._stock and page._news is page._news
+
+        stock, insider, news = page.stock, page.insider, page.news
+        stock.pop("P/E")
+        insider[0]["Insider Trading"] = "CHANGED"
+        news.clear()
+        assert page.stock["P/E"] == "30.50"
+        assert page.insider[0]["Insider Trading"] == "DOE JOHN"
+        assert len(page.news) == 3
+
+    def test_only_the_requested_section_is_searched(self):
+        """Reading the news should not look for the header or the snapshot rows."""
+        page = QuotePage(quote_page("AAPL"))
+        assert len(page.news) == 3
+        assert "_tables" in vars(page)
+        assert "_header" not in vars(page) and "_snapshot_rows" not in vars(page)
+
+    def test_download_ticker_details(self):
+        """download_ticker_details should return the snapshot and the export ratings."""
+        details = download_ticker_details(
+            quote_page("MSFT"), URL="https://finviz.com/quote.ashx?t=MSFT"
+        )
+        data, ratings = details["MSFT"]
+        assert data["Price"] == "100.25"
+        assert ratings[0]["ticker"] == "MSFT"
+
+    def test_missing_sections(self):
+        """A page without the sections should give empty results."""
+        page = QuotePage(b"<html><body><p>Not found</p></body></html>", "NONE")
+        assert page.stock["Ticker"] == "NONE"
+        assert page.insider == [] and page.news == [] and page.analyst_price_targets() == []
@@ -1,17 +1,26 @@
 """
 Tests for the Screener class.
 
-All tests make real HTTP requests to finviz.com.
+Tests marked as network make real HTTP requests to finviz.com, the others
+run against a local stand-in server.
 """
 
+import csv
+import math
 import time
 from datetime import datetime
 from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 
 from finviz import Screener
+from finviz.config import connection_settings, screener_settings
+from finviz.helper_functions.error_handling import InvalidColumn, NoResults
+from finviz.helper_functions.save_data import CsvSink, JsonLinesSink
+from finviz.helper_functions.scraper_functions import SNAPSHOT_FIELDS
 from finviz.main_func import get_all_news, get_analyst_price_targets
+from finviz.tests.pages import SCREENER_HEADERS, quote_page
 
 
 class TestScreenerBasic:
@@ -65,6 +74,15 @@ class TestScreenerBasic:
                 break
         assert count == 5
 
+    @pytest.mark.network
+    def test_screener_stream(self):
+        """Streaming screener should yield rows without holding them in data."""
+        screener = Screener(filters=["cap_largeover", "exch_nasd"], table="Overview", stream=True)
+        assert screener.data == []
+        rows = list(screener.iter_rows())
+        assert len(rows) == len(screener)
+        assert "Ticker" in rows[0]
+
 
 class TestScreenerFilters:
     """Tests for Screener with different filters."""
@@ -223,6 +241,15 @@ class TestScreenerMethods:
         # Should have additional keys from stock page
         assert "Price" in details[0] or "Market Cap" in details[0]
 
+    @pytest.mark.network
+    @pytest.mark.slow
+    def test_get_ticker_details_async(self):
+        """get_ticker_details should honor request_method='async'."""
+        screener = Screener(tickers=["AAPL", "MSFT"], table="Overview", request_method="async")
+        details = screener.get_ticker_details()
+        assert len(details) == 2
+        assert "Price" in details[0] or "Market Cap" in details[0]
+
     @pytest.mark.network
     @patch("finviz.screener.scrape.download_chart_image")
     def test_get_charts(self, mock_download):
@@ -327,3 +354,343 @@ class TestGetAllNews:
         if len(news) > 0:
             for item in news[:5]:
                 assert len(item) == 3, f"News item has wrong length: {len(item)}"
+
+
+class TestScreenerPaging:
+    """Offline tests for how the screener pages are requested."""
+
+    @pytest.mark.parametrize("request_method", ["sequential", "async"])
+    def test_first_page_is_reused(self, fake_screener, request_method):
+        """Page 1 should be read from the first response, not downloaded again."""
+        screener = Screener(filters=["cap_largeover"], request_method=request_method)
+        assert [row["No."] for row in screener.data] == [str(n) for n in range(1, 46)]
+        assert len(fake_screener.requests) == 3
+        assert not any(path.endswith("&r=1") for path in fake_screener.requests)
+
+    def test_small_screen_needs_one_request(self, fake_screener):
+        """A screen that fits on one page should cost a single request."""
+        screener = Screener(filters=["cap_largeover"], rows=15)
+        assert len(screener.data) == 15
+        assert len(fake_screener.requests) == 1
+
+    def test_rows_limit_across_pages(self, fake_screener):
+        """rows should cut the table inside the last downloaded page."""
+        screener = Screener(filters=["cap_largeover"], rows=25)
+        assert len(screener.data) == len(screener) == 25
+        assert len(list(Screener(filters=["cap_largeover"], rows=25, stream=True))) == 25
+
+    @pytest.mark.parametrize("mode", ["stream", "columnar", "sink"])
+    def test_async_pages_share_one_rate_limiter(self, fake_screener, monkeypatch, tmp_path, mode):
+        """The pages of one scan should go through a single Connector run and token bucket."""
+        from finviz.helper_functions.request_functions import TokenBucket
+
+        buckets = []
+        monkeypatch.setattr(
+            "finviz.helper_functions.request_functions.TokenBucket",
+            lambda *args: buckets.append(TokenBucket(*args)) or buckets[-1],
+        )
+        monkeypatch.setitem(connection_settings, "CONCURRENT_CONNECTIONS", 1)
+
+        with JsonLinesSink(tmp_path / "screen.jsonl") as sink:
+            screener = Screener(
+                request_method="async",
+                stream=mode == "stream",
+                columnar=mode == "columnar",
+                sink=sink if mode == "sink" else None,
+            )
+            assert len(list(screener)) == 45
+        assert len(buckets) == 1
+
+    def test_stream_rejects_whole_table_methods(self, fake_screener, tmp_path):
+        """Methods needing the whole table should raise instead of seeing no rows."""
+        screener = Screener(filters=["cap_largeover"], stream=True)
+        calls = [
+            lambda: str(screener),
+            lambda: screener[0],
+            lambda: screener.to_csv(str(tmp_path / "screen")),
+            lambda: screener.to_sqlite(str(tmp_path / "screen.db")),
+            screener.to_columns,
+            screener.get_ticker_details,
+            screener.get_charts,
+        ]
+        for call in calls:
+            with pytest.raises(TypeError, match="stream=True"):
+                call()
+
+        assert len(fake_screener.requests) == 1
+        assert not list(tmp_path.iterdir())
+        assert len(list(screener)) == 45
+
+    @pytest.mark.parametrize("request_method", ["sequential", "async"])
+    def test_stream_parse(self, fake_screener, request_method):
+        """Incrementally parsed pages should give the same table."""
+        screener = Screener(
+            filters=["cap_largeover"], request_method=request_method, stream_parse=True
+        )
+        assert [row["No."] for row in screener.data] == [str(n) for n in range(1, 46)]
+        streamed = Screener(
+            filters=["cap_largeover"], rows=25, stream=True, stream_parse=True
+        )
+        assert [row["No."] for row in streamed] == [str(n) for n in range(1, 26)]
+
+    def test_typed_rows(self, fake_screener):
+        """typed=True should convert the table column by column."""
+        screener = Screener(filters=["cap_largeover"], typed=True)
+        assert screener.data[0]["Market Cap"] == 1.5e9
+        assert screener.data[0]["Volume"] == 1000.0
+        assert math.isnan(screener.data[6]["P/E"])
+        assert screener.to_columns()["Ticker"][:2] == ["T0001", "T0002"]
+        typed_stream = Screener(filters=["cap_largeover"], stream=True, typed=True)
+        assert [row["Price"] for row in typed_stream][-1] == 45.0
+
+    @pytest.mark.parametrize("typed", [False, True])
+    def test_columnar(self, fake_screener, typed):
+        """columnar=True should store the same table in a ColumnStore."""
+        screener = Screener(filters=["cap_largeover"], rows=25, columnar=True, typed=typed)
+        assert len(screener.data) == 25
+        assert screener[24]["Ticker"] == "T0025"
+        assert screener[0]["Price"] == (1.0 if typed else "1.00")
+
+    @pytest.mark.parametrize("typed", [False, True])
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_arrow_exports(self, fake_screener, tmp_path, columnar, typed):
+        """The Arrow exports should write the same typed columns for every storage."""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.feather
+        import pyarrow.parquet
+
+        screener = Screener(filters=["cap_largeover"], typed=typed, columnar=columnar)
+        table = screener.to_arrow()
+        assert table.num_rows == 45
+        assert table.schema.field("Price").type == pa.float64()
+        assert table.schema.field("Ticker").type == pa.dictionary(pa.int32(), pa.string())
+        assert table.column("Ticker").to_pylist()[:2] == ["T0001", "T0002"]
+
+        screener.to_parquet(tmp_path / "screen.parquet")
+        screener.to_feather(tmp_path / "screen.feather")
+        assert pyarrow.parquet.read_table(tmp_path / "screen.parquet").equals(table)
+        assert pyarrow.feather.read_table(tmp_path / "screen.feather").equals(table)
+
+    def test_sink_gets_rows_as_pages_arrive(self, fake_screener, tmp_path):
+        """The sink should hold every downloaded page, even if iterating stops halfway."""
+        with JsonLinesSink(tmp_path / "screen.jsonl") as sink:
+            Screener(filters=["cap_largeover"], rows=25, sink=sink)
+        with open(tmp_path / "screen.jsonl") as handle:
+            assert len(handle.readlines()) == 25
+
+        with JsonLinesSink(tmp_path / "partial.jsonl") as sink:
+            for row in Screener(filters=["cap_largeover"], stream=True, sink=sink):
+                if row["No."] == "21":
+                    break
+        with open(tmp_path / "partial.jsonl") as handle:
+            assert len(handle.readlines()) == 40
+
+    def test_ticker_details_csv_sink(self, fake_screener, monkeypatch, tmp_path):
+        """A CsvSink without headers should take snapshot fields the first row does not have."""
+        monkeypatch.setattr("finviz.screener.STOCK_URL", f"{fake_screener.url}/quote.ashx")
+        screener = Screener(filters=["cap_largeover"], rows=2)
+        fake_screener.routes["/quote.ashx?t=T0001"] = (200, {}, quote_page("T0001"))
+        fake_screener.routes["/quote.ashx?t=T0002"] = (
+            200, {}, quote_page("T0002", snapshot=[("P/E", "12.00"), ("Dividend TTM", "0.96")])
+        )
+
+        with CsvSink(tmp_path / "details.csv") as sink:
+            screener.get_ticker_details(sink=sink)
+        with open(tmp_path / "details.csv", newline="") as handle:
+            reader = csv.DictReader(handle)
+            rows = list(reader)
+
+        assert reader.fieldnames == SCREENER_HEADERS + [
+            field for field in SNAPSHOT_FIELDS if field not in SCREENER_HEADERS
+        ]
+        assert [row["Dividend TTM"] for row in rows] == ["", "0.96"]
+        assert [row["P/E"] for row in rows] == ["30.50", "12.00"]
+
+
+class TestLazyScreener:
+    """Offline tests for screeners that download their table on first use."""
+
+    def test_refinements_cost_one_fetch(self, fake_screener):
+        """Chained refinements should be downloaded once, with the composed query."""
+        screener = Screener(filters=["cap_largeover"], lazy=True)
+        screener(filters=["fa_div_high"])(table="Performance", order="-price")
+        assert fake_screener.requests == []
+
+        assert len(screener) == 45
+        assert len(screener.data) == 45 and screener.headers[1] == "Ticker"
+        assert len(fake_screener.requests) == 3
+        assert "f=cap_largeover%2Cfa_div_high" in fake_screener.requests[0]
+        assert "v=141" in fake_screener.requests[0] and "o=-price" in fake_screener.requests[0]
+
+    def test_refinement_after_use_fetches_again(self, fake_screener):
+        """A refinement should invalidate the downloaded table."""
+        screener = Screener(filters=["cap_largeover"], rows=15, lazy=True)
+        assert [row["No."] for row in screener][-1] == "15"
+        screener.add(table="Performance")
+        assert fake_screener.requests[1:] == []
+        assert len(screener.to_columns()["Ticker"]) == 15
+        assert len(fake_screener.requests) == 2 and "v=141" in fake_screener.requests[1]
+
+
+FILTER_DICT = {
+    "Sector": {"Technology": "sec_technology", "Energy": "sec_energy"},
+    "Country": {"USA": "geo_usa", "Foreign (ex-USA)": "geo_notusa"},
+    "Price": {"Under $10": "sh_price_u10", "$10 to $20": "sh_price_10to20"},
+    "P/E": {"Low (<5)": "fa_pe_u5"},
+}
+
+
+class TestLocalRefinement:
+    """Offline tests for narrowing refinements answered from the rows already held."""
+
+    @pytest.fixture(autouse=True)
+    def filter_dict(self, monkeypatch):
+        monkeypatch.setattr(
+            Screener, "load_filter_dict", staticmethod(lambda reload=True: FILTER_DICT)
+        )
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_extra_filters(self, fake_screener, columnar):
+        """Extra filters should select the held rows without any request."""
+        screener = Screener(filters=["cap_largeover"], typed=columnar, columnar=columnar)
+        screener(filters=["sec_technology", "sh_price_u10"])
+        assert [row["Ticker"] for row in screener] == ["T0003", "T0006", "T0009"]
+        assert len(screener) == 3 and screener._filters[1:] == ["sec_technology", "sh_price_u10"]
+        assert len(fake_screener.requests) == 3
+
+        screener(filters=["fa_pe_u5"], rows=2)
+        assert [row["Ticker"] for row in screener] == ["T0003"]
+        assert len(fake_screener.requests) == 3
+
+    def test_no_matching_rows(self, fake_screener):
+        """A local refinement matching no row should raise NoResults, like a download."""
+        screener = Screener(filters=["cap_largeover"])
+        with pytest.raises(NoResults):
+            screener(filters=["sh_price_10to20", "fa_pe_u5"])
+        assert len(fake_screener.requests) == 3
+
+    def test_url_follows_the_refinement(self, fake_screener):
+        """The query URL should describe the refined screen."""
+        screener = Screener(filters=["cap_largeover"])
+        screener(filters=["sec_technology"])
+        assert "f=cap_largeover%2Csec_technology" in screener._url
+        assert screener._page_content is None
+
+    def test_lower_rows(self, fake_screener):
+        """A lower rows should cut the held rows, even when only part of the screen is held."""
+        screener = Screener(filters=["cap_largeover"], rows=25)
+        screener(rows=10)
+        assert len(screener.data) == 10 and len(fake_screener.requests) == 2
+
+    def test_downloads_when_it_can_not_refine(self, fake_screener):
+        """Unknown filters, a partial screen or a wider query should be downloaded again."""
+        screener = Screener(filters=["cap_largeover"])
+        screener(filters=["geo_notusa"])
+        assert len(fake_screener.requests) == 6
+
+        screener = Screener(filters=["cap_largeover"], rows=25)
+        screener(filters=["sec_energy"])
+        assert len(fake_screener.requests) == 10
+
+        screener = Screener(filters=["cap_largeover"], rows=10, local_refine=False)
+        screener(rows=5)
+        assert len(fake_screener.requests) == 12
+
+    def test_repeated_filter_name_is_downloaded(self, fake_screener):
+        """Another option of a filter already used replaces it, so it can not be refined locally."""
+        screener = Screener(filters=["sec_technology"])
+        screener(filters=["sec_energy"])
+        assert screener._filters == ["sec_technology", "sec_energy"]
+        assert len(fake_screener.requests) == 6
+
+
+class TestScreenerFromFields:
+    """Offline tests for fetching fields of several tables through the custom table."""
+
+    FIELDS = ["P/E", "Perf Week", "RSI", "Market Cap"]
+
+    def test_single_pass(self, fake_screener):
+        """Fields of several tables should come from one custom table pass."""
+        screener = Screener.from_fields(self.FIELDS, filters=["cap_largeover"])
+        assert screener.headers == ["No.", "Ticker"] + self.FIELDS
+        assert len(screener.data) == 45
+        assert len(fake_screener.requests) == 3
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_passes_are_merged_by_ticker(self, fake_screener, monkeypatch, columnar):
+        """With a column limit the extra passes should be merged into the first one."""
+        monkeypatch.setitem(screener_settings, "MAX_CUSTOM_COLUMNS", 4)
+        screener = Screener.from_fields(self.FIELDS, rows=25, typed=True, columnar=columnar)
+        assert screener.headers == ["No.", "Ticker"] + self.FIELDS
+        assert screener[24]["Ticker"] == "T0025" and screener[24]["Market Cap"] == 25.5e9
+        assert screener[0]["RSI"] == 1.25
+        assert screener.schema["Perf Week"] == "percent"
+        assert len(fake_screener.requests) == 4
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_refetch_keeps_the_passes(self, fake_screener, monkeypatch, lazy):
+        """A refinement or a lazy download should fetch the same passes again."""
+        monkeypatch.setitem(screener_settings, "MAX_CUSTOM_COLUMNS", 4)
+        screener = Screener.from_fields(self.FIELDS, rows=25, lazy=lazy)
+        screener(order="-price")
+
+        assert screener.headers == ["No.", "Ticker"] + self.FIELDS
+        assert screener[24]["RSI"] == "25.25"
+        columns = [parse_qs(urlparse(path).query)["c"][0] for path in fake_screener.requests]
+        assert len(columns) == (4 if lazy else 8)
+        assert all(len(column.split(",")) <= 4 for column in columns)
+
+    def test_invalid_field(self):
+        """Unknown fields should raise InvalidColumn before any request."""
+        with pytest.raises(InvalidColumn):
+            Screener.from_fields(["P/E", "Not a column"])
+
+
+class TestShardedScreener:
+    """Offline tests for screens split across worker processes."""
+
+    @pytest.fixture(autouse=True)
+    def filter_dict(self, monkeypatch):
+        exchanges = {"AMEX": "exch_amex", "CBOE": "exch_cboe", "NASDAQ": "exch_nasd"}
+        monkeypatch.setattr(
+            Screener,
+            "load_filter_dict",
+            staticmethod(lambda reload=True: dict(FILTER_DICT, Exchange=exchanges)),
+        )
+
+    @pytest.mark.parametrize("request_method", ["sequential", "async"])
+    def test_page_shards(self, fake_screener, request_method):
+        """Page ranges downloaded by the workers should give the table of a plain screener."""
+        screener = Screener.sharded(
+            filters=["cap_largeover"], processes=2, request_method=request_method, typed=True
+        )
+        assert [row["No."] for row in screener.data] == list(range(1, 46))
+        assert len(screener) == 45 and len(fake_screener.requests) == 3
+
+    def test_filter_shards_are_merged_by_ticker(self, fake_screener):
+        """Rows of the filter shards should be deduplicated and sorted by Ticker."""
+        screener = Screener.sharded(shard_by="exchange", processes=3, columnar=True)
+        assert len(screener.data) == 45
+        assert [row["Ticker"] for row in screener][:2] == ["T0001", "T0002"]
+        assert sum("exch_cboe" in path for path in fake_screener.requests) == 3
+        assert not any("exch_nyse" in path for path in fake_screener.requests)
+
+    def test_shard_filters_fall_back(self, fake_screener, monkeypatch):
+        """Without the filter options, the shards should come from SHARD_FILTERS."""
+
+        def load_filter_dict(reload=True):
+            raise OSError("offline")
+
+        monkeypatch.setattr(Screener, "load_filter_dict", staticmethod(load_filter_dict))
+        screener = Screener.sharded(shard_by="exchange", processes=3)
+        assert len(screener.data) == 45
+        assert sum("exch_nyse" in path for path in fake_screener.requests) == 3
+
+    def test_invalid_shards(self):
+        """Options that can not be sharded should be rejected before any request."""
+        with pytest.raises(ValueError):
+            Screener.sharded(filters=["exch_nasd"], shard_by="exchange")
+        with pytest.raises(ValueError):
+            Screener.sharded(rows=100, shard_by="sector")
+        with pytest.raises(ValueError):
+            Screener.sharded(stream=True)
@@ -1,7 +1,8 @@
 """
 Tests for stock-related functions: get_stock, get_insider, get_news, get_analyst_price_targets.
 
-All tests make real HTTP requests to finviz.com.
+Tests marked as network make real HTTP requests to finviz.com, the others
+run against a local stand-in server.
 """
 
 import re
@@ -9,7 +10,10 @@ from datetime import datetime
 
 import pytest
 
-from finviz import get_stock, get_insider, get_news, get_analyst_price_targets
+from finviz import (get_analyst_price_targets, get_insider, get_insiders,
+                    get_news, get_stock, get_stocks,
+                    get_stocks_analyst_price_targets, get_stocks_news)
+from finviz.main_func import STOCK_PAGE, get_quote_pages
 
 
 class TestGetStock:
@@ -297,3 +301,42 @@ class TestEdgeCases:
         except Exception:
             # May fail - that's acceptable for special tickers
             pass
+
+
+class TestBatchQuotes:
+    """Offline tests for the batch quote page functions."""
+
+    def test_get_stocks(self, fake_quotes):
+        """Tickers should be fetched once each and failures reported per ticker."""
+        stocks = get_stocks(["AAPL", "MSFT", "AAPL", "BAD"])
+        assert list(stocks) == ["AAPL", "MSFT", "BAD"]
+        assert stocks["AAPL"]["Ticker"] == "AAPL" and stocks["MSFT"]["Price"] == "100.25"
+        assert isinstance(stocks["BAD"], Exception)
+        assert len(fake_quotes.requests) == 3
+
+    def test_broken_page_fails_only_its_ticker(self, fake_quotes):
+        """A page that can not be parsed should be reported without failing the batch."""
+        pages = get_quote_pages(["AAPL", "EMPTY"])
+        assert pages["AAPL"].stock["Ticker"] == "AAPL"
+        assert isinstance(pages["EMPTY"], Exception)
+        assert "EMPTY" not in STOCK_PAGE
+
+    def test_batches_share_the_page_cache(self, fake_quotes):
+        """Pages fetched by one batch function should be reused by the others."""
+        get_stocks(["AAPL", "MSFT"])
+        assert get_insiders(["AAPL"])["AAPL"][0]["Insider Trading"] == "DOE JOHN"
+        assert len(get_stocks_news(["MSFT"])["MSFT"]) == 3
+        assert get_stocks_analyst_price_targets(["AAPL"])["AAPL"][0]["target_to"] == 120.0
+        assert get_stock("MSFT")["Company"] == "MSFT Inc"
+        assert len(fake_quotes.requests) == 2
+        assert STOCK_PAGE.stats()["hits"] == 4
+
+    def test_results_are_not_shared(self, fake_quotes):
+        """Modifying a result should not change what the page cache returns next."""
+        stock = get_stock("AAPL")
+        stock.pop("Price")
+        get_news("AAPL").clear()
+        assert get_stock("AAPL")["Price"] == "100.25"
+        assert get_stocks(["AAPL"])["AAPL"]["Price"] == "100.25"
+        assert len(get_news("AAPL")) == 3
+        assert len(fake_quotes.requests) == 1